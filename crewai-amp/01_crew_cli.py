@@ -1,13 +1,18 @@
+import os
 import sys
 import json
+import asyncio
 import argparse
-from crewai_client import CrewAIClient
+from typing import Optional
+from crewai_client import CrewAIClient, AsyncCrewAIClient
+from crew_batch import load_inputs_file, submit_all
+from crew_tracker import ExecutionTracker
 
 
-def cmd_inputs():
+def cmd_inputs(refresh: bool = False):
     """Command: Get required inputs for the crew."""
     client = CrewAIClient()
-    inputs = client.get_inputs()
+    inputs = client.get_inputs(refresh=refresh)
 
     print("\n=== Required Inputs ===\n")
     if inputs:
@@ -155,6 +160,72 @@ def cmd_wait(kickoff_id: str):
         sys.exit(1)
 
 
+async def run_batch(items, concurrency: int, rate: Optional[float], output: str) -> dict:
+    """Kick off every input set and write each outcome to output as it finishes."""
+    counts = {"completed": 0, "failed": 0, "rejected": 0}
+    total = len(items)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    async with AsyncCrewAIClient() as client:
+        tracker = ExecutionTracker(client, poll_interval=5)
+        waits = []
+
+        with open(output, "w") as f:
+            def record(index: int, kickoff_id: Optional[str], status: str, result=None, error=None):
+                counts[status] += 1
+                f.write(json.dumps({"index": index, "kickoff_id": kickoff_id, "status": status,
+                                    "result": result, "error": error}) + "\n")
+                f.flush()
+                done = sum(counts.values())
+                print(f"[{done}/{total}] #{index} {status}" + (f": {error}" if error else ""))
+
+            async def wait(index: int, kickoff_id: str):
+                try:
+                    result = await tracker.wait(kickoff_id)
+                    record(index, kickoff_id, "completed", result=result)
+                except RuntimeError as e:
+                    record(index, kickoff_id, "failed", error=str(e))
+
+            def on_submitted(index: int, kickoff_id: Optional[str], error: Optional[Exception]):
+                if error:
+                    record(index, None, "rejected", error=str(error))
+                else:
+                    print(f"Started #{index}: {kickoff_id}")
+                    waits.append(asyncio.create_task(wait(index, kickoff_id)))
+
+            try:
+                await submit_all(client, items, on_submitted, concurrency, rate)
+                await asyncio.gather(*waits)
+            finally:
+                await tracker.close()
+
+    return counts
+
+
+def cmd_batch(path: Optional[str], concurrency: int, rate: Optional[float], output: str):
+    """Command: Kick off one execution per line of a JSONL inputs file and collect the results."""
+    if not path:
+        print("Error: --file is required for batch command")
+        print("Usage: python 01_crew_cli.py batch --file inputs.jsonl")
+        sys.exit(1)
+
+    items = load_inputs_file(path)
+    print("\n=== Batch Kickoff ===\n")
+    print(f"Input sets: {len(items)} (concurrency {concurrency}, rate {rate or 'unlimited'}/s)")
+    print(f"Results: {output}\n")
+
+    if not items:
+        print("No input sets found.")
+        return
+
+    counts = asyncio.run(run_batch(items, concurrency, rate, output))
+
+    print(f"\n✓ Batch finished: {counts['completed']} completed, "
+          f"{counts['failed']} failed, {counts['rejected']} rejected")
+    if counts["failed"] or counts["rejected"]:
+        sys.exit(1)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -162,7 +233,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Get required inputs
+  # Get required inputs (cached; --refresh revalidates with the server)
   python 01_crew_cli.py inputs
 
   # Start execution (interactive)
@@ -177,6 +248,9 @@ Examples:
   # Wait for existing execution
   python 01_crew_cli.py wait <kickoff_id>
 
+  # Run one execution per line of a JSONL file, 5 at a time
+  python 01_crew_cli.py batch --file inputs.jsonl --concurrency 5 --rate 2
+
 Environment Variables:
   CREW_URL    - Your crew URL (e.g., https://your-crew-url.crewai.com)
   CREW_TOKEN  - Your crew authentication token
@@ -185,7 +259,7 @@ Environment Variables:
 
     parser.add_argument(
         'command',
-        choices=['inputs', 'kickoff', 'status', 'run', 'wait'],
+        choices=['inputs', 'kickoff', 'status', 'run', 'wait', 'batch'],
         help='Command to execute'
     )
 
@@ -195,11 +269,41 @@ Environment Variables:
         help='Kickoff ID (required for status and wait commands)'
     )
 
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Revalidate the cached crew inputs with the server (inputs command)'
+    )
+
+    parser.add_argument(
+        '--file',
+        help='JSONL file with one inputs object per line (batch command)'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=5,
+        help='Kickoff requests in flight at once (batch command, default: 5)'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='Maximum kickoffs per second (batch command, default: unlimited)'
+    )
+
+    parser.add_argument(
+        '--output',
+        default='outputs/batch_results.jsonl',
+        help='JSONL file for batch results (default: outputs/batch_results.jsonl)'
+    )
+
     args = parser.parse_args()
 
     # Execute command
     if args.command == 'inputs':
-        cmd_inputs()
+        cmd_inputs(args.refresh)
     elif args.command == 'kickoff':
         cmd_kickoff()
     elif args.command == 'status':
@@ -216,6 +320,8 @@ Environment Variables:
             print("Usage: python 01_crew_cli.py wait <kickoff_id>")
             sys.exit(1)
         cmd_wait(args.kickoff_id)
+    elif args.command == 'batch':
+        cmd_batch(args.file, args.concurrency, args.rate, args.output)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,95 @@
-from typing import Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel
-from crewai_client import CrewAIClient
+import json
 import asyncio
+from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from crewai_client import AsyncCrewAIClient, execution_state, is_finished
+from crew_tracker import ExecutionTracker
+from crew_store import SQLiteExecutionStore, TERMINAL_STATUSES
+from crew_inputs import InputValidationError
+from crew_batch import KickoffBatch, evict_finished, submit_all
 from datetime import datetime
 
+# Execution records: SQLite (CREW_EXECUTION_DB) with a bounded in-memory cache;
+# results are stored apart from the records and loaded only when asked for
+executions = SQLiteExecutionStore()
+
+# Shared async client: one keep-alive connection pool for every request and poll
+crew = AsyncCrewAIClient()
+
+# Submission state of recent kickoff batches (outcomes are in executions)
+batches: Dict[str, KickoffBatch] = {}
+batch_tasks = set()
+
+# Most input sets per batch, and finished batches kept for progress queries
+MAX_BATCH_SIZE = 1000
+MAX_BATCHES_KEPT = 100
+
+
+def record_update(kickoff_id: str, status: Optional[Dict[str, Any]], error: Optional[str]):
+    """Tracker callback: keep executions in step with the crew's state."""
+    changes = {}
+    if status is not None:
+        changes["crew_state"] = execution_state(status) or None
+
+    if error:
+        changes.update({
+            "status": "failed",
+            "completed_at": datetime.utcnow().isoformat(),
+            "error": error
+        })
+    elif status is not None and is_finished(status):
+        changes.update({
+            "status": "completed",
+            "completed_at": datetime.utcnow().isoformat(),
+            "result": status
+        })
+    summary = executions.update(kickoff_id, **changes)
+
+    # Hand the finished execution to its batch's result streams
+    if summary and summary["batch_id"] in batches and changes.get("status") in TERMINAL_STATUSES:
+        batches[summary["batch_id"]].record_outcome(summary["batch_index"], kickoff_id)
+
+
+# One tracker polls every outstanding kickoff from the event loop (no thread per execution)
+tracker = ExecutionTracker(crew, poll_interval=5, on_update=record_update)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume tracking executions that were running when the server stopped
+    for kickoff_id in executions.unfinished():
+        tracker.track(kickoff_id)
+    tracker.start()
+    yield
+    for task in batch_tasks:
+        task.cancel()
+    await tracker.close()
+    await crew.aclose()
+    executions.close()
+
+
 app = FastAPI(
     title="CrewAI AMP Wrapper API",
     description="REST API wrapper for CrewAI AMP deployed crews",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# In-memory store for execution tracking (use Redis/DB for production)
-executions = {}
-
 
 class KickoffRequest(BaseModel):
     inputs: Dict[str, Any]
     wait: bool = False
 
 
+class BatchKickoffRequest(BaseModel):
+    inputs: List[Dict[str, Any]]
+    concurrency: int = Field(5, ge=1, le=50)
+    rate_per_second: Optional[float] = Field(None, gt=0)
+
+
 class ExecutionStatus(BaseModel):
     kickoff_id: str
     status: str
@@ -27,29 +97,7 @@ class ExecutionStatus(BaseModel):
     completed_at: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-
-
-def track_execution(kickoff_id: str, client: CrewAIClient):
-    """Background task to track execution and store result."""
-    try:
-        result = client.wait_for_completion(kickoff_id, poll_interval=5)
-        executions[kickoff_id] = {
-            "kickoff_id": kickoff_id,
-            "status": "completed",
-            "started_at": executions[kickoff_id]["started_at"],
-            "completed_at": datetime.utcnow().isoformat(),
-            "result": result,
-            "error": None
-        }
-    except Exception as e:
-        executions[kickoff_id] = {
-            "kickoff_id": kickoff_id,
-            "status": "failed",
-            "started_at": executions[kickoff_id]["started_at"],
-            "completed_at": datetime.utcnow().isoformat(),
-            "result": None,
-            "error": str(e)
-        }
+    crew_state: Optional[str] = None
 
 
 @app.get("/")
@@ -60,25 +108,28 @@ def root():
         "endpoints": {
             "get_inputs": "GET /inputs",
             "kickoff": "POST /kickoff",
+            "kickoff_batch": "POST /kickoff/batch",
+            "batch_progress": "GET /kickoff/batch/{batch_id}",
+            "batch_results": "GET /kickoff/batch/{batch_id}/results",
             "get_status": "GET /status/{kickoff_id}",
-            "list_executions": "GET /executions"
+            "list_executions": "GET /executions",
+            "tracker": "GET /tracker"
         }
     }
 
 
 @app.get("/inputs")
-def get_inputs():
-    """Get required inputs for the crew."""
+async def get_inputs(refresh: bool = False):
+    """Get required inputs for the crew (cached; refresh=true revalidates with AMP)."""
     try:
-        client = CrewAIClient()
-        inputs = client.get_inputs()
+        inputs = await crew.get_inputs(refresh=refresh)
         return {"inputs": inputs}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/kickoff")
-def kickoff(request: KickoffRequest, background_tasks: BackgroundTasks):
+async def kickoff(request: KickoffRequest):
     """
     Start crew execution.
 
@@ -88,60 +139,206 @@ def kickoff(request: KickoffRequest, background_tasks: BackgroundTasks):
         - If wait=true: Waits for completion and returns full result
     """
     try:
-        client = CrewAIClient()
-        kickoff_id = client.kickoff(request.inputs)
+        kickoff_id = await crew.kickoff(request.inputs)
+    except InputValidationError as e:
+        # Rejected locally against the cached inputs schema; AMP was never called
+        raise HTTPException(status_code=422, detail={"message": str(e), "missing": e.missing, "empty": e.empty})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Store execution info
+    executions.put({
+        "kickoff_id": kickoff_id,
+        "status": "running",
+        "started_at": datetime.utcnow().isoformat(),
+        "completed_at": None,
+        "result": None,
+        "error": None,
+        "crew_state": None
+    })
+
+    # The shared tracker polls it and records the outcome in executions
+    tracker.track(kickoff_id)
+
+    if request.wait:
+        # Wait on the tracker; the request holds no thread while the crew runs
+        try:
+            await tracker.wait(kickoff_id)
+            return executions.get(kickoff_id)
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    else:
+        return {"kickoff_id": kickoff_id, "status": "started"}
+
+
+def batch_progress(batch_id: str, include_results: bool = False) -> Dict[str, Any]:
+    """Group progress of a batch, from its submission state and the execution store."""
+    counts = executions.batch_counts(batch_id)
+    batch = batches.get(batch_id)
+    if batch is None and not counts:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    rejected = batch.rejected if batch else {}
+    total = batch.total if batch else sum(counts.values())
+    finished = counts.get("completed", 0) + counts.get("failed", 0) + len(rejected)
+    progress = {
+        "batch_id": batch_id,
+        "total": total,
+        "submitting": bool(batch and batch.submitting),
+        "pending_submit": batch.pending_submit if batch else 0,
+        "running": counts.get("running", 0),
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "rejected": len(rejected),
+        "progress": round(finished / total, 3) if total else 1.0,
+        "done": finished == total and not (batch and batch.submitting),
+        "rejected_inputs": [{"index": i, "error": e} for i, e in sorted(rejected.items())]
+    }
+    if include_results:
+        progress["executions"] = sorted(
+            executions.list(batch_id=batch_id, limit=max(total, 1), include_results=True),
+            key=lambda e: e["batch_index"]
+        )
+    return progress
 
-        # Store execution info
-        executions[kickoff_id] = {
-            "kickoff_id": kickoff_id,
-            "status": "running",
-            "started_at": datetime.utcnow().isoformat(),
-            "completed_at": None,
-            "result": None,
-            "error": None
-        }
 
-        if request.wait:
-            # Wait for completion synchronously
-            try:
-                result = client.wait_for_completion(kickoff_id, poll_interval=5)
-                executions[kickoff_id].update({
-                    "status": "completed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "result": result
-                })
-                return executions[kickoff_id]
-            except Exception as e:
-                executions[kickoff_id].update({
-                    "status": "failed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "error": str(e)
-                })
-                raise HTTPException(status_code=500, detail=str(e))
+@app.post("/kickoff/batch", status_code=202)
+async def kickoff_batch(request: BatchKickoffRequest):
+    """
+    Run the crew over many input sets as one group.
+
+    Input sets are kicked off in the background, at most `concurrency` at a
+    time and `rate_per_second` per second. Sets that fail local validation or
+    the kickoff call are recorded as rejected. Every execution is tracked by
+    the shared tracker and tagged with the batch_id and its input index.
+    """
+    if not request.inputs or len(request.inputs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Provide 1-{MAX_BATCH_SIZE} input sets")
+
+    # Forget the oldest finished batches; their executions stay in the store
+    evict_finished(batches, MAX_BATCHES_KEPT)
+
+    batch = KickoffBatch(total=len(request.inputs))
+    batches[batch.batch_id] = batch
+
+    def on_submitted(index: int, kickoff_id: Optional[str], error: Optional[Exception]):
+        if error:
+            batch.rejected[index] = str(error)
+            batch.record_outcome(index)
         else:
-            # Track in background
-            background_tasks.add_task(track_execution, kickoff_id, client)
-            return {"kickoff_id": kickoff_id, "status": "started"}
+            batch.submitted += 1
+            executions.put({
+                "kickoff_id": kickoff_id,
+                "status": "running",
+                "started_at": datetime.utcnow().isoformat(),
+                "result": None,
+                "batch_id": batch.batch_id,
+                "batch_index": index
+            })
+            tracker.track(kickoff_id)
+        batch.notify()
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async def submit():
+        try:
+            await submit_all(crew, request.inputs, on_submitted, request.concurrency, request.rate_per_second)
+        finally:
+            batch.submitting = False
+            batch.notify()
+
+    task = asyncio.create_task(submit())
+    batch_tasks.add(task)
+    task.add_done_callback(batch_tasks.discard)
+
+    return {
+        "batch_id": batch.batch_id,
+        "total": batch.total,
+        "status_url": f"/kickoff/batch/{batch.batch_id}",
+        "results_url": f"/kickoff/batch/{batch.batch_id}/results"
+    }
+
+
+@app.get("/kickoff/batch/{batch_id}")
+def get_batch(batch_id: str, include_results: bool = False):
+    """Batch progress: counts per state, rejected input sets and optionally every result."""
+    return batch_progress(batch_id, include_results)
+
+
+@app.get("/kickoff/batch/{batch_id}/results")
+async def stream_batch_results(batch_id: str):
+    """
+    Stream a batch's outcomes as NDJSON, one line per input set as it finishes
+    (completed, failed or rejected), then a final {"summary": ...} line.
+    """
+    total = batch_progress(batch_id)["total"]
+    batch = batches.get(batch_id)
+
+    def outcome_line(execution: Dict[str, Any]) -> str:
+        return json.dumps({
+            "index": execution["batch_index"],
+            "kickoff_id": execution["kickoff_id"],
+            "status": execution["status"],
+            "result": execution["result"],
+            "error": execution["error"]
+        }) + "\n"
+
+    async def stream():
+        if batch is None:
+            # No longer in memory (e.g. after a restart): report what the store holds
+            for execution in sorted(executions.list(batch_id=batch_id, limit=max(total, 1), include_results=True),
+                                    key=lambda e: e["batch_index"]):
+                if execution["status"] in TERMINAL_STATUSES:
+                    yield outcome_line(execution)
+            yield json.dumps({"summary": batch_progress(batch_id)}) + "\n"
+            return
+
+        # Each stream has its own event and a cursor into the batch's outcomes
+        changed = batch.subscribe()
+        cursor = 0
+        try:
+            while True:
+                changed.clear()
+                while cursor < len(batch.outcomes):
+                    index, kickoff_id = batch.outcomes[cursor]
+                    cursor += 1
+                    if kickoff_id is None:
+                        yield json.dumps({"index": index, "kickoff_id": None, "status": "rejected",
+                                          "error": batch.rejected[index]}) + "\n"
+                    else:
+                        execution = executions.get(kickoff_id)
+                        if execution is None:
+                            # Deleted from the store since it finished
+                            yield json.dumps({"index": index, "kickoff_id": kickoff_id, "status": "missing"}) + "\n"
+                        else:
+                            yield outcome_line(execution)
+
+                if batch.done:
+                    yield json.dumps({"summary": batch_progress(batch_id)}) + "\n"
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=15)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            batch.unsubscribe(changed)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.get("/status/{kickoff_id}")
-def get_status(kickoff_id: str):
+async def get_status(kickoff_id: str):
     """
     Get execution status.
 
     Returns local cached status if available, otherwise queries CrewAI directly.
     """
     # Check local cache first
-    if kickoff_id in executions:
-        return executions[kickoff_id]
+    execution = executions.get(kickoff_id)
+    if execution is not None:
+        return execution
 
     # Query CrewAI directly
     try:
-        client = CrewAIClient()
-        status = client.get_status(kickoff_id)
+        status = await crew.get_status(kickoff_id)
         return {
             "kickoff_id": kickoff_id,
             "status": "unknown",
@@ -152,29 +349,41 @@ def get_status(kickoff_id: str):
 
 
 @app.get("/executions")
-def list_executions():
-    """List all tracked executions."""
+def list_executions(
+    status: Optional[str] = Query(None, description="Filter by status (running, completed, failed)"),
+    since: Optional[str] = Query(None, description="Only executions started at or after this ISO time"),
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor: next_cursor from the previous page"),
+    include_results: bool = Query(False, description="Also return each execution's result")
+):
+    """List tracked executions, newest first (results omitted unless asked for)."""
+    page = executions.list(status=status, since=since, limit=limit, after=after, include_results=include_results)
     return {
-        "executions": list(executions.values()),
-        "count": len(executions)
+        "executions": page,
+        "count": executions.count(status),
+        "next_cursor": page[-1]["kickoff_id"] if len(page) == limit else None
     }
 
 
+@app.get("/tracker")
+def tracker_stats():
+    """Executions being polled and the tracker's poll counters."""
+    return {"active": tracker.active, **tracker.stats, "store": executions.stats()}
+
+
 @app.delete("/executions/{kickoff_id}")
 def delete_execution(kickoff_id: str):
     """Delete execution from local tracking (does not cancel on CrewAI)."""
-    if kickoff_id not in executions:
+    if not executions.delete(kickoff_id):
         raise HTTPException(status_code=404, detail="Execution not found")
 
-    del executions[kickoff_id]
     return {"message": f"Execution {kickoff_id} deleted from tracking"}
 
 
 @app.delete("/executions")
 def clear_executions():
     """Clear all tracked executions."""
-    count = len(executions)
-    executions.clear()
+    count = executions.clear()
     return {"message": f"Cleared {count} executions"}
 
 
@@ -0,0 +1,145 @@
+import json
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Called as on_submitted(index, kickoff_id, error) once per input set
+SubmitCallback = Callable[[int, Optional[str], Optional[Exception]], None]
+
+
+def load_inputs_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read input sets from a JSONL file, one per line.
+
+    Each line is either the inputs object itself or {"inputs": {...}}.
+    """
+    items = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+            items.append(entry["inputs"] if isinstance(entry.get("inputs"), dict) else entry)
+    return items
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (no limit if rate is None or 0)."""
+
+    def __init__(self, rate_per_second: Optional[float]):
+        self.interval = 1 / rate_per_second if rate_per_second else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def submit_all(
+    client,
+    items: List[Dict[str, Any]],
+    on_submitted: SubmitCallback,
+    concurrency: int = 5,
+    rate_per_second: Optional[float] = None
+):
+    """
+    Kick off every input set with bounded concurrency and rate.
+
+    Input sets that fail local validation or the kickoff call are reported to
+    on_submitted with an error; the rest with their kickoff_id.
+
+    Args:
+        client: AsyncCrewAIClient
+        items: Input dictionaries, one per execution
+        on_submitted: Called with (index, kickoff_id, error) for each item
+        concurrency: Kickoff requests in flight at once (default: 5)
+        rate_per_second: Maximum kickoffs started per second (default: unlimited)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate_per_second)
+
+    async def submit(index: int, inputs: Dict[str, Any]):
+        async with semaphore:
+            await limiter.wait()
+            try:
+                kickoff_id = await client.kickoff(inputs)
+            except Exception as e:
+                on_submitted(index, None, e)
+                return
+            on_submitted(index, kickoff_id, None)
+
+    await asyncio.gather(*(submit(i, inputs) for i, inputs in enumerate(items)))
+
+
+@dataclass
+class KickoffBatch:
+    """
+    Submission state of one batch; execution outcomes live in the execution store.
+
+    outcomes lists input sets in the order they finished, so each result
+    stream keeps its own cursor into it instead of re-reading the batch.
+    """
+    total: int
+    batch_id: str = field(default_factory=lambda: f"batch_{uuid.uuid4().hex[:12]}")
+    created_at: float = field(default_factory=time.time)
+    submitted: int = 0
+    rejected: Dict[int, str] = field(default_factory=dict)
+    # (index, kickoff_id) per finished input set; kickoff_id is None if it was rejected
+    outcomes: List[Tuple[int, Optional[str]]] = field(default_factory=list)
+    submitting: bool = True
+    _subscribers: Set[asyncio.Event] = field(default_factory=set, repr=False)
+
+    def record_outcome(self, index: int, kickoff_id: Optional[str] = None):
+        """An input set finished (completed, failed, or rejected if kickoff_id is None)."""
+        self.outcomes.append((index, kickoff_id))
+        self.notify()
+
+    def subscribe(self) -> asyncio.Event:
+        """Event of one result stream, set whenever the batch changes."""
+        event = asyncio.Event()
+        self._subscribers.add(event)
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        self._subscribers.discard(event)
+
+    def notify(self):
+        """Wake every stream following this batch."""
+        for event in self._subscribers:
+            event.set()
+
+    @property
+    def pending_submit(self) -> int:
+        return self.total - self.submitted - len(self.rejected)
+
+    @property
+    def done(self) -> bool:
+        return not self.submitting and len(self.outcomes) == self.total
+
+
+def evict_finished(batches: Dict[str, KickoffBatch], keep: int) -> List[str]:
+    """
+    Make room for one more batch by dropping the oldest finished ones.
+
+    batches is in creation order; batches still submitting are never dropped.
+    Nothing is evicted while fewer than `keep` batches are held.
+
+    Returns:
+        The evicted batch ids
+    """
+    excess = max(0, len(batches) - keep + 1)
+    evicted = [batch_id for batch_id, batch in batches.items() if not batch.submitting][:excess]
+    for batch_id in evicted:
+        del batches[batch_id]
+    return evicted
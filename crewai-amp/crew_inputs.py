@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_INPUTS_CACHE = os.environ.get("CREW_INPUTS_CACHE", "outputs/inputs_cache.json")
+
+# Seconds a cached inputs list is trusted before it is revalidated with the server
+DEFAULT_INPUTS_TTL = float(os.environ.get("CREW_INPUTS_TTL", "3600"))
+
+
+class InputValidationError(ValueError):
+    """Kickoff inputs don't match the crew's required inputs."""
+
+    def __init__(self, missing: List[str], empty: List[str]):
+        self.missing = missing
+        self.empty = empty
+        problems = []
+        if missing:
+            problems.append(f"missing {', '.join(missing)}")
+        if empty:
+            problems.append(f"empty {', '.join(empty)}")
+        super().__init__(f"Invalid inputs: {'; '.join(problems)}")
+
+
+def validate_inputs(required: List[str], inputs: Dict[str, Any]):
+    """
+    Check a kickoff payload against the crew's required inputs.
+
+    Args:
+        required: Input names from get_inputs()
+        inputs: Kickoff inputs
+
+    Raises:
+        InputValidationError: If a required input is absent or blank
+    """
+    if not isinstance(inputs, dict):
+        raise TypeError("inputs must be a dictionary")
+    missing = [name for name in required if name not in inputs]
+    empty = [name for name in required if name in inputs and (inputs[name] is None or str(inputs[name]).strip() == "")]
+    if missing or empty:
+        raise InputValidationError(missing, empty)
+
+
+class InputsCache:
+    """
+    Required-inputs lists per crew URL, in memory and in a JSON file.
+
+    Entries keep the server's ETag, so once the TTL has passed the client can
+    revalidate with If-None-Match and get a body-less 304 when nothing changed.
+    Async callers revalidate under fetch_lock(), so concurrent kickoffs share
+    one request.
+    """
+
+    def __init__(self, path: str = DEFAULT_INPUTS_CACHE, ttl: float = DEFAULT_INPUTS_TTL):
+        """
+        Args:
+            path: Cache file (default: $CREW_INPUTS_CACHE or outputs/inputs_cache.json)
+            ttl: Seconds an entry is used without revalidation (default: $CREW_INPUTS_TTL or 3600)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._fetch_locks: Dict[str, asyncio.Lock] = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, crew_url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry ({"inputs", "etag", "fetched_at"}) for a crew, fresh or not."""
+        with self._lock:
+            entry = self._entries.get(crew_url)
+            return dict(entry) if entry else None
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return bool(entry) and time.time() - entry["fetched_at"] < self.ttl
+
+    def fetch_lock(self, crew_url: str) -> asyncio.Lock:
+        """Lock held while one coroutine revalidates a crew's entry; waiters then reuse its result."""
+        with self._lock:
+            return self._fetch_locks.setdefault(crew_url, asyncio.Lock())
+
+    def put(self, crew_url: str, inputs: List[str], etag: Optional[str] = None):
+        """Store a freshly fetched inputs list."""
+        with self._lock:
+            self._entries[crew_url] = {"inputs": inputs, "etag": etag, "fetched_at": time.time()}
+            self._save()
+
+    def touch(self, crew_url: str):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            if crew_url in self._entries:
+                self._entries[crew_url]["fetched_at"] = time.time()
+                self._save()
+
+    def invalidate(self, crew_url: str):
+        with self._lock:
+            if self._entries.pop(crew_url, None) is not None:
+                self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+_default_cache: Optional[InputsCache] = None
+
+
+def default_inputs_cache() -> InputsCache:
+    """Process-wide cache shared by every client that isn't given its own."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = InputsCache()
+    return _default_cache
@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_EXECUTION_DB = os.environ.get("CREW_EXECUTION_DB", "outputs/executions.sqlite3")
+
+# Execution fields stored as columns; the crew result lives in its own table
+FIELDS = ("kickoff_id", "status", "started_at", "completed_at", "error", "crew_state", "batch_id", "batch_index")
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class ExecutionStore(ABC):
+    """Where the wrapper keeps execution records (see SQLiteExecutionStore)."""
+
+    @abstractmethod
+    def put(self, execution: Dict[str, Any]):
+        """Insert or replace an execution (a "result" key is stored too)."""
+
+    @abstractmethod
+    def update(self, kickoff_id: str, **changes) -> Optional[Dict[str, Any]]:
+        """Apply changes to an execution; returns the summary or None if unknown."""
+
+    @abstractmethod
+    def get(self, kickoff_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """One execution, with its result unless include_result is False."""
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, since: Optional[str] = None, limit: int = 100,
+             after: Optional[str] = None, include_results: bool = False,
+             batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Executions newest first, filtered and paginated by kickoff_id cursor."""
+
+    @abstractmethod
+    def count(self, status: Optional[str] = None) -> int:
+        """Number of executions, optionally with one status."""
+
+    @abstractmethod
+    def batch_counts(self, batch_id: str) -> Dict[str, int]:
+        """Executions per status within a kickoff batch."""
+
+    @abstractmethod
+    def delete(self, kickoff_id: str) -> bool:
+        """Remove one execution; returns False if it was unknown."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove every execution; returns how many there were."""
+
+    @abstractmethod
+    def unfinished(self) -> List[str]:
+        """kickoff_ids not yet completed or failed (to resume tracking after a restart)."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Counters for the /tracker endpoint."""
+
+    @abstractmethod
+    def close(self):
+        """Release the underlying storage."""
+
+    def __contains__(self, kickoff_id: str) -> bool:
+        return self.get(kickoff_id, include_result=False) is not None
+
+
+class SQLiteExecutionStore(ExecutionStore):
+    """
+    Execution records in SQLite with a small in-memory cache.
+
+    Every change is written through to the database, indexed by status and
+    started_at. Results are kept in a separate table and only read when a
+    single execution is fetched with its result. The cache holds summaries
+    only; finished executions leave it after ttl_seconds or once more than
+    max_cached are held, so memory stays flat however long the server runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_EXECUTION_DB, max_cached: int = 1000, ttl_seconds: float = 300.0):
+        """
+        Args:
+            path: SQLite database file (default: $CREW_EXECUTION_DB or outputs/executions.sqlite3)
+            max_cached: Most execution summaries kept in memory (default: 1000)
+            ttl_seconds: How long finished executions stay cached (default: 300)
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_cached = max_cached
+        self.ttl_seconds = ttl_seconds
+
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS executions (
+                kickoff_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                completed_at TEXT,
+                error TEXT,
+                crew_state TEXT,
+                batch_id TEXT,
+                batch_index INTEGER
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                kickoff_id TEXT PRIMARY KEY,
+                result TEXT NOT NULL
+            )
+        """)
+        # Columns added after the first release
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(executions)")}
+        for column, kind in (("batch_id", "TEXT"), ("batch_index", "INTEGER")):
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE executions ADD COLUMN {column} {kind}")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_executions_status ON executions (status, started_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_executions_started_at ON executions (started_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_executions_batch ON executions (batch_id, status)")
+        self._db.commit()
+
+    def _cache_put(self, summary: Dict[str, Any]):
+        self._cache[summary["kickoff_id"]] = (summary, time.monotonic())
+        self._cache.move_to_end(summary["kickoff_id"])
+        self._evict()
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [
+            kickoff_id for kickoff_id, (summary, cached_at) in self._cache.items()
+            if summary["status"] in TERMINAL_STATUSES and now - cached_at > self.ttl_seconds
+        ]
+        for kickoff_id in expired:
+            del self._cache[kickoff_id]
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _write(self, summary: Dict[str, Any], result: Any = None, has_result: bool = False):
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO executions ({', '.join(FIELDS)}) VALUES ({', '.join('?' for _ in FIELDS)})",
+                tuple(summary.get(f) for f in FIELDS)
+            )
+            if has_result:
+                if result is None:
+                    self._db.execute("DELETE FROM results WHERE kickoff_id = ?", (summary["kickoff_id"],))
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO results (kickoff_id, result) VALUES (?, ?)",
+                        (summary["kickoff_id"], json.dumps(result))
+                    )
+            self._db.commit()
+            self._cache_put(summary)
+
+    def _summary(self, kickoff_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._cache.get(kickoff_id)
+            if cached:
+                return dict(cached[0])
+            row = self._db.execute(
+                f"SELECT {', '.join(FIELDS)} FROM executions WHERE kickoff_id = ?", (kickoff_id,)
+            ).fetchone()
+        return dict(zip(FIELDS, row)) if row else None
+
+    def _result(self, kickoff_id: str) -> Any:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM results WHERE kickoff_id = ?", (kickoff_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, execution: Dict[str, Any]):
+        summary = {f: execution.get(f) for f in FIELDS}
+        self._write(summary, execution.get("result"), has_result="result" in execution)
+
+    def update(self, kickoff_id: str, **changes) -> Optional[Dict[str, Any]]:
+        summary = self._summary(kickoff_id)
+        if summary is None:
+            return None
+        summary.update({k: v for k, v in changes.items() if k in FIELDS})
+        self._write(summary, changes.get("result"), has_result="result" in changes)
+        return summary
+
+    def get(self, kickoff_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        summary = self._summary(kickoff_id)
+        if summary is not None and include_result:
+            summary["result"] = self._result(kickoff_id)
+        return summary
+
+    def list(self, status: Optional[str] = None, since: Optional[str] = None, limit: int = 100,
+             after: Optional[str] = None, include_results: bool = False,
+             batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Executions newest first, read from the database.
+
+        Args:
+            status: Only executions with this status
+            since: Only executions started at or after this ISO timestamp
+            limit: Maximum executions to return (default: 100)
+            after: kickoff_id of the last execution on the previous page (cursor)
+            include_results: Also load each execution's result (default: False)
+            batch_id: Only executions from this kickoff batch
+        """
+        where, args = [], []
+        if batch_id:
+            where.append("batch_id = ?")
+            args.append(batch_id)
+        if status:
+            where.append("status = ?")
+            args.append(status)
+        if since:
+            where.append("started_at >= ?")
+            args.append(since)
+        if after:
+            cursor = self._summary(after)
+            if cursor:
+                where.append("(started_at < ? OR (started_at = ? AND kickoff_id < ?))")
+                args.extend([cursor["started_at"], cursor["started_at"], after])
+
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(FIELDS)} FROM executions {clause} ORDER BY started_at DESC, kickoff_id DESC LIMIT ?",
+                (*args, limit)
+            ).fetchall()
+
+        executions = [dict(zip(FIELDS, row)) for row in rows]
+        if include_results:
+            for execution in executions:
+                execution["result"] = self._result(execution["kickoff_id"])
+        return executions
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status:
+                return self._db.execute("SELECT COUNT(*) FROM executions WHERE status = ?", (status,)).fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+
+    def batch_counts(self, batch_id: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM executions WHERE batch_id = ? GROUP BY status", (batch_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def delete(self, kickoff_id: str) -> bool:
+        with self._lock:
+            self._cache.pop(kickoff_id, None)
+            deleted = self._db.execute("DELETE FROM executions WHERE kickoff_id = ?", (kickoff_id,)).rowcount
+            self._db.execute("DELETE FROM results WHERE kickoff_id = ?", (kickoff_id,))
+            self._db.commit()
+        return bool(deleted)
+
+    def clear(self) -> int:
+        with self._lock:
+            self._cache.clear()
+            count = self._db.execute("DELETE FROM executions").rowcount
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+        return count
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT kickoff_id FROM executions WHERE status NOT IN ({', '.join('?' for _ in TERMINAL_STATUSES)})",
+                TERMINAL_STATUSES
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            cached = len(self._cache)
+        return {"cached": cached, "stored": self.count(), "running": self.count("running")}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
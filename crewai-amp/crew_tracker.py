@@ -0,0 +1,196 @@
+import time
+import asyncio
+import heapq
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from crewai_client import AsyncCrewAIClient, execution_state, is_finished
+
+# Called as on_update(kickoff_id, status, error) after every poll and when an execution ends
+UpdateCallback = Callable[[str, Optional[Dict[str, Any]], Optional[str]], Optional[Awaitable[None]]]
+
+
+class ExecutionTracker:
+    """
+    Tracks every outstanding kickoff from one asyncio task.
+
+    Kickoff ids sit in a schedule ordered by their next poll time. One loop
+    sleeps until the earliest is due, polls everything due at once (with a cap
+    on concurrent requests) and reschedules the ones still running. Poll
+    intervals stretch as an execution ages, so thousands of long crews cost a
+    trickle of requests and no threads.
+    """
+
+    def __init__(
+        self,
+        client: AsyncCrewAIClient,
+        poll_interval: float = 5.0,
+        max_interval: float = 30.0,
+        max_concurrent_polls: int = 20,
+        max_errors: int = 5,
+        on_update: Optional[UpdateCallback] = None
+    ):
+        """
+        Args:
+            client: AsyncCrewAIClient used for status calls
+            poll_interval: Seconds between polls for a new execution (default: 5)
+            max_interval: Longest gap between polls as executions age (default: 30)
+            max_concurrent_polls: Status requests in flight at once (default: 20)
+            max_errors: Consecutive failed polls before an execution is given up on (default: 5)
+            on_update: Optional callback (plain or async) for status changes and endings
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.max_concurrent_polls = max_concurrent_polls
+        self.max_errors = max_errors
+        self.on_update = on_update
+
+        self._schedule: List[Tuple[float, str]] = []
+        self._tracked: Dict[str, Dict[str, Any]] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._polls: Set[asyncio.Task] = set()
+        self.stats = {"polls": 0, "errors": 0, "completed": 0, "failed": 0}
+
+    @property
+    def active(self) -> int:
+        """Executions currently being tracked."""
+        return len(self._tracked)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop polling; anyone still waiting gets a CancelledError."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in list(self._polls):
+            task.cancel()
+        await asyncio.gather(*self._polls, return_exceptions=True)
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+
+    def track(self, kickoff_id: str):
+        """Start tracking an execution (no-op if already tracked)."""
+        if kickoff_id in self._tracked:
+            return
+        now = time.monotonic()
+        self._tracked[kickoff_id] = {"started": now, "errors": 0, "state": None}
+        heapq.heappush(self._schedule, (now, kickoff_id))
+        self.start()
+        self._wake.set()
+
+    async def wait(self, kickoff_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for an execution to finish, tracking it if necessary.
+
+        Returns:
+            Final status information
+
+        Raises:
+            RuntimeError: If the execution failed or polling gave up
+            asyncio.TimeoutError: If timeout elapses first (tracking continues)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(kickoff_id, []).append(future)
+        self.track(kickoff_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            waiters = self._waiters.get(kickoff_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[kickoff_id]
+
+    def _next_interval(self, entry: Dict[str, Any]) -> float:
+        # Check young executions often; back off to max_interval for long runs
+        age = time.monotonic() - entry["started"]
+        return min(self.max_interval, max(self.poll_interval, age / 10))
+
+    def _reschedule(self, kickoff_id: str, entry: Dict[str, Any]):
+        heapq.heappush(self._schedule, (time.monotonic() + self._next_interval(entry), kickoff_id))
+        # The loop may be sleeping until a later deadline (or indefinitely)
+        self._wake.set()
+
+    async def _notify(self, kickoff_id: str, status: Optional[Dict[str, Any]], error: Optional[str]):
+        if not self.on_update:
+            return
+        try:
+            outcome = self.on_update(kickoff_id, status, error)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        except Exception as e:
+            print(f"Execution tracker callback failed for {kickoff_id}: {e}")
+
+    def _finish(self, kickoff_id: str, status: Optional[Dict[str, Any]], error: Optional[str]):
+        self._tracked.pop(kickoff_id, None)
+        self.stats["failed" if error else "completed"] += 1
+        for future in self._waiters.pop(kickoff_id, []):
+            if future.done():
+                continue
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(status)
+
+    async def _poll(self, kickoff_id: str, semaphore: asyncio.Semaphore):
+        entry = self._tracked.get(kickoff_id)
+        if entry is None:
+            return
+
+        async with semaphore:
+            self.stats["polls"] += 1
+            try:
+                status = await self.client.get_status(kickoff_id)
+            except Exception as e:
+                self.stats["errors"] += 1
+                entry["errors"] += 1
+                if entry["errors"] >= self.max_errors:
+                    error = f"Status polling failed {entry['errors']} times: {e}"
+                    await self._notify(kickoff_id, None, error)
+                    self._finish(kickoff_id, None, error)
+                else:
+                    self._reschedule(kickoff_id, entry)
+                return
+
+        entry["errors"] = 0
+        try:
+            done, error = is_finished(status), None
+        except RuntimeError as e:
+            done, error = True, str(e)
+
+        state = execution_state(status)
+        if done or state != entry["state"]:
+            entry["state"] = state
+            await self._notify(kickoff_id, status, error)
+
+        if done:
+            self._finish(kickoff_id, status, error)
+        else:
+            self._reschedule(kickoff_id, entry)
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+        while True:
+            self._wake.clear()
+            now = time.monotonic()
+
+            # Each due poll runs as its own task, so one slow response never delays the rest
+            while self._schedule and self._schedule[0][0] <= now:
+                _, kickoff_id = heapq.heappop(self._schedule)
+                if kickoff_id in self._tracked:
+                    task = asyncio.create_task(self._poll(kickoff_id, semaphore))
+                    self._polls.add(task)
+                    task.add_done_callback(self._polls.discard)
+
+            delay = self._schedule[0][0] - now if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
@@ -1,43 +1,136 @@
 import os
 import time
+import asyncio
+import inspect
 import requests
-from typing import Dict, List, Optional, Any
+import httpx
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
+from crew_inputs import InputsCache, default_inputs_cache, validate_inputs
 
 load_dotenv()
 
+# CrewAI AMP uses uppercase states like "SUCCESS", "FAILED"
+SUCCESS_STATES = ("SUCCESS", "COMPLETED", "DONE", "FINISHED")
+FAILURE_STATES = ("FAILED", "ERROR", "CANCELLED", "CANCELED")
+
+
+def _credentials(crew_url: Optional[str], crew_token: Optional[str]) -> Tuple[str, str]:
+    """Resolve the crew URL and token from arguments or the environment."""
+    crew_url = crew_url or os.environ.get("CREW_URL")
+    crew_token = crew_token or os.environ.get("CREW_TOKEN")
+
+    if not crew_url:
+        raise ValueError("CREW_URL must be provided or set in environment")
+    if not crew_token:
+        raise ValueError("CREW_TOKEN must be provided or set in environment")
+
+    # Remove trailing slash from URL if present
+    return crew_url.rstrip("/"), crew_token
+
+
+def execution_state(status: Dict[str, Any]) -> str:
+    """Uppercase execution state from a status response ("" if absent)."""
+    # CrewAI AMP uses "state" field (not "status")
+    state_value = status.get("state") or status.get("status") or ""
+    return state_value.upper() if isinstance(state_value, str) else ""
+
+
+def is_finished(status: Dict[str, Any]) -> bool:
+    """
+    True if the execution succeeded, False while it is still running.
+
+    Raises:
+        RuntimeError: If the execution failed or was cancelled
+    """
+    state = execution_state(status)
+    if state in SUCCESS_STATES:
+        return True
+    if state in FAILURE_STATES:
+        raise RuntimeError(f"Execution failed with state: {state}")
+
+    # If state is empty/None but we have a result, might be completed
+    return not state and bool(status.get("result"))
+
+
+def _conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match header for revalidating a cached inputs entry."""
+    return {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+
+
+def _kickoff_error(response) -> Exception:
+    """Error with the response details (works for requests and httpx responses)."""
+    try:
+        error_detail = response.json()
+    except ValueError:
+        error_detail = response.text
+    return Exception(f"HTTP {response.status_code}: {error_detail}")
+
 
 class CrewAIClient:
-    """Client for interacting with CrewAI AMP deployed crews."""
+    """
+    Client for interacting with CrewAI AMP deployed crews.
+
+    Requests go through one requests.Session, so status polls reuse a
+    keep-alive connection instead of opening a new TCP+TLS connection each time.
+    """
 
-    def __init__(self, crew_url: str = None, crew_token: str = None):
+    def __init__(
+        self,
+        crew_url: str = None,
+        crew_token: str = None,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        max_connections: int = 10,
+        inputs_cache: Optional[InputsCache] = None
+    ):
         """
         Initialize the CrewAI client.
 
         Args:
             crew_url: The URL of your deployed crew (e.g., https://your-crew-url.crewai.com)
             crew_token: Bearer token for authentication
+            connect_timeout: Seconds to wait for a connection (default: 10)
+            read_timeout: Seconds to wait for a response (default: 60)
+            max_connections: Keep-alive connections kept in the pool (default: 10)
+            inputs_cache: Cache for get_inputs() (default: the shared process/disk cache)
         """
-        self.crew_url = crew_url or os.environ.get("CREW_URL")
-        self.crew_token = crew_token or os.environ.get("CREW_TOKEN")
-
-        if not self.crew_url:
-            raise ValueError("CREW_URL must be provided or set in environment")
-        if not self.crew_token:
-            raise ValueError("CREW_TOKEN must be provided or set in environment")
-
-        # Remove trailing slash from URL if present
-        self.crew_url = self.crew_url.rstrip("/")
+        self.crew_url, self.crew_token = _credentials(crew_url, crew_token)
+        self.timeout = (connect_timeout, read_timeout)
+        self.inputs_cache = inputs_cache or default_inputs_cache()
 
         self.headers = {
             "Authorization": f"Bearer {self.crew_token}",
             "Content-Type": "application/json"
         }
 
-    def get_inputs(self) -> List[str]:
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self) -> "CrewAIClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def get_inputs(self, refresh: bool = False) -> List[str]:
         """
         Retrieve the required inputs for this crew.
 
+        Answers from the inputs cache while it is fresh; after that the server
+        is asked with If-None-Match and a 304 just renews the cached copy.
+
+        Args:
+            refresh: Revalidate with the server even if the cache is fresh
+
         Returns:
             List of required input parameter names
 
@@ -45,19 +138,41 @@ class CrewAIClient:
             >>> client.get_inputs()
             ['topic', 'current_year']
         """
+        entry = self.inputs_cache.get(self.crew_url)
+        if not refresh and self.inputs_cache.is_fresh(entry):
+            return entry["inputs"]
+
         url = f"{self.crew_url}/inputs"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, headers=_conditional_headers(entry), timeout=self.timeout)
+        if response.status_code == 304:
+            if entry:
+                self.inputs_cache.touch(self.crew_url)
+                return entry["inputs"]
+            # Nothing cached to renew (e.g. a proxy answered 304): ask for the body
+            response = self.session.get(url, headers={"Cache-Control": "no-cache"}, timeout=self.timeout)
         response.raise_for_status()
 
         data = response.json()
-        return data.get("inputs", [])
+        inputs = data.get("inputs", [])
+        self.inputs_cache.put(self.crew_url, inputs, response.headers.get("ETag"))
+        return inputs
+
+    def validate(self, inputs: Dict[str, Any]):
+        """
+        Check inputs against the crew's (cached) required inputs.
 
-    def kickoff(self, inputs: Dict[str, Any]) -> str:
+        Raises:
+            InputValidationError: If a required input is missing or blank
+        """
+        validate_inputs(self.get_inputs(), inputs)
+
+    def kickoff(self, inputs: Dict[str, Any], validate: bool = True) -> str:
         """
         Start crew execution with the provided inputs.
 
         Args:
             inputs: Dictionary of input parameters (e.g., {"topic": "AI", "year": "2025"})
+            validate: Check inputs locally first, so bad payloads never reach AMP (default: True)
 
         Returns:
             kickoff_id for tracking the execution
@@ -67,18 +182,20 @@ class CrewAIClient:
             >>> print(kickoff_id)
             'abcd1234-5678-90ef-ghij-klmnopqrstuv'
         """
+        if validate:
+            self.validate(inputs)
+
         url = f"{self.crew_url}/kickoff"
         payload = {"inputs": inputs}
 
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self.session.post(url, json=payload, timeout=self.timeout)
 
         # Better error handling with response details
         if not response.ok:
-            try:
-                error_detail = response.json()
-                raise Exception(f"HTTP {response.status_code}: {error_detail}")
-            except:
-                response.raise_for_status()
+            if response.status_code in (400, 422):
+                # The crew's inputs may have changed since they were cached
+                self.inputs_cache.invalidate(self.crew_url)
+            raise _kickoff_error(response)
 
         data = response.json()
         return data["kickoff_id"]
@@ -98,7 +215,7 @@ class CrewAIClient:
             >>> print(status)
         """
         url = f"{self.crew_url}/status/{kickoff_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, timeout=self.timeout)
         response.raise_for_status()
 
         return response.json()
@@ -135,20 +252,7 @@ class CrewAIClient:
             if callback:
                 callback(status)
 
-            # Get state, handling None values
-            # CrewAI AMP uses "state" field (not "status")
-            state_value = status.get("state") or status.get("status") or ""
-            state = state_value.upper() if isinstance(state_value, str) else ""
-
-            # Check for completion states
-            # CrewAI AMP uses uppercase states like "SUCCESS", "FAILED"
-            if state in ("SUCCESS", "COMPLETED", "DONE", "FINISHED"):
-                return status
-            elif state in ("FAILED", "ERROR", "CANCELLED", "CANCELED"):
-                raise RuntimeError(f"Execution failed with state: {state}")
-
-            # If state is empty/None but we have a result, might be completed
-            if not state and status.get("result"):
+            if is_finished(status):
                 return status
 
             # Check timeout
@@ -188,3 +292,175 @@ class CrewAIClient:
             timeout=timeout,
             callback=callback
         )
+
+
+class AsyncCrewAIClient:
+    """
+    Async client for CrewAI AMP deployed crews.
+
+    All calls share one httpx.AsyncClient, so any number of executions can be
+    polled from one event loop over a handful of keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        crew_url: str = None,
+        crew_token: str = None,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        inputs_cache: Optional[InputsCache] = None
+    ):
+        """
+        Initialize the async CrewAI client.
+
+        Args:
+            crew_url: The URL of your deployed crew (e.g., https://your-crew-url.crewai.com)
+            crew_token: Bearer token for authentication
+            connect_timeout: Seconds to wait for a connection (default: 10)
+            read_timeout: Seconds to wait for a response (default: 60)
+            max_connections: Maximum open connections in the pool (default: 20)
+            max_keepalive_connections: Idle connections kept alive (default: 10)
+            keepalive_expiry: Seconds an idle connection is kept (default: 60)
+            inputs_cache: Cache for get_inputs() (default: the shared process/disk cache)
+        """
+        self.crew_url, self.crew_token = _credentials(crew_url, crew_token)
+        self.inputs_cache = inputs_cache or default_inputs_cache()
+        self.headers = {
+            "Authorization": f"Bearer {self.crew_token}",
+            "Content-Type": "application/json"
+        }
+        self.http = httpx.AsyncClient(
+            base_url=self.crew_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    async def __aenter__(self) -> "AsyncCrewAIClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        await self.http.aclose()
+
+    async def get_inputs(self, refresh: bool = False) -> List[str]:
+        """Retrieve the required inputs for this crew (cached, revalidated with If-None-Match)."""
+        entry = self.inputs_cache.get(self.crew_url)
+        if not refresh and self.inputs_cache.is_fresh(entry):
+            return entry["inputs"]
+
+        requested_at = time.time()
+        async with self.inputs_cache.fetch_lock(self.crew_url):
+            # Concurrent callers wait here and reuse the revalidation that just finished
+            entry = self.inputs_cache.get(self.crew_url)
+            if self.inputs_cache.is_fresh(entry) and (not refresh or entry["fetched_at"] >= requested_at):
+                return entry["inputs"]
+
+            response = await self.http.get("/inputs", headers=_conditional_headers(entry))
+            if response.status_code == 304:
+                if entry:
+                    self.inputs_cache.touch(self.crew_url)
+                    return entry["inputs"]
+                # Nothing cached to renew (e.g. a proxy answered 304): ask for the body
+                response = await self.http.get("/inputs", headers={"Cache-Control": "no-cache"})
+            response.raise_for_status()
+
+            inputs = response.json().get("inputs", [])
+            self.inputs_cache.put(self.crew_url, inputs, response.headers.get("ETag"))
+            return inputs
+
+    async def validate(self, inputs: Dict[str, Any]):
+        """Check inputs against the crew's (cached) required inputs."""
+        validate_inputs(await self.get_inputs(), inputs)
+
+    async def kickoff(self, inputs: Dict[str, Any], validate: bool = True) -> str:
+        """
+        Start crew execution with the provided inputs.
+
+        Args:
+            inputs: Dictionary of input parameters
+            validate: Check inputs locally first (default: True)
+
+        Returns:
+            kickoff_id for tracking the execution
+        """
+        if validate:
+            await self.validate(inputs)
+
+        response = await self.http.post("/kickoff", json={"inputs": inputs})
+        if response.is_error:
+            if response.status_code in (400, 422):
+                self.inputs_cache.invalidate(self.crew_url)
+            raise _kickoff_error(response)
+        return response.json()["kickoff_id"]
+
+    async def get_status(self, kickoff_id: str) -> Dict[str, Any]:
+        """Check the execution status of a crew."""
+        response = await self.http.get(f"/status/{kickoff_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def wait_for_completion(
+        self,
+        kickoff_id: str,
+        poll_interval: float = 5,
+        timeout: Optional[float] = None,
+        callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """
+        Poll the status endpoint until execution completes or fails.
+
+        Args:
+            kickoff_id: The ID returned from kickoff()
+            poll_interval: Seconds between status checks (default: 5)
+            timeout: Maximum seconds to wait (default: None = no timeout)
+            callback: Optional function (or coroutine function) called with status on each poll
+
+        Returns:
+            Final status information
+        """
+        start_time = time.monotonic()
+
+        while True:
+            status = await self.get_status(kickoff_id)
+
+            if callback:
+                outcome = callback(status)
+                if inspect.isawaitable(outcome):
+                    await outcome
+
+            if is_finished(status):
+                return status
+
+            if timeout and (time.monotonic() - start_time) > timeout:
+                raise TimeoutError(f"Execution did not complete within {timeout} seconds")
+
+            await asyncio.sleep(poll_interval)
+
+    async def kickoff_and_wait(
+        self,
+        inputs: Dict[str, Any],
+        poll_interval: float = 5,
+        timeout: Optional[float] = None,
+        callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """Kickoff and wait for completion in one call."""
+        kickoff_id = await self.kickoff(inputs)
+        print(f"Crew execution started. Kickoff ID: {kickoff_id}")
+
+        return await self.wait_for_completion(
+            kickoff_id,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            callback=callback
+        )
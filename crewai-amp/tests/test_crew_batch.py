@@ -0,0 +1,29 @@
+from crew_batch import KickoffBatch, evict_finished
+
+
+def make_batches(count: int, submitting: bool = False):
+    batches = {}
+    for _ in range(count):
+        batch = KickoffBatch(total=1, submitting=submitting)
+        batches[batch.batch_id] = batch
+    return batches
+
+
+def test_nothing_evicted_below_limit() -> None:
+    for count in (0, 1, 50, 98, 99):
+        batches = make_batches(count)
+        assert evict_finished(batches, 100) == []
+        assert len(batches) == count
+
+
+def test_oldest_finished_evicted_at_limit() -> None:
+    batches = make_batches(100)
+    oldest = next(iter(batches))
+    assert evict_finished(batches, 100) == [oldest]
+    assert len(batches) == 99
+
+
+def test_submitting_batches_kept() -> None:
+    batches = make_batches(100, submitting=True)
+    assert evict_finished(batches, 100) == []
+    assert len(batches) == 100
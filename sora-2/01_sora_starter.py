@@ -1,43 +1,51 @@
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import asyncio
+from sora_client import AsyncSoraClient, STATUS_COMPLETED, failure_message
+from sora_poller import VideoPoller
 
-load_dotenv()
-
-openai = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-
-def download_video(video_id: str, output_path: str):
+async def download_video(client: AsyncSoraClient, video_id: str, output_path: str):
     """Download the generated video."""
-    # Ensure output directory exists
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-
     print(f"Downloading video {video_id}...")
-    content = openai.videos.download_content(video_id, variant="video")
-    content.write_to_file(output_path)
+    await client.download_to_file(video_id, output_path, variant="video")
     print(f"Saved to {output_path}")
 
-# Example 1: Long-form video (landscape) - auto-polls until complete
-print("Creating long-form video (landscape)...")
-long_video = openai.videos.create_and_poll(
-    model="sora-2",
-    prompt="A neon-lit drone shot over a rainy sci-fi street; shallow DOF; slow dolly; ambient city hiss.",
-    seconds='4',
-    size="1280x720"
-)
-
-print(f"Long-form video completed. ID: {long_video.id}")
-download_video(long_video.id, "outputs/long_form.mp4")
-
-# # Example 2: Short-form video (vertical/portrait) - auto-polls until complete
-# print("\nCreating short-form video (vertical)...")
-# short_video = openai.videos.create_and_poll(
-#     model="sora-2",
-#     prompt="Vertical street food closeups; handheld micro-jitters; sodium vapor lights.",
-#     seconds='4',
-#     size="720x1280"
-# )
-
-# print(f"Short-form video completed. ID: {short_video.id}")
-# download_video(short_video.id, "outputs/short_form.mp4")
+async def create_and_poll(client: AsyncSoraClient, poller: VideoPoller, **params):
+    """Start a video and wait on the poller until it finishes."""
+    video = await client.create(**params)
+    video = await poller.wait(video.id)
+    if video.status != STATUS_COMPLETED:
+        raise RuntimeError(f"Video {video.id} {video.status}: {failure_message(video)}")
+    return video
+
+async def main():
+    async with AsyncSoraClient() as client:
+        poller = VideoPoller(client)
+
+        # Example 1: Long-form video (landscape) - polls until complete
+        print("Creating long-form video (landscape)...")
+        long_video = await create_and_poll(
+            client, poller,
+            model="sora-2",
+            prompt="A neon-lit drone shot over a rainy sci-fi street; shallow DOF; slow dolly; ambient city hiss.",
+            seconds='4',
+            size="1280x720"
+        )
+
+        print(f"Long-form video completed. ID: {long_video.id}")
+        await download_video(client, long_video.id, "outputs/long_form.mp4")
+
+        # # Example 2: Short-form video (vertical/portrait) - polls until complete
+        # print("\nCreating short-form video (vertical)...")
+        # short_video = await create_and_poll(
+        #     client, poller,
+        #     model="sora-2",
+        #     prompt="Vertical street food closeups; handheld micro-jitters; sodium vapor lights.",
+        #     seconds='4',
+        #     size="720x1280"
+        # )
+
+        # print(f"Short-form video completed. ID: {short_video.id}")
+        # await download_video(client, short_video.id, "outputs/short_form.mp4")
+
+        await poller.close()
+
+asyncio.run(main())
@@ -1,105 +1,104 @@
 import os
 import sys
+import json
 import time
+import asyncio
 import argparse
-import requests
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
-
-openai = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
-
-# Job status constants
-STATUS_COMPLETED = "completed"
-STATUS_FAILED = "failed"
-STATUS_CANCELED = "canceled"
-
-# Example prompts
-EXAMPLES = {
-    "long_form": {
-        "prompt": "A neon-lit drone shot over a rainy sci-fi street; shallow DOF; slow dolly; ambient city hiss.",
-        "size": "1280x720",
-        "name": "long_form_example.mp4"
-    },
-    "short_form": {
-        "prompt": "Vertical street food closeups; handheld micro-jitters; sodium vapor lights.",
-        "size": "720x1280",
-        "name": "short_form_example.mp4"
-    }
-}
-
-def create_video_with_progress(prompt: str, *, model="sora-2", seconds='4', size="1280x720", input_reference=None, poll_interval=2):
+from sora_client import AsyncSoraClient, EXAMPLES, STATUS_COMPLETED, STATUS_FAILED, ACTIVE_STATUSES, failure_message
+from sora_poller import VideoPoller
+from sora_scheduler import AdmissionScheduler
+from sora_download import download_variants, format_report, variant_paths
+from sora_batch import BatchManifest, BatchRunner, load_prompts, expand_tasks
+from sora_sync import LibrarySync, SyncManifest
+from sora_reference import ReferenceCache
+
+# Pooled async API client (OPENAI_API_KEY from .env)
+client = AsyncSoraClient()
+
+# Shared status poller (refreshes all in-flight videos together, adaptive interval)
+poller = VideoPoller(client)
+
+# Normalized reference images (shared so repeated uses hit the memory cache)
+references = ReferenceCache()
+
+def print_progress(video, bar_length=30):
+    """Render a single-line progress bar for a video."""
+    progress = getattr(video, "progress", 0) or 0
+    filled_length = int((progress / 100) * bar_length)
+    bar = "=" * filled_length + "-" * (bar_length - filled_length)
+    status_text = "Queued" if video.status == "queued" else "Processing"
+
+    eta = poller.eta(video.id)
+    eta_text = f" ETA {eta:.0f}s" if eta is not None else ""
+
+    sys.stdout.write(f"\r{status_text}: [{bar}] {progress:.1f}%{eta_text}   ")
+    sys.stdout.flush()
+
+async def wait_with_progress(video_id: str):
+    """Wait until a video finishes, drawing a progress bar from the shared poller."""
+    video = await poller.wait(video_id, on_update=print_progress)
+
+    # Move to next line after progress output
+    sys.stdout.write("\n\n")
+    return video
+
+async def create_video_with_progress(prompt: str, *, model="sora-2", seconds='4', size="1280x720", input_reference=None,
+                                     reference_cache: ReferenceCache = references):
     """
     Create a Sora video with a progress bar showing generation status.
-    If input_reference is a binary file handle, it will be treated as image->video.
+    If input_reference is an image path, it is resized to `size` (cached by
+    content hash in reference_cache) and the video is generated image->video.
     """
     print(f"Creating video with prompt: '{prompt}'")
     print(f"Model: {model}, Duration: {seconds}s, Size: {size}\n")
 
+    upload = None
+    if input_reference:
+        reference = await reference_cache.get(input_reference, size)
+        upload = reference.upload()
+        print(f"Reference image: {reference.path}{'' if reference.resized else ' (not resized)'}\n")
+
     # Create the video
-    if input_reference is None:
-        video = openai.videos.create(
-            model=model,
-            prompt=prompt,
-            seconds=seconds,
-            size=size
-        )
-    else:
-        video = openai.videos.create(
-            model=model,
-            prompt=prompt,
-            seconds=seconds,
-            size=size,
-            input_reference=input_reference
-        )
+    video = await client.create(
+        prompt,
+        model=model,
+        seconds=seconds,
+        size=size,
+        input_reference=upload
+    )
 
     print(f"Video generation started. ID: {video.id}\n")
 
     # Poll with progress bar
-    progress = getattr(video, "progress", 0)
-    bar_length = 30
-
-    while video.status in ("in_progress", "queued"):
-        # Refresh status
-        video = openai.videos.retrieve(video.id)
-        progress = getattr(video, "progress", 0)
-
-        filled_length = int((progress / 100) * bar_length)
-        bar = "=" * filled_length + "-" * (bar_length - filled_length)
-        status_text = "Queued" if video.status == "queued" else "Processing"
-
-        sys.stdout.write(f"\r{status_text}: [{bar}] {progress:.1f}%")
-        sys.stdout.flush()
-        time.sleep(poll_interval)
-
-    # Move to next line after progress loop
-    sys.stdout.write("\n\n")
+    if video.status in ACTIVE_STATUSES:
+        print_progress(video)
+        video = await wait_with_progress(video.id)
 
     # Check for failure
     if video.status == STATUS_FAILED:
-        message = getattr(
-            getattr(video, "error", None), "message", "Video generation failed"
-        )
-        raise RuntimeError(f"Video generation failed: {message}")
+        raise RuntimeError(f"Video generation failed: {failure_message(video)}")
 
     return video
 
-def download_video(video_id: str, output_path: str):
-    """Download the generated video using the official download_content method."""
+async def download_video(video_id: str, output_path: str):
+    """
+    Download the video, thumbnail and spritesheet in parallel.
+
+    Each file is streamed to a temp file and renamed into place; the thumbnail
+    and spritesheet are saved next to the video (e.g. clip_thumbnail.webp).
+    """
     print(f"Downloading video content...")
+    paths = variant_paths(output_path)
 
-    # Ensure output directory exists
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+    async def fetch(video_id: str, variant: str):
+        return await client.download_to_file(video_id, paths[variant], variant=variant)
 
-    content = openai.videos.download_content(video_id, variant="video")
-    content.write_to_file(output_path)
+    report = await download_variants(fetch, video_id)
+    print(format_report(report))
     print(f"Saved to {output_path}")
+    return report
 
-def list_videos(limit=20, after=None, order="desc"):
+async def list_videos(limit=20, after=None, order="desc"):
     """
     List all videos in your library.
 
@@ -109,16 +108,11 @@ def list_videos(limit=20, after=None, order="desc"):
         order: Sort order - "asc" or "desc" (default: "desc")
 
     Returns:
-        List of video objects
+        Page of video objects
     """
-    params = {"limit": limit, "order": order}
-    if after:
-        params["after"] = after
-
-    videos = openai.videos.list(**params)
-    return videos
+    return await client.list(limit=limit, after=after, order=order)
 
-def delete_video(video_id: str):
+async def delete_video(video_id: str):
     """
     Delete a video from OpenAI's storage.
 
@@ -129,14 +123,14 @@ def delete_video(video_id: str):
         Deletion confirmation response
     """
     print(f"Deleting video {video_id}...")
-    response = openai.videos.delete(video_id)
+    response = await client.delete(video_id)
     print(f"Video deleted successfully")
     return response
 
-def print_video_library():
+async def print_video_library():
     """Print a formatted list of all videos in your library."""
     print("\n=== Your Video Library ===\n")
-    videos = list_videos()
+    videos = await list_videos()
 
     if not videos.data:
         print("No videos found in your library.")
@@ -149,11 +143,11 @@ def print_video_library():
         print(f"  Model: {video.model}")
         print(f"  Duration: {video.seconds}s, Size: {video.size}")
         print(f"  Created: {video.created_at}")
-        if hasattr(video, 'progress'):
+        if video.progress is not None:
             print(f"  Progress: {video.progress}%")
         print()
 
-def remix_video(video_id: str, remix_prompt: str, poll_interval=2):
+async def remix_video(video_id: str, remix_prompt: str):
     """
     Remix an existing video with a new prompt using the /remix endpoint.
     Returns the new remixed video object.
@@ -161,62 +155,26 @@ def remix_video(video_id: str, remix_prompt: str, poll_interval=2):
     print(f"\nRemixing video {video_id}")
     print(f"Remix prompt: '{remix_prompt}'\n")
 
-    # Use the raw API endpoint for remix
-    url = f"https://api.openai.com/v1/videos/{video_id}/remix"
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "prompt": remix_prompt
-    }
-
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    video_data = response.json()
-
-    video_id_new = video_data["id"]
-    print(f"Remix started. ID: {video_id_new}\n")
+    remix = await client.remix(video_id, remix_prompt)
+    print(f"Remix started. ID: {remix.id}\n")
 
     # Poll with progress bar
-    progress = 0
-    bar_length = 30
-
-    while True:
-        video = openai.videos.retrieve(video_id_new)
-        progress = getattr(video, "progress", 0)
-
-        filled_length = int((progress / 100) * bar_length)
-        bar = "=" * filled_length + "-" * (bar_length - filled_length)
-        status_text = "Queued" if video.status == "queued" else "Processing"
-
-        sys.stdout.write(f"\r{status_text}: [{bar}] {progress:.1f}%")
-        sys.stdout.flush()
-
-        if video.status not in ("in_progress", "queued"):
-            break
-
-        time.sleep(poll_interval)
-
-    sys.stdout.write("\n\n")
+    video = await wait_with_progress(remix.id)
 
     if video.status == STATUS_FAILED:
-        message = getattr(
-            getattr(video, "error", None), "message", "Remix failed"
-        )
-        raise RuntimeError(f"Remix failed: {message}")
+        raise RuntimeError(f"Remix failed: {failure_message(video, 'Remix failed')}")
 
     return video
 
-def cmd_list():
+async def cmd_list():
     """Command: List all videos in library."""
-    print_video_library()
+    await print_video_library()
 
-def cmd_delete(video_id: str):
+async def cmd_delete(video_id: str):
     """Command: Delete a video by ID."""
-    delete_video(video_id)
+    await delete_video(video_id)
 
-def cmd_create():
+async def cmd_create(args):
     """Command: Interactive video creation."""
     print("\n=== Create Video ===\n")
 
@@ -275,23 +233,25 @@ def cmd_create():
         return
 
     # Create the video
-    video = create_video_with_progress(
+    video = await create_video_with_progress(
         prompt=prompt,
         model=model,
         seconds=seconds,
-        size=size
+        size=size,
+        input_reference=args.input_reference,
+        reference_cache=references
     )
 
     # Download if successful
     if video.status == STATUS_COMPLETED:
         print("Video generation completed successfully!")
         output_path = f"outputs/{output_name}"
-        download_video(video.id, output_path)
+        await download_video(video.id, output_path)
         print(f"\n✓ Video ID: {video.id}")
     else:
         print(f"Video generation ended with status: {video.status}")
 
-def cmd_remix(video_id: str):
+async def cmd_remix(video_id: str):
     """Command: Remix an existing video."""
     print(f"\n=== Remix Video {video_id} ===\n")
 
@@ -299,7 +259,7 @@ def cmd_remix(video_id: str):
     remix_prompt = input("Enter remix prompt: ").strip()
 
     # Remix the video (API only accepts prompt)
-    remixed = remix_video(
+    remixed = await remix_video(
         video_id=video_id,
         remix_prompt=remix_prompt
     )
@@ -308,11 +268,149 @@ def cmd_remix(video_id: str):
     if remixed.status == STATUS_COMPLETED:
         print("Remix completed successfully!")
         output_path = f"outputs/remix_{int(time.time())}.mp4"
-        download_video(remixed.id, output_path)
+        await download_video(remixed.id, output_path)
         print(f"\n✓ Remixed Video ID: {remixed.id}")
     else:
         print(f"Remix ended with status: {remixed.status}")
 
+def read_remix_prompts(args) -> list:
+    """Remix prompts from --remix-prompts, --remix-file, or typed in one per line."""
+    if args.remix_prompts:
+        return args.remix_prompts
+    if args.remix_file:
+        with open(args.remix_file) as f:
+            return [line.strip() for line in f if line.strip()]
+
+    print("Enter one remix prompt per line (blank line to finish):")
+    prompts = []
+    while True:
+        line = input(f"  {len(prompts) + 1}> ").strip()
+        if not line:
+            return prompts
+        prompts.append(line)
+
+async def remix_branch(scheduler: AdmissionScheduler, source, index: int, remix_prompt: str, output_dir: str):
+    """Run one remix variant under the scheduler, then download it; never raises."""
+    branch = {"index": index, "prompt": remix_prompt, "parent_video_id": source.id,
+              "video_id": None, "status": None, "output_path": None, "error": None}
+    try:
+        async with scheduler.admit(source.model or "sora-2", source.seconds or '4'):
+            remix = await client.remix(source.id, remix_prompt)
+            branch["video_id"] = remix.id
+            print(f"[submitted] #{index} {remix.id}: {remix_prompt}")
+            video = await poller.wait(remix.id)
+
+        branch["status"] = video.status
+        if video.status != STATUS_COMPLETED:
+            branch["error"] = failure_message(video, video.status)
+            return branch
+
+        output_path = os.path.join(output_dir, f"{video.id}.mp4")
+        paths = variant_paths(output_path)
+
+        async def fetch(video_id: str, variant: str):
+            return await client.download_to_file(video_id, paths[variant], variant=variant)
+
+        await download_variants(fetch, video.id)
+        branch["output_path"] = output_path
+    except Exception as e:
+        branch["status"] = branch["status"] or STATUS_FAILED
+        branch["error"] = str(e)
+    return branch
+
+async def cmd_remix_batch(video_id: str, args):
+    """Command: Remix one video into several variants at once."""
+    print(f"\n=== Remix Batch {video_id} ===\n")
+
+    prompts = read_remix_prompts(args)
+    if not prompts:
+        print("No remix prompts given.")
+        return
+
+    source = await client.retrieve(video_id)
+    output_dir = os.path.join("outputs", "remixes", video_id)
+    os.makedirs(output_dir, exist_ok=True)
+    lineage_path = os.path.join(output_dir, "lineage.json")
+    lineage = {"source_video_id": video_id, "model": source.model, "seconds": source.seconds, "variants": []}
+
+    # All variants run concurrently; the scheduler enforces the per-model rate and in-flight cap
+    scheduler = AdmissionScheduler()
+    branches = [remix_branch(scheduler, source, i, prompt, output_dir) for i, prompt in enumerate(prompts, 1)]
+    start = time.time()
+
+    for next_done in asyncio.as_completed(branches):
+        branch = await next_done
+        lineage["variants"].append(branch)
+        with open(lineage_path, "w") as f:
+            json.dump(lineage, f, indent=2)
+
+        elapsed = time.time() - start
+        if branch["output_path"]:
+            print(f"[completed] #{branch['index']} {branch['video_id']} after {elapsed:.0f}s -> {branch['output_path']}")
+        else:
+            print(f"[failed] #{branch['index']} {branch['video_id'] or '-'} after {elapsed:.0f}s: {branch['error']}")
+
+    completed = sum(1 for b in lineage["variants"] if b["output_path"])
+    print(f"\n{completed}/{len(prompts)} variants completed in {time.time() - start:.0f}s")
+    print(f"Lineage: {lineage_path}")
+
+async def cmd_batch(args):
+    """Command: Generate videos for every prompt x model x duration x size."""
+    print("\n=== Batch Generation ===\n")
+
+    prompts = load_prompts(args.prompts)
+    if not prompts:
+        print(f"No prompts found in {args.prompts}")
+        return
+
+    tasks = expand_tasks(prompts, args.models, args.seconds, args.sizes, args.input_reference)
+    manifest = BatchManifest(args.manifest)
+    runner = BatchRunner(
+        client,
+        poller,
+        manifest,
+        output_dir=os.path.dirname(args.manifest) or "outputs",
+        concurrency=args.concurrency,
+        retry_failed=args.retry_failed
+    )
+
+    report = await runner.run(tasks)
+
+    print("\n=== Batch Report ===\n")
+    print(f"Tasks run: {report['tasks_run']} ({report['completed']} completed, {report['failed']} failed)")
+    print(f"Elapsed: {report['elapsed_seconds']}s")
+    print(f"Throughput: {report['videos_per_minute']} videos/min, "
+          f"{report['video_seconds_per_minute']} video-seconds/min")
+    print(f"Downloaded: {report['megabytes_downloaded']} MB")
+    print(f"Status calls: {report['poller']['list_calls']} list, {report['poller']['retrieve_calls']} retrieve")
+    refs = report["references"]
+    if refs:
+        print(f"Reference images: {refs['encoded']} resized, {refs['memory_hits'] + refs['disk_hits']} reused")
+    print(f"Manifest: {args.manifest}")
+
+async def cmd_sync(args):
+    """Command: Mirror the whole video library to a local directory."""
+    print("\n=== Sync Library ===\n")
+
+    manifest = SyncManifest(os.path.join(args.sync_dir, "manifest.json"))
+    syncer = LibrarySync(
+        client,
+        manifest,
+        output_dir=args.sync_dir,
+        concurrency=args.download_concurrency,
+        prune=not args.no_prune
+    )
+
+    report = await syncer.run()
+
+    print("\n=== Sync Report ===\n")
+    print(f"Scanned: {report['scanned']} videos in {report['pages']} pages ({report['new']} new)")
+    print(f"Downloaded: {report['downloaded']} ({report['megabytes_downloaded']} MB), "
+          f"up to date: {report['up_to_date']}, not ready: {report['not_ready']}, failed: {report['failed']}")
+    print(f"Pruned: {report['pruned']}")
+    print(f"Elapsed: {report['elapsed_seconds']}s")
+    print(f"Manifest: {manifest.path}")
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -322,42 +420,82 @@ def main():
 Examples:
   python 02_sora_advanced.py list
   python 02_sora_advanced.py create
+  python 02_sora_advanced.py create --input-reference product.jpg
   python 02_sora_advanced.py delete video_123...
   python 02_sora_advanced.py remix video_123...
+  python 02_sora_advanced.py remix-batch video_123... --remix-prompts "as anime" "at night" "in snow"
+  python 02_sora_advanced.py batch --prompts prompts --seconds 4 8 --concurrency 4
+  python 02_sora_advanced.py sync --sync-dir outputs/library
         """
     )
 
     parser.add_argument(
         'command',
-        choices=['list', 'create', 'delete', 'remix'],
+        choices=['list', 'create', 'delete', 'remix', 'remix-batch', 'batch', 'sync'],
         help='Command to execute'
     )
 
     parser.add_argument(
         'video_id',
         nargs='?',
-        help='Video ID (required for delete and remix commands)'
+        help='Video ID (required for delete, remix and remix-batch commands)'
+    )
+
+    parser.add_argument(
+        '--input-reference',
+        help='Reference image for image->video (create and batch); resized to the video size'
     )
 
+    # Remix batch options
+    remix_batch = parser.add_argument_group('remix-batch options')
+    remix_batch.add_argument('--remix-prompts', nargs='+', help='Remix prompts, one variant each')
+    remix_batch.add_argument('--remix-file', help='Text file with one remix prompt per line')
+
+    # Batch options
+    batch = parser.add_argument_group('batch options')
+    batch.add_argument('--prompts', default='prompts', help='Prompt directory or JSON/JSONL manifest (default: prompts)')
+    batch.add_argument('--models', nargs='+', default=['sora-2'], choices=['sora-2', 'sora-2-pro'], help='Models to generate with')
+    batch.add_argument('--seconds', nargs='+', default=['4'], choices=['4', '8', '12'], help='Durations to generate')
+    batch.add_argument('--sizes', nargs='+', default=['1280x720'], choices=['1280x720', '720x1280'], help='Sizes to generate')
+    batch.add_argument('--concurrency', type=int, default=4, help='Maximum videos generating at once (default: 4)')
+    batch.add_argument('--manifest', default='outputs/batch/manifest.json', help='Resumable run manifest; videos are saved next to it')
+    batch.add_argument('--retry-failed', action='store_true', help='Re-run tasks that failed in a previous run')
+
+    # Sync options
+    sync = parser.add_argument_group('sync options')
+    sync.add_argument('--sync-dir', default='outputs/library', help='Mirror directory (manifest.json is kept there)')
+    sync.add_argument('--download-concurrency', type=int, default=8, help='Maximum videos downloading at once (default: 8)')
+    sync.add_argument('--no-prune', action='store_true', help='Keep local copies of videos deleted upstream')
+
     args = parser.parse_args()
 
-    # Execute command
-    if args.command == 'list':
-        cmd_list()
-    elif args.command == 'create':
-        cmd_create()
-    elif args.command == 'delete':
-        if not args.video_id:
-            print("Error: video_id is required for delete command")
-            print("Usage: python 02_sora_advanced.py delete <video_id>")
-            sys.exit(1)
-        cmd_delete(args.video_id)
-    elif args.command == 'remix':
-        if not args.video_id:
-            print("Error: video_id is required for remix command")
-            print("Usage: python 02_sora_advanced.py remix <video_id>")
-            sys.exit(1)
-        cmd_remix(args.video_id)
+    if args.command in ('delete', 'remix', 'remix-batch') and not args.video_id:
+        print(f"Error: video_id is required for {args.command} command")
+        print(f"Usage: python 02_sora_advanced.py {args.command} <video_id>")
+        sys.exit(1)
+
+    asyncio.run(run_command(args))
+
+async def run_command(args):
+    """Execute a command on one event loop, then close the client's connections."""
+    try:
+        if args.command == 'list':
+            await cmd_list()
+        elif args.command == 'create':
+            await cmd_create(args)
+        elif args.command == 'delete':
+            await cmd_delete(args.video_id)
+        elif args.command == 'remix':
+            await cmd_remix(args.video_id)
+        elif args.command == 'remix-batch':
+            await cmd_remix_batch(args.video_id, args)
+        elif args.command == 'batch':
+            await cmd_batch(args)
+        elif args.command == 'sync':
+            await cmd_sync(args)
+    finally:
+        await poller.close()
+        await client.aclose()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,42 +1,116 @@
 import os
+import re
+import json
 import time
-import requests
-from typing import Optional, Literal
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Literal, Set
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
+from sora_client import AsyncSoraClient, EXAMPLES, STATUS_QUEUED, STATUS_COMPLETED, STATUS_FAILED, failure_message
+from sora_jobs import Job, JobManager
+from sora_coalesce import RequestCoalescer
+from sora_scheduler import AdmissionScheduler, PRIORITY_INTERACTIVE
+from sora_poller import VideoPoller, ACTIVE_STATUSES
+from sora_streaming import file_response, proxy_response
+from sora_cache import VideoCache, VARIANT_MEDIA_TYPES, VARIANT_EXTENSIONS
+from sora_download import download_variants, format_report
+from sora_store import JobStore
+from sora_metrics import CONTENT_TYPE, Registry
+from sora_webhooks import (
+    WEBHOOK_SECRET_ENV, VIDEO_EVENTS, SeenEvents, WebhookVerificationError,
+    safety_net_policy, verify
+)
 
-openai = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
+# Metrics served at GET /metrics (Prometheus text format)
+metrics = Registry()
+upstream_requests = metrics.counter(
+    "sora_upstream_requests_total", "Requests sent to the Sora API", ("method", "endpoint", "status_code"))
+admission_wait = metrics.histogram(
+    "sora_admission_wait_seconds", "Time spent in the local admission queue", ("priority",))
+upstream_queue = metrics.histogram(
+    "sora_upstream_queue_seconds", "Time videos spent queued upstream before generation started", ("model",))
+generation_time = metrics.histogram(
+    "sora_generation_seconds", "Time from submission to a terminal status", ("model", "seconds", "size", "status"))
+download_time = metrics.histogram(
+    "sora_download_seconds", "Time to download a content variant from the API", ("variant",))
+download_bytes = metrics.counter(
+    "sora_download_bytes_total", "Bytes downloaded from the API", ("variant",))
+serve_time = metrics.histogram(
+    "sora_serve_seconds", "Time to send a /download response to the client", ("variant", "source"))
+served_bytes = metrics.counter(
+    "sora_served_bytes_total", "Bytes sent to clients by /download", ("variant", "source"))
+
+async def record_upstream(response):
+    """httpx response hook: count upstream calls by endpoint (video ids collapsed) and status."""
+    request = response.request
+    endpoint = re.sub(r"/videos/[^/]+", "/videos/{id}", request.url.path)
+    upstream_requests.inc(method=request.method, endpoint=endpoint, status_code=response.status_code)
+
+# Async Sora client; one pooled keep-alive connection set for polls, creates and downloads
+sora = AsyncSoraClient(event_hooks={"response": [record_upstream]})
+
+# Persistent job store (SQLite, see SORA_JOB_DB) and background job engine
+store = JobStore()
+jobs = JobManager(store)
+
+# Admission control for upstream submissions (per-model rate, priority, max in flight)
+scheduler = AdmissionScheduler()
+
+# Identical concurrent creates share one job; completed results can be reused on request
+coalescer = RequestCoalescer(jobs, store, scheduler)
+
+# Signing secret for POST /webhooks/sora; when set, polling drops to a slow safety net
+WEBHOOK_SECRET = os.environ.get(WEBHOOK_SECRET_ENV)
+seen_webhooks = SeenEvents()
+webhook_tasks: Set[asyncio.Task] = set()
+
+# One poller refreshes every in-flight video in bulk, on an adaptive schedule
+poller = VideoPoller(sora, policy=safety_net_policy() if WEBHOOK_SECRET else None)
+
+# Local content cache (size-bounded, LRU), see SORA_CACHE_DIR / SORA_CACHE_MAX_BYTES
+cache = VideoCache()
+
+# Background cache fills started by ranged downloads, keyed by video ID
+cache_fills: Dict[str, asyncio.Task] = {}
+
+metrics.gauge("sora_jobs_in_flight", "Background jobs currently running", function=lambda: jobs.in_flight)
+metrics.gauge("sora_admission_in_flight", "Generations holding an admission slot", function=lambda: scheduler.in_flight)
+metrics.gauge("sora_admission_queue_depth", "Submissions waiting for admission",
+              function=lambda: sum(c["queue_depth"] for c in scheduler.snapshot()["classes"].values()))
+metrics.gauge("sora_videos_polled", "Videos tracked by the shared poller", function=lambda: len(poller.tracked))
+metrics.gauge("sora_cache_hit_ratio", "Local cache hits / lookups since start",
+              function=lambda: cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0)
+metrics.gauge("sora_cache_bytes", "Bytes held in the local cache", function=lambda: cache.total_bytes())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume polling anything that was in flight when the process stopped
+    for job in store.list_unfinished():
+        jobs.resume(job, run_resume_job)
+        coalescer.track(job)
+    yield
+    await jobs.shutdown()
+    await poller.close()
+    await sora.aclose()
+    cache.close()
+    store.close()
 
 app = FastAPI(
     title="Sora Video API",
     description="API for managing and creating videos with OpenAI Sora",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Job status constants
-STATUS_COMPLETED = "completed"
-STATUS_FAILED = "failed"
-STATUS_CANCELED = "canceled"
-
-# Example prompts
-EXAMPLES = {
-    "long_form": {
-        "prompt": "A neon-lit drone shot over a rainy sci-fi street; shallow DOF; slow dolly; ambient city hiss.",
-        "size": "1280x720",
-        "name": "long_form_example.mp4"
-    },
-    "short_form": {
-        "prompt": "Vertical street food closeups; handheld micro-jitters; sodium vapor lights.",
-        "size": "720x1280",
-        "name": "short_form_example.mp4"
-    }
-}
+# Seconds between SSE keep-alive comments
+SSE_HEARTBEAT_SECONDS = 15
+
+# Most remix variants accepted in one remix-batch request
+MAX_REMIX_BATCH = 20
 
 # Pydantic models
 class CreateVideoRequest(BaseModel):
@@ -44,112 +118,203 @@ class CreateVideoRequest(BaseModel):
     model: Literal["sora-2", "sora-2-pro"] = "sora-2"
     seconds: Literal['4', '8', '12'] = '4'
     size: Literal["1280x720", "720x1280"] = "1280x720"
+    # Return an identical, already-completed video instead of generating again
+    reuse: bool = False
+    priority: Literal["interactive", "batch"] = "interactive"
 
 class CreateExampleRequest(BaseModel):
     example: Literal["long_form", "short_form"]
     model: Literal["sora-2", "sora-2-pro"] = "sora-2"
     seconds: Literal['4', '8', '12'] = '4'
+    reuse: bool = False
+    priority: Literal["interactive", "batch"] = "interactive"
 
 class RemixVideoRequest(BaseModel):
     remix_prompt: str
+    priority: Literal["interactive", "batch"] = "interactive"
+
+class RemixBatchRequest(BaseModel):
+    remix_prompts: list[str]
+    priority: Literal["interactive", "batch"] = "interactive"
+    # Stream each variant's completion as Server-Sent Events (otherwise return the jobs right away)
+    stream: bool = True
 
 class VideoResponse(BaseModel):
     id: str
-    status: str
-    model: str
-    seconds: str
-    size: str
+    status: Optional[str] = None
+    model: Optional[str] = None
+    seconds: Optional[str] = None
+    size: Optional[str] = None
     created_at: int
     progress: Optional[int] = None
+    # Local job details (only for videos created through this service)
+    job_id: Optional[str] = None
+    source_video_id: Optional[str] = None
+    output_path: Optional[str] = None
+
+class VideoListResponse(BaseModel):
+    data: list[VideoResponse]
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    video_id: Optional[str] = None
+    video_status: Optional[str] = None
+    progress: int = 0
+    model: Optional[str] = None
+    seconds: Optional[str] = None
+    size: Optional[str] = None
+    source_video_id: Optional[str] = None
+    eta_seconds: Optional[float] = None
+    estimated_completion_at: Optional[float] = None
+    output_path: Optional[str] = None
+    # Per-variant download report (path, sha256, bytes, seconds, mb_per_second)
+    assets: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    params: Dict[str, Any]
+    created_at: float
+    updated_at: float
+    # When the job's video was deleted (the job record is kept for history and lineage)
+    deleted_at: Optional[float] = None
+    status_url: str
+    # How a create was satisfied: "submitted", "coalesced" (joined an in-flight job) or "reused"
+    dedupe: Optional[str] = None
 
 # Helper functions
-def create_video_with_progress(prompt: str, *, model="sora-2", seconds='4', size="1280x720", poll_interval=2):
-    """Create a Sora video with polling."""
+async def wait_for_video(video_id: str, *, job: Optional[Job] = None):
+    """Wait on the shared poller until a video finishes, mirroring progress onto job."""
+    started = False
+
+    def on_update(v):
+        nonlocal started
+        progress = getattr(v, "progress", 0) or 0
+        print(f"{v.id} status: {v.status}, Progress: {progress}%")
+        if job:
+            job.update(video_status=v.status, progress=progress)
+        if not started and v.status != STATUS_QUEUED and v.created_at:
+            started = True
+            upstream_queue.observe(max(0.0, time.time() - v.created_at), model=v.model or "unknown")
+
+    video = await poller.wait(video_id, on_update=on_update)
+    if job:
+        job.update(video_status=video.status, model=video.model, seconds=video.seconds, size=video.size)
+    return video
+
+async def create_video_with_progress(prompt: str, *, model="sora-2", seconds='4', size="1280x720",
+                                     priority: str = PRIORITY_INTERACTIVE, job: Optional[Job] = None):
+    """Create a Sora video and poll it without blocking the event loop."""
     print(f"Creating video with prompt: '{prompt}'")
     print(f"Model: {model}, Duration: {seconds}s, Size: {size}\n")
 
-    video = openai.videos.create(
-        model=model,
-        prompt=prompt,
-        seconds=seconds,
-        size=size
-    )
+    # The slot is held until the video finishes, so the cap tracks upstream concurrency
+    async with scheduler.admit(model, seconds, priority, key=job.id if job else None) as waited:
+        admission_wait.observe(waited, priority=priority)
+        submitted = time.time()
+        video = await sora.create(prompt, model=model, seconds=seconds, size=size)
 
-    print(f"Video generation started. ID: {video.id}\n")
+        print(f"Video generation started after {waited:.1f}s in queue. ID: {video.id}\n")
+        if job:
+            job.update(video_id=video.id, video_status=video.status)
 
-    # Poll with progress updates
-    while video.status in ("in_progress", "queued"):
-        video = openai.videos.retrieve(video.id)
-        progress = getattr(video, "progress", 0)
-        print(f"Status: {video.status}, Progress: {progress}%")
-        time.sleep(poll_interval)
+        if video.status in ACTIVE_STATUSES:
+            video = await wait_for_video(video.id, job=job)
 
+    generation_time.observe(time.time() - submitted, model=model, seconds=seconds, size=size, status=video.status)
     print(f"\nFinal status: {video.status}")
 
     if video.status == STATUS_FAILED:
-        message = getattr(
-            getattr(video, "error", None), "message", "Video generation failed"
-        )
-        raise RuntimeError(f"Video generation failed: {message}")
+        raise RuntimeError(f"Video generation failed: {failure_message(video)}")
 
     return video
 
-def download_video(video_id: str, output_path: str):
-    """Download the generated video."""
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-
-    content = openai.videos.download_content(video_id, variant="video")
-    content.write_to_file(output_path)
-    print(f"Saved to {output_path}")
-    return output_path
-
-def remix_video(video_id: str, remix_prompt: str, poll_interval=2):
+async def download_to_cache(video_id: str, variant: str = "video") -> str:
+    """Download a video variant into the local cache; cache hits cost no upstream traffic."""
+    path = cache.get(video_id, variant, count=False)
+    if path:
+        return path
+
+    start = time.time()
+    path, checksum = await sora.download_to_file(video_id, cache.path_for(video_id, variant), variant=variant)
+    download_time.observe(time.time() - start, variant=variant)
+    download_bytes.inc(os.path.getsize(path), variant=variant)
+    path = await asyncio.to_thread(cache.put, video_id, variant, path, checksum)
+    print(f"Saved to {path}")
+    return path
+
+async def source_profile(video_id: str):
+    """(model, seconds) of an existing video; a remix inherits both."""
+    source = store.get_by_video(video_id)
+    if source is None or not source.model:
+        source = await sora.retrieve(video_id)
+    return source.model or "sora-2", source.seconds or '4'
+
+async def remix_video(video_id: str, remix_prompt: str, *, priority: str = PRIORITY_INTERACTIVE, job: Optional[Job] = None):
     """Remix an existing video using the /remix endpoint."""
     print(f"Remixing video {video_id}")
     print(f"Remix prompt: '{remix_prompt}'\n")
 
-    # Use the raw API endpoint for remix
-    url = f"https://api.openai.com/v1/videos/{video_id}/remix"
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "prompt": remix_prompt
-    }
-
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    video_data = response.json()
-
-    video_id_new = video_data["id"]
-    print(f"Remix started. ID: {video_id_new}\n")
-
-    # Poll for completion
-    while True:
-        video = openai.videos.retrieve(video_id_new)
-        progress = getattr(video, "progress", 0)
-        print(f"Status: {video.status}, Progress: {progress}%")
+    model, seconds = await source_profile(video_id)
+    async with scheduler.admit(model, seconds, priority, key=job.id if job else None) as waited:
+        admission_wait.observe(waited, priority=priority)
+        submitted = time.time()
+        video = await sora.remix(video_id, remix_prompt)
 
-        if video.status not in ("in_progress", "queued"):
-            break
+        print(f"Remix started after {waited:.1f}s in queue. ID: {video.id}\n")
+        if job:
+            job.update(video_id=video.id, video_status=video.status)
 
-        time.sleep(poll_interval)
+        # Wait for completion on the shared poller
+        if video.status in ACTIVE_STATUSES:
+            video = await wait_for_video(video.id, job=job)
 
+    generation_time.observe(time.time() - submitted, model=model, seconds=seconds,
+                            size=video.size or "unknown", status=video.status)
     print(f"\nFinal status: {video.status}")
 
     if video.status == STATUS_FAILED:
-        message = getattr(
-            getattr(video, "error", None), "message", "Remix failed"
-        )
-        raise RuntimeError(f"Remix failed: {message}")
+        raise RuntimeError(f"Remix failed: {failure_message(video, 'Remix failed')}")
 
     return video
 
+async def fetch_variant(video_id: str, variant: str):
+    """Cache one variant and return (path, sha256)."""
+    path = await download_to_cache(video_id, variant)
+    entry = cache.entry(video_id, variant)
+    return path, entry["checksum"] if entry else None
+
+async def materialise_video(video_id: str, job: Optional[Job] = None):
+    """Fetch the video, thumbnail and spritesheet in parallel and record them on the job."""
+    report = await download_variants(fetch_variant, video_id)
+    print(f"Downloaded {video_id}:\n{format_report(report)}")
+    if job:
+        job.update(output_path=report["video"]["path"], assets=report)
+    return report
+
+def record_served(variant: str, source: str, started: float, size: int):
+    """Count a /download response served from "cache" or "upstream"."""
+    serve_time.observe(time.time() - started, variant=variant, source=source)
+    served_bytes.inc(size, variant=variant, source=source)
+
+def ensure_cached(video_id: str):
+    """Start a background download of the full video to the local cache (once per video)."""
+    if cache.entry(video_id) or video_id in cache_fills:
+        return
+
+    async def fill():
+        try:
+            await download_to_cache(video_id)
+        except Exception as e:
+            print(f"Cache fill failed for {video_id}: {e}")
+        finally:
+            cache_fills.pop(video_id, None)
+
+    cache_fills[video_id] = asyncio.create_task(fill())
+
 def video_to_response(video) -> VideoResponse:
-    """Convert OpenAI video object to response model."""
+    """Convert a Sora video object to response model."""
     return VideoResponse(
         id=video.id,
         status=video.status,
@@ -160,6 +325,101 @@ def video_to_response(video) -> VideoResponse:
         progress=getattr(video, "progress", None)
     )
 
+def video_event(video) -> Dict[str, Any]:
+    """Payload for an SSE status event."""
+    return {
+        "id": video.id,
+        "status": video.status,
+        "progress": getattr(video, "progress", None),
+        "eta_seconds": poller.eta(video.id),
+        "estimated_completion_at": poller.estimated_completion(video.id)
+    }
+
+def sse_message(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def job_to_video_response(job: Job) -> VideoResponse:
+    """Convert a stored job to a video listing entry."""
+    return VideoResponse(
+        id=job.video_id,
+        status=job.video_status,
+        model=job.model,
+        seconds=job.seconds,
+        size=job.size,
+        created_at=int(job.created_at),
+        progress=job.progress,
+        job_id=job.id,
+        source_video_id=job.source_video_id,
+        output_path=job.output_path
+    )
+
+def job_to_response(job: Job, dedupe: Optional[str] = None) -> JobResponse:
+    """Convert a background job to its response model."""
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        video_id=job.video_id,
+        video_status=job.video_status,
+        progress=job.progress,
+        model=job.model,
+        seconds=job.seconds,
+        size=job.size,
+        source_video_id=job.source_video_id,
+        eta_seconds=poller.eta(job.video_id) if job.video_id else None,
+        estimated_completion_at=poller.estimated_completion(job.video_id) if job.video_id else None,
+        output_path=job.output_path,
+        assets=job.assets,
+        error=job.error,
+        params=job.params,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        deleted_at=job.deleted_at,
+        status_url=f"/jobs/{job.id}",
+        dedupe=dedupe
+    )
+
+# Job runners (executed by the JobManager in the background)
+async def run_create_job(job: Job):
+    """Create a video, wait for it, then auto-download all variants."""
+    params = job.params
+    video = await create_video_with_progress(
+        prompt=params["prompt"],
+        model=params["model"],
+        seconds=params["seconds"],
+        size=params["size"],
+        priority=params.get("priority", PRIORITY_INTERACTIVE),
+        job=job
+    )
+    await materialise_video(video.id, job)
+
+async def run_remix_job(job: Job):
+    """Remix a video, wait for it, then auto-download all variants."""
+    params = job.params
+    video = await remix_video(
+        video_id=params["source_video_id"],
+        remix_prompt=params["remix_prompt"],
+        priority=params.get("priority", PRIORITY_INTERACTIVE),
+        job=job
+    )
+    await materialise_video(video.id, job)
+
+async def run_resume_job(job: Job):
+    """Pick a job back up after a restart: wait on its video, then auto-download."""
+    if not job.video_id:
+        # Unknown whether the create went through; don't risk paying twice
+        raise RuntimeError("Interrupted before the video was submitted")
+
+    # The video is already generating upstream: count it against the in-flight
+    # cap straight away, without queueing or spending a rate token
+    with scheduler.reserve():
+        video = await wait_for_video(job.video_id, job=job)
+        if video.status == STATUS_FAILED:
+            raise RuntimeError(f"Video generation failed: {failure_message(video)}")
+
+        await materialise_video(video.id, job)
+
 # API Endpoints
 
 @app.get("/")
@@ -174,117 +434,356 @@ def root():
             "get_video": "GET /videos/{video_id}",
             "delete_video": "DELETE /videos/{video_id}",
             "remix_video": "POST /videos/{video_id}/remix",
-            "download_video": "GET /videos/{video_id}/download"
+            "remix_batch": "POST /videos/{video_id}/remix-batch",
+            "list_remixes": "GET /videos/{video_id}/remixes",
+            "download_video": "GET /videos/{video_id}/download",
+            "video_events": "GET /videos/{video_id}/events",
+            "list_jobs": "GET /jobs",
+            "get_job": "GET /jobs/{job_id}",
+            "cache_stats": "GET /cache",
+            "dedupe_stats": "GET /dedupe",
+            "scheduler_stats": "GET /scheduler",
+            "sora_webhook": "POST /webhooks/sora",
+            "metrics": "GET /metrics"
         }
     }
 
-@app.get("/videos", response_model=list[VideoResponse])
-def list_videos(limit: int = 20, order: str = "desc"):
-    """List all videos in library."""
-    videos = openai.videos.list(limit=limit, order=order)
-    return [video_to_response(v) for v in videos.data]
-
-@app.post("/videos/create", response_model=VideoResponse)
-def create_video(request: CreateVideoRequest):
-    """Create a custom video."""
-    try:
-        video = create_video_with_progress(
-            prompt=request.prompt,
-            model=request.model,
-            seconds=request.seconds,
-            size=request.size
-        )
-
-        # Auto-download
-        output_name = f"custom_{int(time.time())}.mp4"
-        download_video(video.id, f"outputs/{output_name}")
+@app.get("/videos", response_model=VideoListResponse)
+async def list_videos(
+    limit: int = 20,
+    after: Optional[str] = None,
+    status: Optional[str] = None,
+    model: Optional[str] = None,
+    remote: bool = False
+):
+    """
+    List videos, newest first, with cursor pagination.
+
+    Served from the local job store (videos created through this service).
+    Pass the returned next_cursor as `after` for the next page, or
+    remote=true to list the whole upstream library instead.
+    """
+    if remote:
+        page = await sora.list(limit=limit, after=after, order="desc")
+        data = [video_to_response(v) for v in page.data]
+        has_more = page.has_more
+    else:
+        rows, has_more = store.list_videos(limit=limit, after=after, status=status, model=model)
+        data = [job_to_video_response(job) for job in rows]
+
+    return VideoListResponse(
+        data=data,
+        has_more=has_more,
+        next_cursor=data[-1].id if has_more and data else None
+    )
 
-        return video_to_response(video)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.post("/videos/create", response_model=JobResponse, status_code=202)
+async def create_video(request: CreateVideoRequest):
+    """
+    Start a custom video job. Poll GET /jobs/{job_id} for progress.
+
+    An identical request already in flight returns that job instead of
+    starting a new generation; set reuse=true to also accept a completed one.
+    """
+    params = {
+        "prompt": request.prompt,
+        "model": request.model,
+        "seconds": request.seconds,
+        "size": request.size,
+        "priority": request.priority
+    }
+    job, dedupe = coalescer.submit(params, run_create_job, reuse=request.reuse)
+    return job_to_response(job, dedupe)
 
-@app.post("/videos/create-example", response_model=VideoResponse)
-def create_example_video(request: CreateExampleRequest):
-    """Create a video using an example prompt."""
+@app.post("/videos/create-example", response_model=JobResponse, status_code=202)
+async def create_example_video(request: CreateExampleRequest):
+    """Start a video job using an example prompt."""
     if request.example not in EXAMPLES:
         raise HTTPException(status_code=400, detail=f"Example '{request.example}' not found")
 
     example = EXAMPLES[request.example]
 
-    try:
-        video = create_video_with_progress(
-            prompt=example["prompt"],
-            model=request.model,
-            seconds=request.seconds,
-            size=example["size"]
-        )
-
-        # Auto-download
-        download_video(video.id, f"outputs/{example['name']}")
+    params = {
+        "prompt": example["prompt"],
+        "model": request.model,
+        "seconds": request.seconds,
+        "size": example["size"],
+        "priority": request.priority
+    }
+    job, dedupe = coalescer.submit(params, run_create_job, reuse=request.reuse)
+    return job_to_response(job, dedupe)
 
+@app.get("/videos/{video_id}", response_model=VideoResponse)
+async def get_video(video_id: str):
+    """Get video status by ID (from the poller if the video is being tracked)."""
+    video = poller.latest(video_id)
+    if video:
         return video_to_response(video)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/videos/{video_id}", response_model=VideoResponse)
-def get_video(video_id: str):
-    """Get video status by ID."""
     try:
-        video = openai.videos.retrieve(video_id)
+        video = await sora.retrieve(video_id)
         return video_to_response(video)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Video not found: {str(e)}")
 
+@app.get("/videos/{video_id}/events")
+async def video_events(video_id: str, request: Request):
+    """
+    Stream status/progress changes for a video as Server-Sent Events.
+
+    Events: "status" on every status or progress change, "done" once the video
+    is terminal, "error" if tracking fails. All subscribers share the server's
+    poller, so any number of listeners cost one upstream poll.
+    """
+    snapshot = poller.latest(video_id)
+    if snapshot is None and video_id not in poller.tracked:
+        job = store.get_by_video(video_id)
+        if job and job.video_status and job.video_status not in ACTIVE_STATUSES:
+            snapshot = job_to_video_response(job)
+        else:
+            try:
+                snapshot = await sora.retrieve(video_id)
+            except Exception as e:
+                raise HTTPException(status_code=404, detail=f"Video not found: {str(e)}")
+
+    async def stream():
+        last = None
+        if snapshot is not None:
+            last = (snapshot.status, getattr(snapshot, "progress", None))
+            yield sse_message("status", video_event(snapshot))
+            if snapshot.status not in ACTIVE_STATUSES:
+                yield sse_message("done", video_event(snapshot))
+                return
+
+        try:
+            async for video in poller.watch(video_id, heartbeat=SSE_HEARTBEAT_SECONDS):
+                if await request.is_disconnected():
+                    return
+                if video is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                current = (video.status, getattr(video, "progress", None))
+                if current != last:
+                    last = current
+                    yield sse_message("status", video_event(video))
+                if video.status not in ACTIVE_STATUSES:
+                    yield sse_message("done", video_event(video))
+        except Exception as e:
+            yield sse_message("error", {"id": video_id, "error": str(e)})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.delete("/videos/{video_id}")
-def delete_video_endpoint(video_id: str):
+async def delete_video_endpoint(video_id: str):
     """Delete a video by ID."""
     try:
-        openai.videos.delete(video_id)
+        await sora.delete(video_id)
+        cache.remove(video_id)
+        store.delete_video(video_id)
         return {"message": f"Video {video_id} deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/videos/{video_id}/remix", response_model=VideoResponse)
-def remix_video_endpoint(video_id: str, request: RemixVideoRequest):
-    """Remix an existing video."""
-    try:
-        video = remix_video(
-            video_id=video_id,
-            remix_prompt=request.remix_prompt
-        )
+@app.post("/videos/{video_id}/remix", response_model=JobResponse, status_code=202)
+async def remix_video_endpoint(video_id: str, request: RemixVideoRequest):
+    """Start a remix job for an existing video."""
+    job = jobs.submit("remix", {
+        "source_video_id": video_id,
+        "remix_prompt": request.remix_prompt,
+        "priority": request.priority
+    }, run_remix_job, prompt=request.remix_prompt, source_video_id=video_id)
+    return job_to_response(job)
+
+@app.post("/videos/{video_id}/remix-batch", status_code=202)
+async def remix_batch_endpoint(video_id: str, request: RemixBatchRequest):
+    """
+    Start several remixes of one video at once.
+
+    Every variant is its own remix job (source_video_id = video_id, sharing a
+    batch_id) and all go through the admission scheduler concurrently. With
+    stream=true the response is an SSE stream: "submitted" with the jobs, then
+    "variant" as each job finishes (in completion order), then "done". Jobs
+    keep running if the client disconnects.
+    """
+    prompts = [p.strip() for p in request.remix_prompts if p.strip()]
+    if not prompts or len(prompts) > MAX_REMIX_BATCH:
+        raise HTTPException(status_code=400, detail=f"Provide 1-{MAX_REMIX_BATCH} remix prompts")
+
+    batch_id = f"rmxb_{uuid.uuid4().hex}"
+    batch = [
+        jobs.submit("remix", {
+            "source_video_id": video_id,
+            "remix_prompt": prompt,
+            "priority": request.priority,
+            "batch_id": batch_id
+        }, run_remix_job, prompt=prompt, source_video_id=video_id)
+        for prompt in prompts
+    ]
+    submitted = {"batch_id": batch_id, "source_video_id": video_id,
+                 "jobs": [job_to_response(job).model_dump() for job in batch]}
+
+    if not request.stream:
+        return submitted
+
+    async def stream():
+        yield sse_message("submitted", submitted)
+        results = {"completed": 0, "failed": 0}
+        for next_done in asyncio.as_completed([jobs.wait(job.id) for job in batch]):
+            job = await next_done
+            results[job.status] = results.get(job.status, 0) + 1
+            yield sse_message("variant", job_to_response(job).model_dump())
+        yield sse_message("done", {"batch_id": batch_id, **results})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        # Auto-download
-        output_name = f"remix_{int(time.time())}.mp4"
-        download_video(video.id, f"outputs/{output_name}")
-
-        return video_to_response(video)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/videos/{video_id}/remixes", response_model=list[JobResponse])
+def list_remixes(video_id: str):
+    """Remix jobs made from a video (its children in the lineage tree)."""
+    return [job_to_response(job) for job in store.list_remixes(video_id)]
 
 @app.get("/videos/{video_id}/download")
-def download_video_endpoint(video_id: str):
-    """Download a completed video."""
+async def download_video_endpoint(
+    video_id: str,
+    request: Request,
+    variant: Literal["video", "thumbnail", "spritesheet"] = "video"
+):
+    """
+    Download a completed video (or its thumbnail / spritesheet).
+
+    Served from the local copy when present; otherwise upstream bytes are
+    streamed straight through (and cached as they pass). Supports Range
+    requests so players can seek.
+    """
+    started = time.time()
+    range_header = request.headers.get("range")
+    filename = f"{video_id}.{VARIANT_EXTENSIONS[variant]}"
+    media_type = VARIANT_MEDIA_TYPES[variant]
+
+    cached_path = cache.get(video_id, variant)
+    if cached_path:
+        response = file_response(cached_path, range_header, media_type=media_type, filename=filename)
+        if response.status_code < 400:
+            # Runs once the body has been sent
+            response.background = BackgroundTask(
+                record_served, variant, "cache", started, int(response.headers["content-length"]))
+        return response
+
     try:
-        video = openai.videos.retrieve(video_id)
+        video = await sora.retrieve(video_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Video not found: {str(e)}")
 
-        if video.status != STATUS_COMPLETED:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Video not ready for download. Status: {video.status}"
-            )
+    if video.status != STATUS_COMPLETED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Video not ready for download. Status: {video.status}"
+        )
 
-        output_path = f"outputs/{video_id}.mp4"
-        download_video(video_id, output_path)
+    # A seek shouldn't pull the whole file, so fill the cache in the background instead
+    if range_header and variant == "video":
+        ensure_cached(video_id)
+
+    def on_streamed(size: int, complete: bool):
+        # Cache misses are upstream downloads too
+        record_served(variant, "upstream", started, size)
+        download_bytes.inc(size, variant=variant)
+        if complete:
+            download_time.observe(time.time() - started, variant=variant)
+
+    return await proxy_response(
+        sora.http,
+        sora.content_url(video_id, variant),
+        {},
+        range_header=range_header,
+        cache_path=cache.path_for(video_id, variant),
+        on_cached=lambda path, checksum: cache.put(video_id, variant, path, checksum),
+        media_type=media_type,
+        filename=filename,
+        on_complete=on_streamed
+    )
 
-        return FileResponse(
-            output_path,
-            media_type="video/mp4",
-            filename=f"{video_id}.mp4"
-        )
-    except HTTPException:
-        raise
+async def handle_video_event(video_id: str):
+    """Push a webhook-reported video to its waiters so the job downloads right away."""
+    try:
+        video = await sora.retrieve(video_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        # The safety-net poll will pick it up
+        print(f"Webhook follow-up failed for {video_id}: {e}")
+        return
+
+    if not poller.notify(video) and video.status == STATUS_COMPLETED and store.get_by_video(video_id):
+        # Not tracked right now (e.g. finished while we were down): just fill the cache
+        ensure_cached(video_id)
+
+@app.post("/webhooks/sora")
+async def sora_webhook(request: Request):
+    """
+    Receive signed video.completed / video.failed events.
+
+    Verifies the Standard Webhooks signature, acknowledges right away and hands
+    the video to the shared poller, which resolves the waiting job.
+    """
+    if not WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail=f"Webhooks disabled: set {WEBHOOK_SECRET_ENV}")
+
+    body = await request.body()
+    try:
+        event = verify(WEBHOOK_SECRET, request.headers, body)
+    except WebhookVerificationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not seen_webhooks.add(request.headers.get("webhook-id")):
+        return {"received": True, "duplicate": True}
+
+    video_id = (event.get("data") or {}).get("id")
+    if event.get("type") in VIDEO_EVENTS and video_id:
+        task = asyncio.create_task(handle_video_event(video_id))
+        webhook_tasks.add(task)
+        task.add_done_callback(webhook_tasks.discard)
+
+    return {"received": True}
+
+@app.get("/jobs", response_model=list[JobResponse])
+async def list_jobs(limit: int = 100):
+    """List background jobs, newest first."""
+    return [job_to_response(job) for job in jobs.list(limit)]
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get the state of a background create/remix job."""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job_to_response(job)
+
+@app.get("/cache")
+def cache_stats():
+    """Local video cache usage and hit/miss counters."""
+    return cache.stats()
+
+@app.get("/dedupe")
+def dedupe_stats():
+    """Request coalescing and result reuse counters."""
+    return {**coalescer.stats, "in_flight": coalescer.in_flight}
+
+@app.get("/scheduler")
+def scheduler_stats():
+    """Admission queue depth, in-flight count and wait times per priority class."""
+    return scheduler.snapshot()
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics: queue/generation/download timings, upstream calls, gauges."""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
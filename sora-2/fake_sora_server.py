@@ -0,0 +1,247 @@
+"""
+Local stand-in for the Sora Videos API, for offline load tests.
+
+Videos move queued -> in_progress -> completed (or failed) on a configurable
+schedule and their content is synthetic bytes of a configurable size.
+
+Usage:
+    python fake_sora_server.py --port 8001 --queue-seconds 2 --seconds-per-second 1.5 --failure-rate 0.05
+
+Point the CLI or API at it with:
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=test uvicorn 03_sora_fastapi:app
+"""
+import os
+import time
+import asyncio
+import uuid
+import random
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sora_streaming import CHUNK_SIZE, RangeNotSatisfiable, parse_range
+from sora_cache import VARIANT_MEDIA_TYPES
+
+# Progress curves: fraction of generation time elapsed -> fraction done
+PROGRESS_CURVES = {
+    "linear": lambda x: x,
+    "ease-in": lambda x: x * x,
+    "ease-out": lambda x: 1 - (1 - x) ** 2
+}
+
+# Generation time multiplier per model
+MODEL_FACTORS = {"sora-2": 1.0, "sora-2-pro": 3.0}
+
+
+@dataclass
+class FakeConfig:
+    queue_seconds: float = float(os.environ.get("FAKE_SORA_QUEUE_SECONDS", "2"))
+    seconds_per_second: float = float(os.environ.get("FAKE_SORA_SECONDS_PER_SECOND", "1"))
+    progress_curve: str = os.environ.get("FAKE_SORA_PROGRESS_CURVE", "linear")
+    failure_rate: float = float(os.environ.get("FAKE_SORA_FAILURE_RATE", "0"))
+    payload_bytes: int = int(os.environ.get("FAKE_SORA_PAYLOAD_BYTES", str(2 * 1024 * 1024)))
+    latency_ms: float = float(os.environ.get("FAKE_SORA_LATENCY_MS", "0"))
+
+
+@dataclass
+class FakeVideo:
+    id: str
+    model: str
+    prompt: str
+    seconds: str
+    size: str
+    created: float = field(default_factory=time.time)
+    duration: float = 0.0  # generation time after leaving the queue
+    fails: bool = False
+    remixed_from_video_id: Optional[str] = None
+
+
+config = FakeConfig()
+videos: Dict[str, FakeVideo] = {}
+stats = {"requests": 0, "created": 0, "downloads": 0, "bytes_served": 0}
+
+app = FastAPI(title="Fake Sora API", description="Offline stand-in for load testing")
+
+
+def new_video(model: str, prompt: str, seconds: str, size: str, source: Optional[str] = None) -> FakeVideo:
+    video = FakeVideo(
+        id=f"video_{uuid.uuid4().hex}",
+        model=model,
+        prompt=prompt,
+        seconds=str(seconds),
+        size=size,
+        duration=int(seconds) * config.seconds_per_second * MODEL_FACTORS.get(model, 1.0),
+        fails=random.random() < config.failure_rate,
+        remixed_from_video_id=source
+    )
+    videos[video.id] = video
+    stats["created"] += 1
+    return video
+
+
+def to_dict(video: FakeVideo) -> Dict[str, Any]:
+    """The video object as the real API would report it right now."""
+    elapsed = time.time() - video.created - config.queue_seconds
+    error = None
+    completed_at = None
+
+    if elapsed < 0:
+        status, progress = "queued", 0
+    elif elapsed < video.duration:
+        fraction = PROGRESS_CURVES[config.progress_curve](elapsed / video.duration)
+        status, progress = "in_progress", int(fraction * 100)
+        if video.fails and fraction >= 0.5:
+            status, error = "failed", {"code": "fake_failure", "message": "Injected failure"}
+    else:
+        status, progress = ("failed", 50) if video.fails else ("completed", 100)
+        if video.fails:
+            error = {"code": "fake_failure", "message": "Injected failure"}
+        completed_at = int(video.created + config.queue_seconds + video.duration)
+
+    return {
+        "id": video.id,
+        "object": "video",
+        "model": video.model,
+        "status": status,
+        "progress": progress,
+        "seconds": video.seconds,
+        "size": video.size,
+        "created_at": int(video.created),
+        "completed_at": completed_at,
+        "remixed_from_video_id": video.remixed_from_video_id,
+        "error": error
+    }
+
+
+def get_or_404(video_id: str) -> FakeVideo:
+    video = videos.get(video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail=f"Video {video_id} not found")
+    return video
+
+
+@app.exception_handler(HTTPException)
+async def api_error(request: Request, exc: HTTPException):
+    """Errors in the API's {"error": {...}} shape."""
+    return JSONResponse(status_code=exc.status_code, content={"error": {"message": exc.detail}})
+
+
+@app.middleware("http")
+async def simulated_latency(request: Request, call_next):
+    stats["requests"] += 1
+    if config.latency_ms:
+        await asyncio.sleep(config.latency_ms / 1000)
+    return await call_next(request)
+
+
+@app.post("/v1/videos")
+async def create_video(request: Request):
+    if request.headers.get("content-type", "").startswith("multipart/"):
+        body = dict(await request.form())
+    else:
+        body = await request.json()
+    video = new_video(body.get("model", "sora-2"), body.get("prompt", ""), body.get("seconds", "4"), body.get("size", "1280x720"))
+    return to_dict(video)
+
+
+@app.get("/v1/videos")
+def list_videos(limit: int = 20, after: Optional[str] = None, order: str = "desc"):
+    ordered = sorted(videos.values(), key=lambda v: v.created, reverse=(order == "desc"))
+    ids = [v.id for v in ordered]
+    start = ids.index(after) + 1 if after in ids else 0
+    page = ordered[start:start + limit]
+    return {
+        "object": "list",
+        "data": [to_dict(v) for v in page],
+        "has_more": start + limit < len(ordered),
+        "first_id": page[0].id if page else None,
+        "last_id": page[-1].id if page else None
+    }
+
+
+@app.get("/v1/videos/{video_id}")
+def retrieve_video(video_id: str):
+    return to_dict(get_or_404(video_id))
+
+
+@app.delete("/v1/videos/{video_id}")
+def delete_video(video_id: str):
+    get_or_404(video_id)
+    del videos[video_id]
+    return {"id": video_id, "object": "video.deleted", "deleted": True}
+
+
+@app.post("/v1/videos/{video_id}/remix")
+async def remix_video(video_id: str, request: Request):
+    source = get_or_404(video_id)
+    body = await request.json()
+    video = new_video(source.model, body.get("prompt", ""), source.seconds, source.size, source=video_id)
+    return to_dict(video)
+
+
+@app.get("/v1/videos/{video_id}/content")
+def download_content(video_id: str, request: Request, variant: str = "video"):
+    video = get_or_404(video_id)
+    if to_dict(video)["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Video is not completed")
+
+    size = config.payload_bytes if variant == "video" else max(1, config.payload_bytes // 50)
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    start, end = byte_range or (0, size - 1)
+    # Deterministic content per video, so ranged and full downloads agree
+    block = (video_id.encode() * (CHUNK_SIZE // len(video_id) + 1))[:CHUNK_SIZE]
+
+    def body():
+        position = start
+        while position <= end:
+            offset = position % CHUNK_SIZE
+            chunk = block[offset:offset + min(CHUNK_SIZE - offset, end + 1 - position)]
+            position += len(chunk)
+            stats["bytes_served"] += len(chunk)
+            yield chunk
+
+    stats["downloads"] += 1
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start + 1)}
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        body(),
+        status_code=206 if byte_range else 200,
+        media_type=VARIANT_MEDIA_TYPES.get(variant, "application/octet-stream"),
+        headers=headers
+    )
+
+
+@app.get("/stats")
+def server_stats():
+    """Request and video counters for the load-test report."""
+    return {**stats, "videos": len(videos)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Sora Videos API for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--queue-seconds", type=float, default=config.queue_seconds, help="Time each video spends queued")
+    parser.add_argument("--seconds-per-second", type=float, default=config.seconds_per_second,
+                        help="Generation time per second of video (x3 for sora-2-pro)")
+    parser.add_argument("--progress-curve", choices=list(PROGRESS_CURVES), default=config.progress_curve)
+    parser.add_argument("--failure-rate", type=float, default=config.failure_rate, help="Fraction of videos that fail")
+    parser.add_argument("--payload-bytes", type=int, default=config.payload_bytes, help="Size of each video's content")
+    parser.add_argument("--latency-ms", type=float, default=config.latency_ms, help="Added latency per request")
+    args = parser.parse_args()
+
+    for name in ("queue_seconds", "seconds_per_second", "progress_curve", "failure_rate", "payload_bytes", "latency_ms"):
+        setattr(config, name, getattr(args, name))
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
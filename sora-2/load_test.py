@@ -0,0 +1,227 @@
+"""
+Load test for the Sora FastAPI app (03_sora_fastapi.py), meant to run against fake_sora_server.py.
+
+Each virtual user creates a video, polls its job until done, downloads the
+result and optionally remixes it. Reports p50/p95/p99 latency per operation,
+throughput and how saturated the server was while under load.
+
+Usage:
+    python fake_sora_server.py --port 8001 &
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=test SORA_MODEL_RATES="sora-2=6000" uvicorn 03_sora_fastapi:app --port 8000 &
+    python load_test.py --jobs 200 --concurrency 50 --remix-ratio 0.2
+"""
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import httpx
+
+TERMINAL_JOB_STATES = ("completed", "failed")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+class LoadTest:
+    """Drives the API with concurrent virtual users and records timings."""
+
+    def __init__(self, base_url: str, concurrency: int, poll_interval: float, remix_ratio: float,
+                 model: str, seconds: str, duplicate_ratio: float):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.remix_ratio = remix_ratio
+        self.model = model
+        self.seconds = seconds
+        self.duplicate_ratio = duplicate_ratio
+
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.job_results: Dict[str, int] = defaultdict(int)
+        self.bytes_downloaded = 0
+        self.saturation: List[Dict[str, Any]] = []
+        self.http: Optional[httpx.AsyncClient] = None
+
+    async def _call(self, name: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, f"{self.base_url}{path}", **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[f"{name}: {type(e).__name__}"] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.is_error:
+            self.errors[f"{name}: HTTP {response.status_code}"] += 1
+            return None
+        return response
+
+    async def _wait_for_job(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        while job["status"] not in TERMINAL_JOB_STATES:
+            await asyncio.sleep(self.poll_interval)
+            response = await self._call("get_job", "GET", job["status_url"])
+            if response is None:
+                return None
+            job = response.json()
+        return job
+
+    async def _run_job(self, path: str, payload: Dict[str, Any], kind: str) -> Optional[Dict[str, Any]]:
+        start = time.perf_counter()
+        response = await self._call(kind, "POST", path, json=payload)
+        if response is None:
+            return None
+        job = await self._wait_for_job(response.json())
+        if job is None:
+            return None
+
+        self.job_results[f"{kind}_{job['status']}"] += 1
+        if job["status"] != "completed":
+            return None
+        self.latencies[f"{kind}_end_to_end"].append(time.perf_counter() - start)
+
+        response = await self._call("download", "GET", f"/videos/{job['video_id']}/download")
+        if response is not None:
+            self.bytes_downloaded += len(response.content)
+            await self._call("get_video", "GET", f"/videos/{job['video_id']}")
+        return job
+
+    async def _user(self, index: int):
+        prompt = "load test prompt" if random.random() < self.duplicate_ratio else f"load test {index} {uuid.uuid4().hex}"
+        job = await self._run_job("/videos/create", {
+            "prompt": prompt,
+            "model": self.model,
+            "seconds": self.seconds,
+            "size": "1280x720"
+        }, "create")
+
+        if job and random.random() < self.remix_ratio:
+            await self._run_job(f"/videos/{job['video_id']}/remix", {"remix_prompt": f"remix {index}"}, "remix")
+
+    async def _sample_saturation(self, stop: asyncio.Event):
+        """Sample the scheduler and a cheap endpoint; slow answers to / mean a busy event loop."""
+        while not stop.is_set():
+            start = time.perf_counter()
+            probe = await self._call("probe_root", "GET", "/")
+            scheduler = await self._call("probe_scheduler", "GET", "/scheduler")
+            if probe is not None and scheduler is not None:
+                snapshot = scheduler.json()
+                self.saturation.append({
+                    "loop_lag": time.perf_counter() - start,
+                    "in_flight": snapshot["in_flight"],
+                    "max_in_flight": snapshot["max_in_flight"],
+                    "queued": sum(c["queue_depth"] for c in snapshot["classes"].values())
+                })
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, jobs: int) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.concurrency + 10, max_keepalive_connections=self.concurrency + 10)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=300.0), limits=limits) as http:
+            self.http = http
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def bounded(index: int):
+                async with semaphore:
+                    await self._user(index)
+
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(self._sample_saturation(stop))
+            start = time.perf_counter()
+            await asyncio.gather(*(bounded(i) for i in range(jobs)))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await sampler
+
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        operations = {}
+        for name, values in sorted(self.latencies.items()):
+            operations[name] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1)
+            }
+
+        completed = sum(v for k, v in self.job_results.items() if k.endswith("_completed"))
+        requests = sum(len(v) for k, v in self.latencies.items() if not k.endswith("_end_to_end"))
+        samples = self.saturation
+        return {
+            "elapsed_seconds": round(elapsed, 1),
+            "requests": requests,
+            "requests_per_second": round(requests / elapsed, 1) if elapsed else 0,
+            "jobs_completed_per_minute": round(completed / elapsed * 60, 1) if elapsed else 0,
+            "megabytes_downloaded": round(self.bytes_downloaded / 1024 ** 2, 1),
+            "jobs": dict(self.job_results),
+            "errors": dict(self.errors),
+            "operations": operations,
+            "saturation": {
+                "samples": len(samples),
+                "peak_in_flight": max((s["in_flight"] for s in samples), default=0),
+                "max_in_flight": samples[0]["max_in_flight"] if samples else None,
+                "avg_slot_utilisation": round(sum(s["in_flight"] / s["max_in_flight"] for s in samples) / len(samples), 2) if samples else None,
+                "peak_queued": max((s["queued"] for s in samples), default=0),
+                "loop_lag_p95_ms": round(percentile([s["loop_lag"] for s in samples], 95) * 1000, 1) if samples else None
+            }
+        }
+
+
+def print_report(report: Dict[str, Any]):
+    print("\n=== Load Test Report ===\n")
+    print(f"Elapsed: {report['elapsed_seconds']}s, {report['requests']} requests ({report['requests_per_second']}/s)")
+    print(f"Jobs: {report['jobs']} ({report['jobs_completed_per_minute']} completed/min)")
+    print(f"Downloaded: {report['megabytes_downloaded']} MB")
+    print(f"\n{'operation':<22}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, op in report["operations"].items():
+        print(f"{name:<22}{op['count']:>8}{op['p50_ms']:>10}{op['p95_ms']:>10}{op['p99_ms']:>10}{op['max_ms']:>10}")
+    sat = report["saturation"]
+    print(f"\nSaturation: peak {sat['peak_in_flight']}/{sat['max_in_flight']} in flight, "
+          f"avg utilisation {sat['avg_slot_utilisation']}, peak queued {sat['peak_queued']}, "
+          f"loop lag p95 {sat['loop_lag_p95_ms']} ms")
+    if report["errors"]:
+        print(f"Errors: {report['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Sora FastAPI app")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API under test")
+    parser.add_argument("--jobs", type=int, default=100, help="Videos to create (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users (default: 20)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between job polls (default: 1)")
+    parser.add_argument("--remix-ratio", type=float, default=0.0, help="Fraction of completed videos to remix")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="Fraction of creates sharing one prompt (exercises coalescing)")
+    parser.add_argument("--model", default="sora-2", choices=["sora-2", "sora-2-pro"])
+    parser.add_argument("--seconds", default="4", choices=["4", "8", "12"])
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    test = LoadTest(args.base_url, args.concurrency, args.poll_interval, args.remix_ratio,
+                    args.model, args.seconds, args.duplicate_ratio)
+    report = asyncio.run(test.run(args.jobs))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    # Non-zero exit for CI if anything errored
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
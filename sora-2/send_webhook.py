@@ -0,0 +1,62 @@
+"""
+Send a signed stand-in Sora webhook to the local API (for offline testing).
+
+Usage:
+    python send_webhook.py <video_id>
+    python send_webhook.py <video_id> --type video.failed --url http://localhost:8000/webhooks/sora
+"""
+import os
+import json
+import time
+import uuid
+import argparse
+import httpx
+from dotenv import load_dotenv
+from sora_webhooks import WEBHOOK_SECRET_ENV, VIDEO_EVENTS, sign
+
+load_dotenv()
+
+
+def build_event(video_id: str, event_type: str) -> dict:
+    """Event payload in the shape the API sends."""
+    return {
+        "id": f"evt_{uuid.uuid4().hex}",
+        "object": "event",
+        "created_at": int(time.time()),
+        "type": event_type,
+        "data": {"id": video_id}
+    }
+
+
+def send(url: str, secret: str, event: dict) -> httpx.Response:
+    """POST an event with Standard Webhooks headers."""
+    body = json.dumps(event).encode()
+    webhook_id = f"msg_{uuid.uuid4().hex}"
+    timestamp = int(time.time())
+    headers = {
+        "Content-Type": "application/json",
+        "webhook-id": webhook_id,
+        "webhook-timestamp": str(timestamp),
+        "webhook-signature": sign(secret, webhook_id, timestamp, body)
+    }
+    return httpx.post(url, content=body, headers=headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a signed stand-in Sora webhook")
+    parser.add_argument("video_id", help="Video ID the event refers to")
+    parser.add_argument("--type", choices=VIDEO_EVENTS, default=VIDEO_EVENTS[0], help="Event type")
+    parser.add_argument("--url", default="http://localhost:8000/webhooks/sora", help="Receiver URL")
+    parser.add_argument("--secret", default=os.environ.get(WEBHOOK_SECRET_ENV), help=f"Signing secret (default: ${WEBHOOK_SECRET_ENV})")
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error(f"--secret or {WEBHOOK_SECRET_ENV} is required")
+
+    event = build_event(args.video_id, args.type)
+    response = send(args.url, args.secret, event)
+    print(f"{args.type} for {args.video_id} -> HTTP {response.status_code}: {response.text}")
+
+
+if __name__ == "__main__":
+    main()
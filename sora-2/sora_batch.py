@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional, Sequence
+from sora_client import ACTIVE_STATUSES, STATUS_COMPLETED, SoraAPIError, failure_message
+from sora_download import download_variants, variant_paths
+from sora_reference import ReferenceCache
+
+# Batch task states
+TASK_PENDING = "pending"
+TASK_SUBMITTED = "submitted"
+TASK_DOWNLOADING = "downloading"
+TASK_COMPLETED = "completed"
+TASK_FAILED = "failed"
+
+
+def load_prompts(source: str) -> List[Dict[str, Any]]:
+    """
+    Load prompts from a directory of .txt files or a JSON/JSONL manifest.
+
+    Manifest entries are objects with "prompt" and optional "name", "model",
+    "seconds", "size" and "input_reference" (an image path; fixed values
+    override the batch-wide options).
+
+    Args:
+        source: Directory path (e.g. "prompts") or .json/.jsonl file
+
+    Returns:
+        List of prompt dicts with at least "name" and "prompt"
+    """
+    if os.path.isdir(source):
+        prompts = []
+        for filename in sorted(os.listdir(source)):
+            if not filename.endswith(".txt"):
+                continue
+            with open(os.path.join(source, filename)) as f:
+                text = f.read().strip()
+            if text:
+                prompts.append({"name": os.path.splitext(filename)[0], "prompt": text})
+        return prompts
+
+    with open(source) as f:
+        if source.endswith(".jsonl"):
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = json.load(f)
+
+    prompts = []
+    for i, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {"prompt": entry}
+        entry.setdefault("name", f"prompt_{i:03d}")
+        prompts.append(entry)
+    return prompts
+
+
+def expand_tasks(
+    prompts: List[Dict[str, Any]],
+    models: Sequence[str],
+    seconds: Sequence[str],
+    sizes: Sequence[str],
+    input_reference: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the prompts x models x seconds x sizes task list (deduplicated by key).
+
+    input_reference is a batch-wide reference image path, used for entries
+    that don't name their own.
+    """
+    tasks = {}
+    for entry in prompts:
+        combos = itertools.product(
+            [entry["model"]] if entry.get("model") else models,
+            [str(entry["seconds"])] if entry.get("seconds") else seconds,
+            [entry["size"]] if entry.get("size") else sizes
+        )
+        for model, secs, size in combos:
+            key = f"{entry['name']}|{model}|{secs}|{size}"
+            tasks[key] = {
+                "key": key,
+                "name": entry["name"],
+                "prompt": entry["prompt"],
+                "model": model,
+                "seconds": secs,
+                "size": size,
+                "input_reference": entry.get("input_reference") or input_reference
+            }
+    return list(tasks.values())
+
+
+class BatchManifest:
+    """
+    Resumable JSON record of a batch run.
+
+    Every state change is written to disk (via a temp file + rename), so a
+    crashed run can be restarted with the same manifest: finished tasks are
+    skipped and submitted tasks resume polling their existing video id.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.tasks = json.load(f).get("tasks", {})
+
+    def add(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a task if not already known; returns the stored record."""
+        if task["key"] not in self.tasks:
+            self.tasks[task["key"]] = {**task, "status": TASK_PENDING, "video_id": None,
+                                       "output_path": None, "error": None,
+                                       "submitted_at": None, "finished_at": None, "bytes": 0}
+        return self.tasks[task["key"]]
+
+    def update(self, key: str, **changes):
+        self.tasks[key].update(changes)
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"updated_at": time.time(), "tasks": self.tasks}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BatchRunner:
+    """Runs a manifest's tasks with bounded concurrency on a shared poller."""
+
+    def __init__(
+        self,
+        client,
+        poller,
+        manifest: BatchManifest,
+        output_dir: str,
+        concurrency: int = 4,
+        retry_failed: bool = False,
+        references: Optional[ReferenceCache] = None
+    ):
+        """
+        Args:
+            client: AsyncSoraClient
+            poller: Shared VideoPoller used to wait on every submitted video
+            manifest: BatchManifest holding task state
+            output_dir: Directory for downloaded videos
+            concurrency: Maximum videos generating at once (default: 4)
+            retry_failed: Re-run tasks recorded as failed (default: False)
+            references: Cache of normalized reference images, shared by all tasks
+                (created on first use if None)
+        """
+        self.client = client
+        self.poller = poller
+        self.manifest = manifest
+        self.output_dir = output_dir
+        self.concurrency = concurrency
+        self.retry_failed = retry_failed
+        self.references = references
+
+    def _output_path(self, task: Dict[str, Any]) -> str:
+        return os.path.join(
+            self.output_dir,
+            f"{task['name']}_{task['model']}_{task['seconds']}s_{task['size']}.mp4"
+        )
+
+    async def _download(self, video_id: str, output_path: str) -> int:
+        """Fetch the video, thumbnail and spritesheet in parallel; returns bytes written."""
+        paths = variant_paths(output_path)
+
+        async def fetch(video_id: str, variant: str):
+            return await self.client.download_to_file(video_id, paths[variant], variant=variant)
+
+        report = await download_variants(fetch, video_id)
+        return sum(entry.get("bytes", 0) for entry in report.values())
+
+    async def _reference(self, task: Dict[str, Any]):
+        """The task's reference image, resized to its size once per distinct image."""
+        if not task.get("input_reference"):
+            return None
+        if self.references is None:
+            self.references = ReferenceCache()
+        reference = await self.references.get(task["input_reference"], task["size"])
+        return reference.upload()
+
+    async def _resume_state(self, task: Dict[str, Any]) -> str:
+        """
+        Where to restart a failed task.
+
+        A task can fail while polling or downloading after its video finished
+        upstream, so an existing video is checked first and only regenerated
+        if it is gone, failed or canceled.
+        """
+        if not task["video_id"]:
+            return TASK_PENDING
+        try:
+            video = await self.client.retrieve(task["video_id"])
+        except SoraAPIError as e:
+            if e.status_code == 404:
+                return TASK_PENDING
+            raise
+        if video.status == STATUS_COMPLETED:
+            return TASK_DOWNLOADING
+        if video.status in ACTIVE_STATUSES:
+            return TASK_SUBMITTED
+        return TASK_PENDING
+
+    async def _run_task(self, task: Dict[str, Any], semaphore: asyncio.Semaphore):
+        key = task["key"]
+        async with semaphore:
+            try:
+                if task["status"] == TASK_FAILED:
+                    state = await self._resume_state(task)
+                    self.manifest.update(key, status=state, error=None)
+                    if state != TASK_PENDING:
+                        print(f"[resumed] {key}: reusing {task['video_id']} ({state})")
+
+                if task["status"] == TASK_PENDING:
+                    video = await self.client.create(
+                        task["prompt"],
+                        model=task["model"],
+                        seconds=task["seconds"],
+                        size=task["size"],
+                        input_reference=await self._reference(task)
+                    )
+                    self.manifest.update(key, status=TASK_SUBMITTED, video_id=video.id,
+                                         submitted_at=time.time(), error=None)
+                    print(f"[submitted] {key} -> {video.id}")
+
+                if task["status"] == TASK_SUBMITTED:
+                    video = await self.poller.wait(task["video_id"])
+                    if video.status != STATUS_COMPLETED:
+                        raise RuntimeError(f"Video {video.id} {video.status}: {failure_message(video, video.status)}")
+                    self.manifest.update(key, status=TASK_DOWNLOADING)
+
+                output_path = self._output_path(task)
+                size = await self._download(task["video_id"], output_path)
+                self.manifest.update(key, status=TASK_COMPLETED, output_path=output_path,
+                                     bytes=size, finished_at=time.time())
+                print(f"[completed] {key} -> {output_path}")
+            except Exception as e:
+                self.manifest.update(key, status=TASK_FAILED, error=str(e), finished_at=time.time())
+                print(f"[failed] {key}: {e}")
+
+    def _needs_work(self, task: Dict[str, Any]) -> bool:
+        if task["status"] == TASK_COMPLETED:
+            return not (task["output_path"] and os.path.exists(task["output_path"]))
+        if task["status"] == TASK_FAILED:
+            return self.retry_failed
+        return True
+
+    async def run(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run all tasks that still need work and return a throughput report.
+
+        Args:
+            tasks: Task dicts from expand_tasks()
+        """
+        records = [self.manifest.add(task) for task in tasks]
+        self.manifest.save()
+
+        todo = [r for r in records if self._needs_work(r)]
+        for record in todo:
+            if record["status"] == TASK_COMPLETED:
+                # File went missing: fetch it again without regenerating
+                record["status"] = TASK_DOWNLOADING
+
+        print(f"Batch: {len(records)} tasks, {len(records) - len(todo)} already done, "
+              f"{len(todo)} to run (concurrency {self.concurrency})\n")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.time()
+        await asyncio.gather(*(self._run_task(record, semaphore) for record in todo))
+        elapsed = time.time() - start
+
+        return self._report([r["key"] for r in todo], elapsed)
+
+    def _report(self, keys: List[str], elapsed: float) -> Dict[str, Any]:
+        ran = [self.manifest.tasks[k] for k in keys]
+        completed = [t for t in ran if t["status"] == TASK_COMPLETED]
+        minutes = elapsed / 60 if elapsed else 0
+        video_seconds = sum(int(t["seconds"]) for t in completed)
+        total_bytes = sum(t.get("bytes") or 0 for t in completed)
+
+        return {
+            "tasks_run": len(ran),
+            "completed": len(completed),
+            "failed": sum(1 for t in ran if t["status"] == TASK_FAILED),
+            "elapsed_seconds": round(elapsed, 1),
+            "videos_per_minute": round(len(completed) / minutes, 2) if minutes else 0,
+            "video_seconds_per_minute": round(video_seconds / minutes, 2) if minutes else 0,
+            "megabytes_downloaded": round(total_bytes / 1024 ** 2, 1),
+            "poller": dict(self.poller.stats),
+            "references": dict(self.references.stats) if self.references else None
+        }
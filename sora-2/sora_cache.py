@@ -0,0 +1,238 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.environ.get("SORA_CACHE_DIR", "outputs/cache")
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("SORA_CACHE_MAX_BYTES", 5 * 1024 ** 3))
+
+# File extension per downloadable content variant
+VARIANT_EXTENSIONS = {
+    "video": "mp4",
+    "thumbnail": "webp",
+    "spritesheet": "jpg"
+}
+
+VARIANT_MEDIA_TYPES = {
+    "video": "video/mp4",
+    "thumbnail": "image/webp",
+    "spritesheet": "image/jpeg"
+}
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VideoCache:
+    """
+    Size-bounded on-disk cache of downloaded video content.
+
+    Files live in one directory, keyed by (video_id, variant). A SQLite index
+    records size, checksum and last access for each entry; when the total size
+    exceeds max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            directory: Cache directory (default: $SORA_CACHE_DIR or outputs/cache)
+            max_bytes: Disk budget in bytes (default: $SORA_CACHE_MAX_BYTES or 5 GiB)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                video_id TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                checksum TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (video_id, variant)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, video_id: str, variant: str = "video") -> str:
+        """Canonical cache path for a video variant."""
+        extension = VARIANT_EXTENSIONS.get(variant, "bin")
+        return os.path.join(self.directory, f"{video_id}_{variant}.{extension}")
+
+    def get(self, video_id: str, variant: str = "video", count: bool = True) -> Optional[str]:
+        """
+        Look up a cached file and mark it as recently used.
+
+        Args:
+            video_id: Video to look up
+            variant: Content variant
+            count: Record the lookup in hits/misses; internal checks (e.g. before
+                a background download) pass False so the hit ratio reflects clients
+
+        Returns:
+            Path to the cached file, or None on a miss
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT path, size FROM entries WHERE video_id = ? AND variant = ?",
+                (video_id, variant)
+            ).fetchone()
+
+            # A file whose size no longer matches the index is treated as corrupt
+            if row and os.path.exists(row[0]) and os.path.getsize(row[0]) == row[1]:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ? WHERE video_id = ? AND variant = ?",
+                    (time.time(), video_id, variant)
+                )
+                self._db.commit()
+                if count:
+                    self.hits += 1
+                return row[0]
+
+            if row:
+                # File removed or truncated behind our back; drop the stale entry
+                if os.path.exists(row[0]):
+                    os.remove(row[0])
+                self._db.execute("DELETE FROM entries WHERE video_id = ? AND variant = ?", (video_id, variant))
+                self._db.commit()
+            if count:
+                self.misses += 1
+            return None
+
+    def entry(self, video_id: str, variant: str = "video") -> Optional[Dict[str, Any]]:
+        """Index record for a cached file (without touching last access)."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT video_id, variant, path, size, checksum, created_at, last_access "
+                "FROM entries WHERE video_id = ? AND variant = ?",
+                (video_id, variant)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return dict(zip([c[0] for c in cursor.description], row))
+
+    def put(self, video_id: str, variant: str, source_path: str, checksum: Optional[str] = None) -> str:
+        """
+        Add a downloaded file to the cache, then evict down to the budget.
+
+        Args:
+            video_id: Video the file belongs to
+            variant: Content variant ("video", "thumbnail", "spritesheet")
+            source_path: Completed download; moved into the cache if not already there
+            checksum: SHA-256 of the file if already known (computed otherwise)
+
+        Returns:
+            Path of the cached file
+        """
+        path = self.path_for(video_id, variant)
+        if os.path.abspath(source_path) != os.path.abspath(path):
+            os.replace(source_path, path)
+
+        size = os.path.getsize(path)
+        checksum = checksum or file_sha256(path)
+        now = time.time()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (video_id, variant, path, size, checksum, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, variant, path, size, checksum, now, now)
+            )
+            self._db.commit()
+
+        self.evict(keep=(video_id, variant))
+        return path
+
+    def remove(self, video_id: str, variant: Optional[str] = None) -> int:
+        """Remove one variant (or all variants) of a video; returns entries removed."""
+        with self._lock:
+            if variant:
+                rows = self._db.execute(
+                    "SELECT video_id, variant, path FROM entries WHERE video_id = ? AND variant = ?",
+                    (video_id, variant)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT video_id, variant, path FROM entries WHERE video_id = ?", (video_id,)
+                ).fetchall()
+            self._delete(rows)
+            return len(rows)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, keep: Optional[tuple] = None) -> List[str]:
+        """
+        Evict least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep: Optional (video_id, variant) that must not be evicted (e.g. the file just added)
+
+        Returns:
+            Paths of evicted files
+        """
+        evicted = []
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return evicted
+
+            rows = self._db.execute(
+                "SELECT video_id, variant, path, size FROM entries ORDER BY last_access ASC"
+            ).fetchall()
+            victims = []
+            for video_id, variant, path, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if keep and (video_id, variant) == tuple(keep):
+                    continue
+                victims.append((video_id, variant, path))
+                evicted.append(path)
+                total -= size
+            self._delete(victims)
+
+        return evicted
+
+    def _delete(self, rows):
+        """Delete files and index rows; caller holds the lock."""
+        for video_id, variant, path in rows:
+            if os.path.exists(path):
+                os.remove(path)
+            self._db.execute("DELETE FROM entries WHERE video_id = ? AND variant = ?", (video_id, variant))
+        self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, size, budget and hit/miss counters."""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,455 @@
+import os
+import uuid
+import asyncio
+import mimetypes
+from dataclasses import dataclass, field, fields
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+import httpx
+from dotenv import load_dotenv
+from sora_cache import file_sha256
+
+load_dotenv()
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# Job status constants
+STATUS_QUEUED = "queued"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELED = "canceled"
+
+# Upstream video states that are still changing
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_IN_PROGRESS)
+
+# Example prompts (shared by the CLI and the API)
+EXAMPLES = {
+    "long_form": {
+        "prompt": "A neon-lit drone shot over a rainy sci-fi street; shallow DOF; slow dolly; ambient city hiss.",
+        "size": "1280x720",
+        "name": "long_form_example.mp4"
+    },
+    "short_form": {
+        "prompt": "Vertical street food closeups; handheld micro-jitters; sodium vapor lights.",
+        "size": "720x1280",
+        "name": "short_form_example.mp4"
+    }
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# Resumable downloads: files of at least PARALLEL_DOWNLOAD_THRESHOLD bytes are
+# fetched as DOWNLOAD_SEGMENTS parallel ranges; each range resumes up to
+# DOWNLOAD_RETRIES times
+PARALLEL_DOWNLOAD_THRESHOLD = 16 * 1024 * 1024
+DOWNLOAD_SEGMENTS = 4
+DOWNLOAD_RETRIES = 5
+
+
+class SoraAPIError(Exception):
+    """Error response from the Videos API."""
+
+    def __init__(self, status_code: int, message: str, response: Optional[httpx.Response] = None):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.response = response
+
+
+class DownloadError(Exception):
+    """Raised when downloaded content is incomplete."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _is_transient(error: Exception) -> bool:
+    """Errors worth resuming after: network failures, short reads, 429 and 5xx."""
+    if isinstance(error, DownloadError):
+        return error.retryable
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, SoraAPIError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _content_range_total(header: Optional[str]) -> Optional[int]:
+    """Total size from a "bytes 0-12344/12345" Content-Range header."""
+    if not header or "/" not in header:
+        return None
+    total = header.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+@dataclass
+class VideoError:
+    message: str = "Video generation failed"
+    code: Optional[str] = None
+
+
+@dataclass
+class Video:
+    """A video job as returned by the API (unknown fields are ignored)."""
+    id: str
+    status: str
+    object: str = "video"
+    model: Optional[str] = None
+    seconds: Optional[str] = None
+    size: Optional[str] = None
+    progress: Optional[int] = None
+    created_at: Optional[int] = None
+    completed_at: Optional[int] = None
+    expires_at: Optional[int] = None
+    remixed_from_video_id: Optional[str] = None
+    error: Optional[VideoError] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Video":
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        if isinstance(values.get("error"), dict):
+            values["error"] = VideoError(**{k: v for k, v in values["error"].items() if k in ("message", "code")})
+        return cls(**values)
+
+
+@dataclass
+class VideoPage:
+    data: List[Video] = field(default_factory=list)
+    has_more: bool = False
+    first_id: Optional[str] = None
+    last_id: Optional[str] = None
+
+
+def failure_message(video: Video, default: str = "Video generation failed") -> str:
+    """Error message for a failed video."""
+    return getattr(getattr(video, "error", None), "message", None) or default
+
+
+class AsyncSoraClient:
+    """
+    Async client for the OpenAI Videos (Sora) API.
+
+    All calls share one httpx.AsyncClient, so connections are pooled and kept
+    alive: repeated polls and downloads reuse a handful of TLS connections
+    instead of handshaking per request.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        read_timeout: float = 300.0,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        event_hooks: Optional[Dict[str, List[Callable]]] = None
+    ):
+        """
+        Args:
+            api_key: OpenAI API key (default: OPENAI_API_KEY)
+            base_url: API base URL (default: OPENAI_BASE_URL or https://api.openai.com/v1)
+            timeout: Connect/write/pool timeout in seconds (default: 30)
+            read_timeout: Read timeout in seconds, generous for downloads (default: 300)
+            max_connections: Maximum open connections in the pool (default: 50)
+            max_keepalive_connections: Idle connections kept alive (default: 20)
+            keepalive_expiry: Seconds an idle connection is kept (default: 60)
+            event_hooks: Optional httpx event hooks, e.g. {"response": [async_fn]} for metrics
+        """
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY must be provided or set in environment")
+
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=httpx.Timeout(timeout, read=read_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            event_hooks=event_hooks
+        )
+
+    async def __aenter__(self) -> "AsyncSoraClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        await self.http.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        response = await self.http.request(method, path, **kwargs)
+        if response.is_error:
+            raise self._error(response)
+        return response.json()
+
+    @staticmethod
+    def _error(response: httpx.Response) -> SoraAPIError:
+        try:
+            message = response.json().get("error", {}).get("message") or response.text
+        except ValueError:
+            message = response.text
+        return SoraAPIError(response.status_code, message, response)
+
+    async def create(
+        self,
+        prompt: str,
+        *,
+        model: str = "sora-2",
+        seconds: str = "4",
+        size: str = "1280x720",
+        input_reference: Optional[Union[BinaryIO, Tuple[str, bytes, str]]] = None
+    ) -> Video:
+        """
+        Start a video generation job.
+
+        Args:
+            prompt: Text prompt
+            model: "sora-2" or "sora-2-pro"
+            seconds: Duration, '4', '8' or '12'
+            size: "1280x720" or "720x1280"
+            input_reference: Optional image (image -> video): a binary file handle, or a
+                (filename, content, mime) tuple such as ReferenceImage.upload()
+        """
+        form = {"model": model, "prompt": prompt, "seconds": str(seconds), "size": size}
+        if input_reference is None:
+            data = await self._request("POST", "/videos", json=form)
+        else:
+            if isinstance(input_reference, tuple):
+                upload = input_reference
+            else:
+                name = os.path.basename(getattr(input_reference, "name", "reference.png"))
+                mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                upload = (name, input_reference, mime)
+            data = await self._request("POST", "/videos", data=form, files={"input_reference": upload})
+        return Video.from_dict(data)
+
+    async def retrieve(self, video_id: str) -> Video:
+        """Fetch a video's current status."""
+        return Video.from_dict(await self._request("GET", f"/videos/{video_id}"))
+
+    async def list(self, limit: int = 20, after: Optional[str] = None, order: str = "desc") -> VideoPage:
+        """
+        List videos in the library.
+
+        Args:
+            limit: Maximum number of videos to return (default: 20)
+            after: Video ID to start after (for pagination)
+            order: Sort order - "asc" or "desc" (default: "desc")
+        """
+        params = {"limit": limit, "order": order}
+        if after:
+            params["after"] = after
+        data = await self._request("GET", "/videos", params=params)
+        return VideoPage(
+            data=[Video.from_dict(v) for v in data.get("data", [])],
+            has_more=bool(data.get("has_more")),
+            first_id=data.get("first_id"),
+            last_id=data.get("last_id")
+        )
+
+    async def delete(self, video_id: str) -> Dict[str, Any]:
+        """Delete a video from OpenAI's storage."""
+        return await self._request("DELETE", f"/videos/{video_id}")
+
+    async def remix(self, video_id: str, prompt: str) -> Video:
+        """Start a remix of an existing video (other properties are inherited)."""
+        return Video.from_dict(await self._request("POST", f"/videos/{video_id}/remix", json={"prompt": prompt}))
+
+    async def chat(self, messages: List[Dict[str, Any]], model: str, **options) -> Dict[str, Any]:
+        """
+        Create a chat completion with the same key and connection pool.
+
+        Args:
+            messages: Chat messages, e.g. [{"role": "user", "content": "..."}]
+            model: Chat model name
+            **options: Extra request fields, e.g. response_format
+
+        Returns:
+            The completion response as returned by the API
+        """
+        return await self._request("POST", "/chat/completions", json={"model": model, "messages": messages, **options})
+
+    def content_url(self, video_id: str, variant: str = "video") -> str:
+        """Absolute URL of a video's downloadable content."""
+        return f"{self.base_url}/videos/{video_id}/content?variant={variant}"
+
+    async def download_to_file(
+        self,
+        video_id: str,
+        path: str,
+        variant: str = "video",
+        segments: int = DOWNLOAD_SEGMENTS,
+        parallel_threshold: int = PARALLEL_DOWNLOAD_THRESHOLD,
+        retries: int = DOWNLOAD_RETRIES
+    ) -> Tuple[str, str]:
+        """
+        Download a content variant to disk, resuming and verifying before it is published.
+
+        Bytes go to a temporary partial file. The first request asks for
+        "bytes=0-" and its body is written straight to the partial file; the
+        total from Content-Range decides whether the rest of a large file is
+        fetched as parallel ranged segments. Interrupted transfers resume with
+        a Range request from the last byte written. The partial file is renamed
+        to path only once the bytes written across all segments add up to the
+        advertised length; the SHA-256 is computed from the bytes on disk.
+
+        Args:
+            video_id: The video to download
+            path: Destination file
+            variant: "video", "thumbnail" or "spritesheet"
+            segments: Parallel ranges for files of at least parallel_threshold bytes (default: 4)
+            parallel_threshold: Size from which to split into segments (default: 16 MiB)
+            retries: Resume attempts per range before giving up (default: 5)
+
+        Returns:
+            (path, sha256 hex digest of the content)
+
+        Raises:
+            DownloadError: If the file is incomplete after all retries
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        part_path = f"{path}.{uuid.uuid4().hex}.part"
+        url = f"/videos/{video_id}/content"
+        params = {"variant": variant}
+        try:
+            total, written = await self._download_parts(url, params, part_path, segments, parallel_threshold, retries)
+
+            # The partial file is preallocated, so its size alone proves nothing
+            if total is not None and written != total:
+                raise DownloadError(f"Downloaded {written} of {total} bytes for {video_id} ({variant})")
+
+            checksum = await asyncio.to_thread(file_sha256, part_path)
+            os.replace(part_path, path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        return path, checksum
+
+    async def _download_parts(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        part_path: str,
+        segments: int,
+        parallel_threshold: int,
+        retries: int
+    ) -> Tuple[Optional[int], int]:
+        """
+        Fetch the content into part_path, starting with one open-ended range request.
+
+        The first response streams the first segment (the whole file below
+        parallel_threshold) while the other segments are requested alongside it.
+
+        Returns:
+            (total, written): the advertised total size (part_path is
+            preallocated to it), or None if the server ignored the range and
+            the whole body was written instead, and the bytes actually written
+        """
+        for attempt in range(retries + 1):
+            ranged = False
+            try:
+                async with self.http.stream("GET", url, params=params, headers={"Range": "bytes=0-"}) as response:
+                    if response.is_error:
+                        await response.aread()
+                        raise self._error(response)
+
+                    total = _content_range_total(response.headers.get("content-range"))
+                    if response.status_code == 206 and total is not None:
+                        # From here each segment resumes on its own
+                        ranged = True
+                        with open(part_path, "wb") as f:
+                            f.truncate(total)
+                        count = segments if total >= parallel_threshold else 1
+                        step = -(-total // count) or 1
+                        written = await asyncio.gather(
+                            self._fetch_range(url, params, part_path, 0, min(step, total) - 1, retries, response),
+                            *(
+                                self._fetch_range(url, params, part_path, start, min(start + step, total) - 1, retries)
+                                for start in range(step, total, step)
+                            )
+                        )
+                        return total, sum(written)
+
+                    # No range support: this response is the whole file
+                    expected = response.headers.get("content-length")
+                    written = 0
+                    with open(part_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            f.write(chunk)
+                            written += len(chunk)
+                    if expected is not None and written != int(expected):
+                        raise DownloadError(f"Short read: {written} of {expected} bytes")
+                    return None, written
+            except Exception as e:
+                if ranged or attempt >= retries or not _is_transient(e):
+                    raise
+                await self._retry_pause(attempt, e)
+
+    async def _fetch_range(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        part_path: str,
+        start: int,
+        end: int,
+        retries: int,
+        response: Optional[httpx.Response] = None
+    ) -> int:
+        """
+        Write bytes start..end (inclusive) into part_path, resuming after failures.
+
+        response is an already-open ranged response starting at start; it is
+        read first and only later attempts send a request of their own.
+
+        Returns:
+            Number of bytes written
+        """
+        offset = start
+        attempt = 0
+        while offset <= end:
+            try:
+                if response is None:
+                    request = self.http.build_request("GET", url, params=params, headers={"Range": f"bytes={offset}-{end}"})
+                    response = await self.http.send(request, stream=True)
+                try:
+                    if response.is_error:
+                        await response.aread()
+                        raise self._error(response)
+                    if response.status_code != 206:
+                        raise DownloadError(f"Range {offset}-{end} not honoured (HTTP {response.status_code})", retryable=False)
+
+                    with open(part_path, "r+b") as f:
+                        f.seek(offset)
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            chunk = chunk[:end + 1 - offset]
+                            f.write(chunk)
+                            offset += len(chunk)
+                            if offset > end:
+                                break
+                finally:
+                    await response.aclose()
+                    response = None
+
+                if offset <= end:
+                    raise DownloadError(f"Short read: stopped at byte {offset} of range {start}-{end}")
+            except Exception as e:
+                attempt += 1
+                if attempt > retries or not _is_transient(e):
+                    raise
+                await self._retry_pause(attempt - 1, e, f" from byte {offset}")
+        return offset - start
+
+    @staticmethod
+    async def _retry_pause(attempt: int, error: Exception, where: str = ""):
+        delay = min(0.5 * 2 ** attempt, 10)
+        print(f"Download interrupted ({error}); resuming{where} in {delay:.1f}s")
+        await asyncio.sleep(delay)
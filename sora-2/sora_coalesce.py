@@ -0,0 +1,124 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+from sora_jobs import Job, JobManager, JobRunner, TERMINAL_JOB_STATES
+from sora_scheduler import PRIORITY_CLASSES, PRIORITY_INTERACTIVE
+
+# How a create request was satisfied
+SUBMITTED = "submitted"
+COALESCED = "coalesced"
+REUSED = "reused"
+
+
+def request_key(prompt: str, model: str, seconds: Any, size: str) -> str:
+    """
+    Normalized identity of a create request.
+
+    Whitespace in the prompt is collapsed and the other fields are canonicalized,
+    so requests that would produce the same generation share a key.
+    """
+    normalized = {
+        "prompt": " ".join(prompt.split()),
+        "model": model.strip().lower(),
+        "seconds": str(int(seconds)),
+        "size": size.strip().lower()
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+class RequestCoalescer:
+    """
+    Single-flight layer in front of JobManager for create jobs.
+
+    Concurrent identical requests (same normalized prompt/model/seconds/size)
+    are attached to the one job already in flight instead of starting a second
+    paid generation. A request more urgent than the job it attaches to raises
+    that job's priority, so it never inherits a batch job's place in the
+    queue. With reuse=True a request is answered by a previous completed job
+    whose downloaded file is still on disk.
+    """
+
+    def __init__(self, jobs: JobManager, store=None, scheduler=None):
+        """
+        Args:
+            jobs: JobManager that runs new jobs
+            store: Optional JobStore searched for completed results (needed for reuse)
+            scheduler: Optional AdmissionScheduler whose queued waits are promoted
+        """
+        self.jobs = jobs
+        self.store = store
+        self.scheduler = scheduler
+        self._inflight: Dict[str, str] = {}
+        self.stats = {"submitted": 0, "coalesced": 0, "result_hits": 0, "result_misses": 0}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct requests with a job in flight."""
+        return sum(1 for key in list(self._inflight) if self._running(key))
+
+    def track(self, job: Job):
+        """Index an already-running job (e.g. one resumed after a restart)."""
+        if job.request_key:
+            self._inflight[job.request_key] = job.id
+
+    def _running(self, key: str) -> Optional[Job]:
+        job_id = self._inflight.get(key)
+        job = self.jobs.jobs.get(job_id) if job_id else None
+        if job is None or job.status in TERMINAL_JOB_STATES:
+            self._inflight.pop(key, None)
+            return None
+        return job
+
+    def _completed(self, key: str) -> Optional[Job]:
+        if not self.store:
+            return None
+        for job in self.store.find_completed(key):
+            if os.path.exists(job.output_path):
+                return job
+        return None
+
+    def _raise_priority(self, job: Job, priority: str):
+        current = job.params.get("priority", PRIORITY_INTERACTIVE)
+        if PRIORITY_CLASSES.index(priority) >= PRIORITY_CLASSES.index(current):
+            return
+        job.update(params={**job.params, "priority": priority})
+        if self.scheduler:
+            self.scheduler.promote(job.id, priority)
+
+    def submit(self, params: Dict[str, Any], runner: JobRunner, reuse: bool = False) -> Tuple[Job, str]:
+        """
+        Start a create job, or attach to / reuse an identical one.
+
+        Args:
+            params: Create parameters (prompt, model, seconds, size)
+            runner: Job runner used if a new job is started
+            reuse: Return an identical completed job if one is available
+
+        Returns:
+            (job, how) where how is SUBMITTED, COALESCED or REUSED
+        """
+        key = request_key(params["prompt"], params["model"], params["seconds"], params["size"])
+
+        job = self._running(key)
+        if job:
+            self._raise_priority(job, params.get("priority", PRIORITY_INTERACTIVE))
+            self.stats["coalesced"] += 1
+            return job, COALESCED
+
+        if reuse:
+            job = self._completed(key)
+            if job:
+                self.stats["result_hits"] += 1
+                return job, REUSED
+            self.stats["result_misses"] += 1
+
+        # Drop index entries for jobs that have since finished
+        for stale in [k for k in self._inflight if k != key]:
+            self._running(stale)
+
+        fields = {name: params[name] for name in ("prompt", "model", "seconds", "size")}
+        job = self.jobs.submit("create", params, runner, request_key=key, **fields)
+        self._inflight[key] = job.id
+        self.stats["submitted"] += 1
+        return job, SUBMITTED
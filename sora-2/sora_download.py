@@ -0,0 +1,94 @@
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+from sora_cache import VARIANT_EXTENSIONS
+
+# Variants materialised for every completed video
+DOWNLOAD_VARIANTS = ("video", "thumbnail", "spritesheet")
+
+# A job fails if this variant can't be downloaded; the others are best effort
+REQUIRED_VARIANT = "video"
+
+# fetch(video_id, variant) -> (path, sha256)
+VariantFetcher = Callable[[str, str], Awaitable[Tuple[str, str]]]
+
+
+def variant_paths(output_path: str, variants: Sequence[str] = DOWNLOAD_VARIANTS) -> Dict[str, str]:
+    """
+    File names for each variant next to a video path.
+
+    "outputs/clip.mp4" -> video: outputs/clip.mp4, thumbnail: outputs/clip_thumbnail.webp, ...
+    """
+    base = os.path.splitext(output_path)[0]
+    return {
+        variant: output_path if variant == "video" else f"{base}_{variant}.{VARIANT_EXTENSIONS.get(variant, 'bin')}"
+        for variant in variants
+    }
+
+
+async def _timed_fetch(fetch: VariantFetcher, video_id: str, variant: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    path, checksum = await fetch(video_id, variant)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {
+        "path": path,
+        "sha256": checksum,
+        "bytes": size,
+        "seconds": round(elapsed, 3),
+        "mb_per_second": round(size / 1024 ** 2 / elapsed, 2) if elapsed > 0 else None
+    }
+
+
+async def download_variants(
+    fetch: VariantFetcher,
+    video_id: str,
+    variants: Sequence[str] = DOWNLOAD_VARIANTS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Download all variants of a completed video concurrently.
+
+    Each fetch is expected to write atomically (temp file + rename) and return
+    the file's SHA-256; this stage runs them in parallel and times each one.
+
+    Args:
+        fetch: Coroutine function (video_id, variant) -> (path, sha256)
+        video_id: The completed video
+        variants: Variants to fetch (default: video, thumbnail, spritesheet)
+
+    Returns:
+        Per-variant report: path, sha256, bytes, seconds, mb_per_second (or error)
+
+    Raises:
+        Exception: The required variant's error, if it failed
+    """
+    results = await asyncio.gather(
+        *(_timed_fetch(fetch, video_id, variant) for variant in variants),
+        return_exceptions=True
+    )
+
+    report = {}
+    for variant, result in zip(variants, results):
+        if isinstance(result, BaseException):
+            if variant == REQUIRED_VARIANT:
+                raise result
+            report[variant] = {"error": str(result)}
+        else:
+            report[variant] = result
+    return report
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    """One line per variant, for console output."""
+    lines = []
+    for variant, entry in report.items():
+        if "error" in entry:
+            lines.append(f"  {variant:<12} failed: {entry['error']}")
+        else:
+            rate = f"{entry['mb_per_second']} MB/s" if entry["mb_per_second"] is not None else "-"
+            lines.append(
+                f"  {variant:<12} {entry['bytes'] / 1024 ** 2:8.2f} MB in {entry['seconds']:.2f}s "
+                f"({rate})  sha256 {entry['sha256'][:12]}  {entry['path']}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field, fields
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Job states (local to this service, distinct from the upstream video status)
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+TERMINAL_JOB_STATES = (JOB_COMPLETED, JOB_FAILED)
+
+# Fields that tick on every poll; changing only these doesn't trigger on_change
+PROGRESS_FIELDS = ("progress",)
+
+
+@dataclass
+class Job:
+    """A long-running Sora operation (create/remix + poll + download)."""
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = JOB_PENDING
+    video_id: Optional[str] = None
+    video_status: Optional[str] = None
+    progress: int = 0
+    model: Optional[str] = None
+    seconds: Optional[str] = None
+    size: Optional[str] = None
+    prompt: Optional[str] = None
+    source_video_id: Optional[str] = None  # remix lineage
+    request_key: Optional[str] = None  # normalized create request (see sora_coalesce)
+    output_path: Optional[str] = None
+    assets: Optional[Dict[str, Any]] = None  # per-variant download report (see sora_download)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    deleted_at: Optional[float] = None  # set by the store once the video is deleted
+    # Called after every state change, not progress ticks (used to persist the job)
+    on_change: Optional[Callable[["Job"], None]] = field(default=None, repr=False, compare=False)
+
+    def update(self, **changes):
+        """Apply field changes and bump updated_at."""
+        changed = any(k not in PROGRESS_FIELDS and getattr(self, k) != v for k, v in changes.items())
+        for key, value in changes.items():
+            setattr(self, key, value)
+        self.updated_at = time.time()
+        if self.on_change and changed:
+            self.on_change(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "on_change"}
+
+
+JobRunner = Callable[[Job], Awaitable[None]]
+
+
+class JobManager:
+    """
+    Runs Sora jobs as asyncio tasks on the server's event loop.
+
+    Handlers submit a job and return its id immediately; the runner coroutine
+    does the create, polling and download. While a job is waiting between polls
+    it only holds a sleeping task, so one process can carry hundreds of jobs
+    without tying up threadpool workers.
+
+    With a store (see sora_store.JobStore) every state change is persisted and
+    only in-flight jobs are kept in memory. Progress ticks stay in memory (a
+    running job is read from there) and reach the store with the next change.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._shutting_down = False
+
+    def submit(self, kind: str, params: Dict[str, Any], runner: JobRunner, **job_fields) -> Job:
+        """
+        Register a job and start running it in the background.
+
+        Must be called from within the running event loop (e.g. an async handler).
+
+        Args:
+            kind: Job type, e.g. "create" or "remix"
+            params: Parameters the runner needs (stored for inspection)
+            runner: Coroutine function that performs the work and updates the job
+            **job_fields: Initial Job fields (model, prompt, source_video_id, ...)
+
+        Returns:
+            The newly created Job
+        """
+        job = Job(id=f"job_{uuid.uuid4().hex}", kind=kind, params=dict(params), **job_fields)
+        return self.resume(job, runner)
+
+    def resume(self, job: Job, runner: JobRunner) -> Job:
+        """Start (or restart after a process restart) running an existing job."""
+        if self.store:
+            job.on_change = self.store.save
+            self.store.save(job)
+        self.jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, runner))
+        return job
+
+    async def _run(self, job: Job, runner: JobRunner):
+        job.update(status=JOB_RUNNING)
+        try:
+            await runner(job)
+            job.update(status=JOB_COMPLETED)
+        except asyncio.CancelledError:
+            # On shutdown a stored job stays "running" so it is resumed on restart
+            if not (self._shutting_down and self.store):
+                job.update(status=JOB_FAILED, error="Job canceled")
+            raise
+        except Exception as e:
+            job.update(status=JOB_FAILED, error=str(e))
+        finally:
+            self._tasks.pop(job.id, None)
+            if self.store:
+                self.jobs.pop(job.id, None)
+
+    async def wait(self, job_id: str) -> Optional[Job]:
+        """
+        Wait for a job to finish without cancelling it if the caller gives up.
+
+        Returns:
+            The finished job (from the store once it has left memory)
+        """
+        task = self._tasks.get(job_id)
+        if task:
+            await asyncio.wait({task})
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown."""
+        job = self.jobs.get(job_id)
+        if job is None and self.store:
+            job = self.store.get(job_id)
+        return job
+
+    def list(self, limit: int = 100) -> List[Job]:
+        """Return known jobs, newest first."""
+        if self.store:
+            return self.store.list_jobs(limit)
+        return sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)[:limit]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs still running."""
+        return len(self._tasks)
+
+    async def shutdown(self):
+        """Cancel all running jobs (called on application shutdown)."""
+        self._shutting_down = True
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,340 @@
+"""
+Chat-to-video pipeline: the "Sora-2 UGC" n8n workflow as async Python steps.
+
+The workflow turns a chat message into video parameters with an agent,
+creates the video, polls it every 30 seconds, downloads it and uploads it to
+Google Drive, one message at a time. Here every stage is an awaitable step:
+waiting uses the shared poller, which checks all in-flight videos together on
+an adaptive schedule (or is woken by webhooks), and many messages run at once
+under the admission scheduler. Storage is pluggable; LocalStorage stands in for
+Drive.
+
+Usage:
+    python sora_pipeline.py "a corgi surfing at sunset, 8 seconds, vertical"
+    python sora_pipeline.py --messages-file messages.txt --concurrency 10 --extractor llm
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import shutil
+import asyncio
+import argparse
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from sora_client import AsyncSoraClient, STATUS_COMPLETED, failure_message
+from sora_poller import VideoPoller
+from sora_scheduler import AdmissionScheduler, PRIORITY_BATCH
+
+# Defaults from the workflow's agent instructions
+DEFAULT_PARAMETERS = {
+    "prompt": "A neon-lit drone shot over a rainy sci-fi street",
+    "model": "sora-2",
+    "seconds": "4",
+    "size": "1280x720"
+}
+
+VALID_SECONDS = ("4", "8", "12")
+
+# Sizes each model accepts; the larger ones are sora-2-pro only
+MODEL_SIZES = {
+    "sora-2": ("720x1280", "1280x720"),
+    "sora-2-pro": ("720x1280", "1280x720", "1024x1792", "1792x1024")
+}
+VALID_SIZES = MODEL_SIZES["sora-2-pro"]
+
+# Pipeline stages, in order
+STAGES = ("extract", "create", "wait", "download", "upload")
+
+EXTRACTION_INSTRUCTIONS = (
+    "Take the information given, and give the correct parameters to create a video. "
+    "Reply with a JSON object with keys prompt, model, seconds and size. "
+    f"Defaults if none are given: {json.dumps(DEFAULT_PARAMETERS)}. "
+    f"seconds must be one of {list(VALID_SECONDS)}; model is sora-2 or sora-2-pro; "
+    f"size one of {list(MODEL_SIZES['sora-2'])} for sora-2 or {list(MODEL_SIZES['sora-2-pro'])} for sora-2-pro. "
+    "Otherwise, fill in what is given from chat."
+)
+
+
+def clean_parameters(params: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Fill defaults and drop values the Videos API would reject.
+
+    Raises:
+        ValueError: If the size is valid but not for the chosen model
+    """
+    cleaned = dict(DEFAULT_PARAMETERS)
+    for key in cleaned:
+        value = str(params.get(key) or "").strip()
+        if value:
+            cleaned[key] = value
+    if cleaned["seconds"] not in VALID_SECONDS:
+        cleaned["seconds"] = DEFAULT_PARAMETERS["seconds"]
+    if cleaned["size"] not in VALID_SIZES:
+        cleaned["size"] = DEFAULT_PARAMETERS["size"]
+    if cleaned["model"] not in MODEL_SIZES:
+        cleaned["model"] = DEFAULT_PARAMETERS["model"]
+    if cleaned["size"] not in MODEL_SIZES[cleaned["model"]]:
+        raise ValueError(f"Size {cleaned['size']} requires sora-2-pro (sora-2 supports {', '.join(MODEL_SIZES['sora-2'])})")
+    return cleaned
+
+
+class RuleExtractor:
+    """Pulls duration, orientation and model out of a chat message with regexes."""
+
+    async def extract(self, message: str) -> Dict[str, str]:
+        params: Dict[str, Any] = {}
+        text = message
+
+        seconds = re.search(r"\b(4|8|12)\s*(?:s|sec|secs|seconds?)\b", text, re.IGNORECASE)
+        if seconds:
+            params["seconds"] = seconds.group(1)
+            text = text.replace(seconds.group(0), "")
+
+        size = re.search(r"\b(\d{3,4})\s*x\s*(\d{3,4})\b", text)
+        if size:
+            params["size"] = f"{size.group(1)}x{size.group(2)}"
+            text = text.replace(size.group(0), "")
+        elif re.search(r"\b(vertical|portrait|9:16|short[- ]form)\b", text, re.IGNORECASE):
+            params["size"] = "720x1280"
+
+        if re.search(r"\bsora[- ]?2[- ]?pro\b|\bpro model\b", text, re.IGNORECASE):
+            params["model"] = "sora-2-pro"
+
+        quoted = re.search(r'"([^"]+)"', message)
+        params["prompt"] = quoted.group(1) if quoted else re.sub(r"(\s*[,;]\s*)+", ", ", text).strip(" ,.;")
+        return clean_parameters(params)
+
+
+class LLMExtractor:
+    """
+    Asks a chat model for the parameters, like the workflow's agent node.
+
+    Uses the Sora client's pooled connection (same API key and base URL) and
+    falls back to RuleExtractor if the reply isn't usable JSON.
+    """
+
+    def __init__(self, client: AsyncSoraClient, model: str = "gpt-5.1"):
+        self.client = client
+        self.model = model
+        self.fallback = RuleExtractor()
+
+    async def extract(self, message: str) -> Dict[str, str]:
+        data = await self.client.chat(
+            [
+                {"role": "system", "content": EXTRACTION_INSTRUCTIONS},
+                {"role": "user", "content": message}
+            ],
+            model=self.model,
+            response_format={"type": "json_object"}
+        )
+        try:
+            params = json.loads(data["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return await self.fallback.extract(message)
+        return clean_parameters(params if isinstance(params, dict) else {})
+
+
+class StorageBackend(ABC):
+    """Where finished videos are delivered (the workflow's Google Drive step)."""
+
+    @abstractmethod
+    async def upload(self, path: str, name: str) -> str:
+        """
+        Store a downloaded file.
+
+        Args:
+            path: Local file to upload
+            name: Destination file name
+
+        Returns:
+            Location of the stored file (path, URL or file id)
+        """
+
+
+class LocalStorage(StorageBackend):
+    """Stand-in for Drive: copies files into a local folder."""
+
+    def __init__(self, directory: str = "outputs/uploads"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    async def upload(self, path: str, name: str) -> str:
+        destination = os.path.join(self.directory, name)
+        await asyncio.to_thread(shutil.copyfile, path, destination)
+        return destination
+
+
+@dataclass
+class PipelineResult:
+    message: str
+    status: str = "pending"
+    parameters: Dict[str, str] = field(default_factory=dict)
+    video_id: Optional[str] = None
+    location: Optional[str] = None
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class UGCPipeline:
+    """Runs chat messages through extract -> create -> wait -> download -> upload."""
+
+    def __init__(
+        self,
+        client: AsyncSoraClient,
+        poller: VideoPoller,
+        storage: StorageBackend,
+        extractor=None,
+        scheduler: Optional[AdmissionScheduler] = None,
+        staging_dir: str = "outputs/pipeline"
+    ):
+        """
+        Args:
+            client: AsyncSoraClient
+            poller: Shared VideoPoller used for every wait
+            storage: Destination for finished videos
+            extractor: Object with async extract(message) -> params (default: RuleExtractor)
+            scheduler: AdmissionScheduler gating creates (default: a new one)
+            staging_dir: Where videos are downloaded before upload
+        """
+        self.client = client
+        self.poller = poller
+        self.storage = storage
+        self.extractor = extractor or RuleExtractor()
+        self.scheduler = scheduler or AdmissionScheduler()
+        self.staging_dir = staging_dir
+        os.makedirs(staging_dir, exist_ok=True)
+
+    async def run(self, message: str) -> PipelineResult:
+        """Process one chat message; failures are recorded on the result, not raised."""
+        result = PipelineResult(message=message)
+        start = time.perf_counter()
+        stage = STAGES[0]
+
+        def lap(name: str, since: float) -> float:
+            now = time.perf_counter()
+            result.timings[name] = round(now - since, 3)
+            return now
+
+        try:
+            mark = time.perf_counter()
+            result.parameters = params = await self.extractor.extract(message)
+            mark = lap(stage, mark)
+
+            async with self.scheduler.admit(params["model"], params["seconds"], PRIORITY_BATCH) as queued:
+                result.timings["queued"] = round(queued, 3)
+                mark = time.perf_counter()
+                stage = "create"
+                video = await self.client.create(
+                    params["prompt"], model=params["model"], seconds=params["seconds"], size=params["size"]
+                )
+                result.video_id = video.id
+                mark = lap(stage, mark)
+                print(f"[created] {video.id}: {params['prompt'][:60]}")
+
+                stage = "wait"
+                video = await self.poller.wait(video.id)
+                mark = lap(stage, mark)
+            if video.status != STATUS_COMPLETED:
+                raise RuntimeError(failure_message(video, f"Video ended {video.status}"))
+
+            stage = "download"
+            staged, _ = await self.client.download_to_file(video.id, os.path.join(self.staging_dir, f"{video.id}.mp4"))
+            mark = lap(stage, mark)
+
+            stage = "upload"
+            result.location = await self.storage.upload(staged, f"{video.id}.mp4")
+            lap(stage, mark)
+            os.remove(staged)
+
+            result.status = "completed"
+            print(f"[completed] {video.id} -> {result.location}")
+        except Exception as e:
+            result.status = "failed"
+            result.failed_stage = stage
+            result.error = str(e)
+            print(f"[failed] {result.video_id or '-'} at {stage}: {e}")
+
+        result.timings["total"] = round(time.perf_counter() - start, 3)
+        return result
+
+    async def run_many(self, messages: Sequence[str], concurrency: int = 10) -> List[PipelineResult]:
+        """Process messages concurrently, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(message: str) -> PipelineResult:
+            async with semaphore:
+                return await self.run(message)
+
+        return await asyncio.gather(*(bounded(m) for m in messages))
+
+
+def stage_report(results: Sequence[PipelineResult]) -> Dict[str, Dict[str, float]]:
+    """Mean, p95 and max seconds per stage across results."""
+    report = {}
+    for stage in ("queued",) + STAGES + ("total",):
+        values = sorted(r.timings[stage] for r in results if stage in r.timings)
+        if values:
+            report[stage] = {
+                "count": len(values),
+                "mean": round(sum(values) / len(values), 2),
+                "p95": values[max(0, math.ceil(0.95 * len(values)) - 1)],
+                "max": values[-1]
+            }
+    return report
+
+
+async def run_pipeline(args) -> List[PipelineResult]:
+    client = AsyncSoraClient()
+    poller = VideoPoller(client)
+    extractor = LLMExtractor(client, args.llm_model) if args.extractor == "llm" else RuleExtractor()
+    pipeline = UGCPipeline(client, poller, LocalStorage(args.upload_dir), extractor=extractor)
+    try:
+        return await pipeline.run_many(args.messages, args.concurrency)
+    finally:
+        await poller.close()
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat message -> Sora video -> storage, many at once")
+    parser.add_argument("messages", nargs="*", help="Chat messages describing videos")
+    parser.add_argument("--messages-file", help="Text file with one chat message per line")
+    parser.add_argument("--concurrency", type=int, default=10, help="Messages processed at once (default: 10)")
+    parser.add_argument("--extractor", choices=["rules", "llm"], default="rules", help="Parameter extraction (default: rules)")
+    parser.add_argument("--llm-model", default="gpt-5.1", help="Chat model for --extractor llm")
+    parser.add_argument("--upload-dir", default="outputs/uploads", help="LocalStorage destination")
+    parser.add_argument("--json", help="Also write results and stage timings to this file")
+    args = parser.parse_args()
+
+    if args.messages_file:
+        with open(args.messages_file) as f:
+            args.messages += [line.strip() for line in f if line.strip()]
+    if not args.messages:
+        parser.error("give at least one message or --messages-file")
+
+    start = time.time()
+    results = asyncio.run(run_pipeline(args))
+    elapsed = time.time() - start
+    report = stage_report(results)
+
+    completed = sum(1 for r in results if r.status == "completed")
+    print(f"\n{completed}/{len(results)} completed in {elapsed:.0f}s\n")
+    print(f"{'stage':<10}{'count':>7}{'mean s':>9}{'p95 s':>9}{'max s':>9}")
+    for stage, row in report.items():
+        print(f"{stage:<10}{row['count']:>7}{row['mean']:>9}{row['p95']:>9}{row['max']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"elapsed_seconds": round(elapsed, 1), "stages": report,
+                       "results": [asdict(r) for r in results]}, f, indent=2)
+
+    sys.exit(0 if completed == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+@dataclass
+class PollState:
+    """Per-video polling bookkeeping used by the poll policy."""
+    video_id: str
+    status: Optional[str] = None
+    progress: float = 0
+    first_seen: float = field(default_factory=time.time)
+    last_polled: Optional[float] = None
+    next_due: float = 0
+    queued_polls: int = 0
+    # First in_progress observation, used to estimate the progress rate
+    rate_start_time: Optional[float] = None
+    rate_start_progress: float = 0
+    rate: Optional[float] = None  # progress percent per second
+
+
+class AdaptivePollPolicy:
+    """
+    Decides when each video should be polled next.
+
+    - queued: back off geometrically, since nothing observable happens until it starts
+    - in_progress: estimate the progress rate and poll at half the remaining ETA,
+      so polls are sparse early on and tighten as the video nears completion
+    - no estimate yet: poll at the base interval
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 2,
+        min_interval: float = 1,
+        max_interval: float = 15,
+        queued_max_interval: float = 20,
+        queued_backoff: float = 1.5,
+        eta_fraction: float = 0.5
+    ):
+        """
+        Args:
+            base_interval: Interval used before any estimate exists (default: 2)
+            min_interval: Shortest interval, used close to completion (default: 1)
+            max_interval: Longest interval while in progress (default: 15)
+            queued_max_interval: Longest interval while queued (default: 20)
+            queued_backoff: Multiplier applied per consecutive queued poll (default: 1.5)
+            eta_fraction: Fraction of the remaining ETA to wait between polls (default: 0.5)
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.queued_max_interval = queued_max_interval
+        self.queued_backoff = queued_backoff
+        self.eta_fraction = eta_fraction
+
+    def observe(self, state: PollState, video, now: Optional[float] = None):
+        """Record a refreshed video object and update the progress rate estimate."""
+        now = now or time.time()
+        progress = getattr(video, "progress", 0) or 0
+
+        state.last_polled = now
+        state.queued_polls = state.queued_polls + 1 if video.status == "queued" else 0
+
+        if video.status == "in_progress":
+            if state.rate_start_time is None:
+                state.rate_start_time = now
+                state.rate_start_progress = progress
+            elif progress > state.rate_start_progress and now > state.rate_start_time:
+                state.rate = (progress - state.rate_start_progress) / (now - state.rate_start_time)
+
+        state.status = video.status
+        state.progress = progress
+
+    def next_interval(self, state: PollState) -> float:
+        """Seconds to wait before polling this video again."""
+        if state.status == "queued":
+            interval = self.base_interval * (self.queued_backoff ** max(state.queued_polls - 1, 0))
+            return min(interval, self.queued_max_interval)
+
+        eta = self.eta(state)
+        if eta is None:
+            return self.base_interval
+
+        return max(self.min_interval, min(self.max_interval, eta * self.eta_fraction))
+
+    def eta(self, state: PollState) -> Optional[float]:
+        """Estimated seconds until completion, or None if there is no estimate yet."""
+        if state.status != "in_progress" or not state.rate:
+            return None
+        return max(0.0, (100 - state.progress) / state.rate)
+
+
+def retry_after_seconds(error: Exception, default: Optional[float] = None) -> Optional[float]:
+    """
+    Extract a Retry-After delay from a rate-limited API error.
+
+    Args:
+        error: Exception raised by the OpenAI client (or an HTTP library)
+        default: Delay to use for a 429 without a usable header
+
+    Returns:
+        Seconds to wait, or None if the error is not a rate limit
+    """
+    status_code = getattr(error, "status_code", None)
+    response = getattr(error, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+    if status_code != 429:
+        return None
+
+    headers = getattr(response, "headers", None) or {}
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    return default
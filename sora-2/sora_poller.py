@@ -0,0 +1,303 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from sora_client import ACTIVE_STATUSES
+from sora_poll_policy import AdaptivePollPolicy, PollState, retry_after_seconds
+
+StatusCallback = Callable[[Any], None]
+
+
+class VideoPoller:
+    """
+    Shared status poller for every in-flight Sora video.
+
+    Instead of each job calling ``retrieve`` on its own loop, callers
+    register a video id with ``wait()`` and a single background task refreshes
+    all tracked ids together: it pages through ``list`` (newest first,
+    which is where in-flight jobs live) and only falls back to per-id
+    ``retrieve`` for ids not found in the scanned pages. Request volume per
+    tick is roughly constant no matter how many jobs are outstanding.
+
+    When each video is due is decided by an AdaptivePollPolicy, and a 429
+    from the API pauses all polling for the Retry-After period.
+    """
+
+    def __init__(
+        self,
+        client,
+        policy: Optional[AdaptivePollPolicy] = None,
+        page_size: int = 100,
+        max_pages: int = 3,
+        max_errors: int = 5,
+        rate_limit_backoff: float = 10
+    ):
+        """
+        Args:
+            client: AsyncSoraClient (uses client.list / client.retrieve)
+            policy: Poll policy deciding per-video intervals (default: AdaptivePollPolicy())
+            page_size: Videos requested per list page (default: 100)
+            max_pages: List pages scanned per round before falling back to retrieve
+            max_errors: Consecutive retrieve errors before a waiter is failed
+            rate_limit_backoff: Pause after a 429 without a Retry-After header (default: 10)
+        """
+        self.client = client
+        self.policy = policy or AdaptivePollPolicy()
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_errors = max_errors
+        self.rate_limit_backoff = rate_limit_backoff
+
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._callbacks: Dict[str, List[StatusCallback]] = {}
+        self._states: Dict[str, PollState] = {}
+        self._latest: Dict[str, Any] = {}
+        self._errors: Dict[str, int] = {}
+        self._backoff_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.stats = {"rounds": 0, "list_calls": 0, "retrieve_calls": 0, "rate_limited": 0}
+
+    @property
+    def tracked(self) -> List[str]:
+        """Video ids currently being polled."""
+        return list(self._waiters)
+
+    def latest(self, video_id: str):
+        """Most recent video object seen for video_id, if any."""
+        return self._latest.get(video_id)
+
+    def eta(self, video_id: str) -> Optional[float]:
+        """Estimated seconds until video_id completes, or None if unknown."""
+        state = self._states.get(video_id)
+        return self.policy.eta(state) if state else None
+
+    def estimated_completion(self, video_id: str) -> Optional[float]:
+        """Estimated completion time (unix timestamp) for video_id, or None if unknown."""
+        state = self._states.get(video_id)
+        eta = self.policy.eta(state) if state else None
+        if eta is None:
+            return None
+        return state.last_polled + eta
+
+    async def wait(self, video_id: str, on_update: Optional[StatusCallback] = None):
+        """
+        Wait until a video reaches a terminal status.
+
+        Args:
+            video_id: The video to track
+            on_update: Optional callback invoked with each refreshed video object
+
+        Returns:
+            The final video object (completed, failed or canceled)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.setdefault(video_id, []).append(future)
+        if on_update:
+            self._callbacks.setdefault(video_id, []).append(on_update)
+        if video_id not in self._states:
+            self._states[video_id] = PollState(
+                video_id=video_id,
+                next_due=time.time() + self.policy.base_interval
+            )
+
+        self._ensure_running()
+        try:
+            return await future
+        finally:
+            self._forget(video_id, future, on_update)
+
+    async def watch(self, video_id: str, heartbeat: Optional[float] = None) -> AsyncIterator[Any]:
+        """
+        Yield each refreshed video object until the video reaches a terminal status.
+
+        Any number of watchers (and waiters) on the same id share one upstream poll.
+
+        Args:
+            video_id: The video to track
+            heartbeat: If set, yield None after this many seconds without an update
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        waiter = asyncio.ensure_future(self.wait(video_id, on_update=queue.put_nowait))
+        # Wake the consumer if polling fails (e.g. unknown video id)
+        waiter.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                try:
+                    video = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                if video is None:
+                    if waiter.done() and waiter.exception():
+                        raise waiter.exception()
+                    continue
+
+                yield video
+                if video.status not in ACTIVE_STATUSES:
+                    return
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                await asyncio.gather(waiter, return_exceptions=True)
+
+    def notify(self, video) -> bool:
+        """
+        Deliver a video object pushed from outside the poll loop (e.g. a webhook).
+
+        Returns:
+            True if the video was being tracked
+        """
+        if video.id not in self._waiters:
+            return False
+        self._errors.pop(video.id, None)
+        self._dispatch(video)
+        return True
+
+    def _forget(self, video_id: str, future: asyncio.Future, on_update: Optional[StatusCallback]):
+        waiters = self._waiters.get(video_id, [])
+        if future in waiters:
+            waiters.remove(future)
+        if on_update and on_update in self._callbacks.get(video_id, []):
+            self._callbacks[video_id].remove(on_update)
+        if not waiters:
+            self._waiters.pop(video_id, None)
+            self._callbacks.pop(video_id, None)
+            self._errors.pop(video_id, None)
+            self._latest.pop(video_id, None)
+            self._states.pop(video_id, None)
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        else:
+            # Re-plan the current sleep, a new video may be due sooner
+            self._wakeup.set()
+
+    def _next_delay(self) -> float:
+        now = time.time()
+        next_due = min((s.next_due for s in self._states.values()), default=now)
+        return max(0.0, next_due - now, self._backoff_until - now)
+
+    async def _run(self):
+        while self._waiters:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_delay())
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.refresh()
+            except Exception as e:
+                if not self._handle_rate_limit(e):
+                    print(f"Poller refresh failed: {e}")
+                    # Don't spin on a persistent error
+                    self._backoff_until = time.time() + self.policy.base_interval
+
+    def _handle_rate_limit(self, error: Exception) -> bool:
+        """Pause polling if error is a 429; return True if it was."""
+        delay = retry_after_seconds(error, default=self.rate_limit_backoff)
+        if delay is None:
+            return False
+        self.stats["rate_limited"] += 1
+        self._backoff_until = max(self._backoff_until, time.time() + delay)
+        print(f"Poller rate limited, pausing {delay:.1f}s")
+        return True
+
+    async def refresh(self, force: bool = False):
+        """
+        Refresh tracked videos once and fan results out to waiters.
+
+        Args:
+            force: Refresh every tracked video, not only those that are due
+        """
+        now = time.time()
+        pending = {
+            video_id for video_id, state in self._states.items()
+            if video_id in self._waiters and (force or state.next_due <= now)
+        }
+        if not pending:
+            return
+        self.stats["rounds"] += 1
+
+        # A single id is cheaper to retrieve directly than to find in a page
+        if len(pending) > 1:
+            pending = await self._refresh_from_list(pending)
+
+        if pending:
+            await asyncio.gather(*(self._refresh_one(video_id) for video_id in pending))
+
+    async def _refresh_from_list(self, pending: set) -> set:
+        """Scan list pages for pending ids; return ids that were not found."""
+        after = None
+        for _ in range(self.max_pages):
+            page = await self.client.list(limit=self.page_size, after=after, order="desc")
+            self.stats["list_calls"] += 1
+
+            for video in page.data:
+                # Tracked videos that weren't due yet get a free refresh too
+                if video.id in self._waiters:
+                    pending.discard(video.id)
+                    self._dispatch(video)
+
+            if not pending or not page.data or not page.has_more:
+                break
+            after = page.data[-1].id
+
+        return pending
+
+    async def _refresh_one(self, video_id: str):
+        try:
+            self.stats["retrieve_calls"] += 1
+            video = await self.client.retrieve(video_id)
+        except Exception as e:
+            if self._handle_rate_limit(e):
+                return
+            self._errors[video_id] = self._errors.get(video_id, 0) + 1
+            if self._errors[video_id] >= self.max_errors:
+                self._fail(video_id, e)
+            elif video_id in self._states:
+                self._states[video_id].next_due = time.time() + self.policy.base_interval
+            return
+
+        self._errors.pop(video_id, None)
+        self._dispatch(video)
+
+    def _dispatch(self, video):
+        """Deliver a refreshed video object to callbacks and, if terminal, waiters."""
+        self._latest[video.id] = video
+
+        state = self._states.get(video.id)
+        if state:
+            self.policy.observe(state, video)
+            state.next_due = time.time() + self.policy.next_interval(state)
+
+        for callback in list(self._callbacks.get(video.id, [])):
+            try:
+                callback(video)
+            except Exception as e:
+                print(f"Poller callback failed for {video.id}: {e}")
+
+        if video.status not in ACTIVE_STATUSES:
+            for future in self._waiters.get(video.id, []):
+                if not future.done():
+                    future.set_result(video)
+
+    def _fail(self, video_id: str, error: Exception):
+        for future in self._waiters.get(video_id, []):
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self):
+        """Stop the background poll task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
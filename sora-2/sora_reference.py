@@ -0,0 +1,179 @@
+import os
+import asyncio
+import hashlib
+import mimetypes
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it references are sent as-is
+    Image = None
+
+DEFAULT_REFERENCE_DIR = os.environ.get("SORA_REFERENCE_DIR", "outputs/references")
+
+# Normalized images kept in memory, ready to upload
+DEFAULT_MEMORY_ITEMS = 32
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """Parse "1280x720" into (width, height)."""
+    width, _, height = size.lower().partition("x")
+    return int(width), int(height)
+
+
+@dataclass
+class ReferenceImage:
+    """A reference image normalized to one video size, ready for the multipart upload."""
+    source_sha256: str
+    size: str
+    path: str
+    mime: str
+    data: bytes
+    resized: bool
+
+    def upload(self) -> Tuple[str, bytes, str]:
+        """(filename, content, mime) for the input_reference form field."""
+        return os.path.basename(self.path), self.data, self.mime
+
+
+def normalize_image(data: bytes, size: str) -> Tuple[bytes, str]:
+    """
+    Scale and centre-crop an image to exactly `size`.
+
+    Args:
+        data: Encoded source image
+        size: Target "WIDTHxHEIGHT"
+
+    Returns:
+        (encoded image, file extension); JPEG unless the image has transparency
+    """
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        fitted = ImageOps.fit(image.convert("RGBA" if has_alpha else "RGB"), parse_size(size), Image.LANCZOS)
+
+    out = BytesIO()
+    if has_alpha:
+        fitted.save(out, format="PNG", optimize=True)
+        return out.getvalue(), "png"
+    fitted.save(out, format="JPEG", quality=95)
+    return out.getvalue(), "jpg"
+
+
+class ReferenceCache:
+    """
+    Normalized reference images, keyed by source content hash and video size.
+
+    Each distinct (image, size) is resized and encoded once and written to
+    disk; later jobs using the same image get the cached bytes from memory or
+    disk. Concurrent requests for the same image share one encode. A source
+    file is only read and hashed again once its path, mtime or size changes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_REFERENCE_DIR, max_memory_items: int = DEFAULT_MEMORY_ITEMS):
+        """
+        Args:
+            directory: Where normalized images are stored (default: $SORA_REFERENCE_DIR or outputs/references)
+            max_memory_items: Normalized images kept in memory (default: 32)
+        """
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        os.makedirs(directory, exist_ok=True)
+
+        self._memory: "OrderedDict[str, ReferenceImage]" = OrderedDict()
+        # (path, mtime, file size, video size) -> content key, so hits skip reading the file
+        self._sources: "OrderedDict[Tuple[str, int, int, str], str]" = OrderedDict()
+        self._pending: Dict[Tuple[str, int, int, str], asyncio.Future] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "encoded": 0, "passthrough": 0}
+        if Image is None:
+            print("Pillow not installed: reference images are uploaded without resizing (pip install Pillow)")
+
+    def _remember(self, source_key: Tuple[str, int, int, str], key: str, reference: ReferenceImage) -> ReferenceImage:
+        self._memory[key] = reference
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+        self._sources[source_key] = key
+        self._sources.move_to_end(source_key)
+        while len(self._sources) > self.max_memory_items:
+            self._sources.popitem(last=False)
+        return reference
+
+    def _load_or_normalize(self, source: str, size: str, data: bytes, digest: str) -> ReferenceImage:
+        """Blocking part: disk lookup, else resize/encode and write atomically."""
+        if Image is None:
+            self.stats["passthrough"] += 1
+            mime = mimetypes.guess_type(source)[0] or "application/octet-stream"
+            return ReferenceImage(digest, size, source, mime, data, resized=False)
+
+        for ext in ("jpg", "png"):
+            path = os.path.join(self.directory, f"{digest}_{size}.{ext}")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    self.stats["disk_hits"] += 1
+                    return ReferenceImage(digest, size, path, mimetypes.guess_type(path)[0], f.read(), resized=True)
+
+        normalized, ext = normalize_image(data, size)
+        path = os.path.join(self.directory, f"{digest}_{size}.{ext}")
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(normalized)
+        os.replace(tmp_path, path)
+        self.stats["encoded"] += 1
+        return ReferenceImage(digest, size, path, mimetypes.guess_type(path)[0], normalized, resized=True)
+
+    async def get(self, source: str, size: str) -> ReferenceImage:
+        """
+        Reference image for a job, normalized to its video size.
+
+        Args:
+            source: Path to the original image
+            size: Video size, e.g. "1280x720"
+
+        Returns:
+            ReferenceImage; pass reference.upload() as input_reference
+        """
+        stat = os.stat(source)
+        source_key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size, size)
+
+        key = self._sources.get(source_key)
+        if key in self._memory:
+            self.stats["memory_hits"] += 1
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if source_key in self._pending:
+            self.stats["memory_hits"] += 1
+            return await asyncio.shield(self._pending[source_key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[source_key] = future
+        try:
+            data, digest = await asyncio.to_thread(_read_and_hash, source)
+            key = f"{digest}_{size}"
+            if key in self._memory:
+                # Same content under another path
+                self.stats["memory_hits"] += 1
+                reference = self._memory[key]
+            else:
+                reference = await asyncio.to_thread(self._load_or_normalize, source, size, data, digest)
+            future.set_result(self._remember(source_key, key, reference))
+            return reference
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark it retrieved so asyncio doesn't warn
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._pending[source_key]
+
+
+def _read_and_hash(path: str) -> Tuple[bytes, str]:
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()
@@ -0,0 +1,268 @@
+import os
+import time
+import asyncio
+import itertools
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_CLASSES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+# Maximum generations running upstream at once
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("SORA_MAX_IN_FLIGHT", "8"))
+
+# Submissions allowed per minute, per model (also the burst size),
+# overridable with SORA_MODEL_RATES="sora-2=60,sora-2-pro=20"
+DEFAULT_MODEL_RATES = {"sora-2": 20.0, "sora-2-pro": 6.0}
+
+
+def parse_model_rates(value: Optional[str]) -> Dict[str, float]:
+    """Parse "model=rate,model=rate" into a rates dict (defaults for unset models)."""
+    rates = dict(DEFAULT_MODEL_RATES)
+    for item in (value or "").split(","):
+        model, _, rate = item.partition("=")
+        if model.strip() and rate.strip():
+            rates[model.strip()] = float(rate)
+    return rates
+
+
+# Relative generation time per second of video, used for shortest-job-first
+MODEL_COST_FACTORS = {"sora-2": 1.0, "sora-2-pro": 3.0}
+
+
+def expected_cost(model: str, seconds) -> float:
+    """Relative expected generation time of a job."""
+    return MODEL_COST_FACTORS.get(model, 1.0) * int(seconds)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+@dataclass
+class _Entry:
+    priority: str
+    model: str
+    cost: float
+    seq: int
+    future: asyncio.Future
+    key: Optional[str] = None
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class AdmissionScheduler:
+    """
+    Admission control in front of Sora create/remix calls.
+
+    Each submission waits for a slot under the max-in-flight cap and a token
+    from its model's bucket. When several are waiting, interactive requests go
+    before batch ones and, within a class, the shortest expected job (seconds x
+    model cost) goes first. Waiting raises a job's rank over time, so long and
+    batch jobs are delayed but never starved. A slot is held until the video
+    finishes, so the cap matches upstream concurrency, not just create calls.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        model_rates: Optional[Dict[str, float]] = None,
+        class_gap: float = 100.0,
+        aging_seconds: float = 5.0
+    ):
+        """
+        Args:
+            max_in_flight: Maximum admitted jobs at once (default: $SORA_MAX_IN_FLIGHT or 8)
+            model_rates: Submissions per minute per model (default: $SORA_MODEL_RATES or DEFAULT_MODEL_RATES)
+            class_gap: Cost units separating priority classes (default: 100)
+            aging_seconds: Waiting time that earns one cost unit of rank (default: 5)
+        """
+        self.max_in_flight = max_in_flight
+        self.model_rates = dict(model_rates or parse_model_rates(os.environ.get("SORA_MODEL_RATES")))
+        self.class_gap = class_gap
+        self.aging_seconds = aging_seconds
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queue: List[_Entry] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.in_flight = 0
+
+        self.stats = {
+            name: {"admitted": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for name in PRIORITY_CLASSES
+        }
+
+    def _bucket(self, model: str) -> TokenBucket:
+        if model not in self._buckets:
+            per_minute = self.model_rates.get(model, min(self.model_rates.values(), default=10.0))
+            self._buckets[model] = TokenBucket(rate=per_minute / 60, capacity=max(1.0, per_minute))
+        return self._buckets[model]
+
+    def _score(self, entry: _Entry, now: float) -> float:
+        rank = PRIORITY_CLASSES.index(entry.priority) * self.class_gap
+        return rank + entry.cost - (now - entry.enqueued) / self.aging_seconds
+
+    @asynccontextmanager
+    async def admit(self, model: str, seconds, priority: str = PRIORITY_INTERACTIVE,
+                    key: Optional[str] = None) -> AsyncIterator[float]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Args:
+            model: Model the job uses (selects the token bucket)
+            seconds: Video duration (for shortest-job-first ordering)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+            key: Optional caller id (e.g. a job id) so the wait can be promoted later
+
+        Yields:
+            Seconds spent waiting in the queue
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        entry = _Entry(
+            priority=priority,
+            model=model,
+            cost=expected_cost(model, seconds),
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+            key=key
+        )
+        self._queue.append(entry)
+        self._dispatch()
+
+        try:
+            waited = await entry.future
+        except asyncio.CancelledError:
+            if entry in self._queue:
+                self._queue.remove(entry)
+            elif entry.future.done() and not entry.future.cancelled():
+                # Admitted just as the caller gave up
+                self._release()
+            raise
+
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    @contextmanager
+    def reserve(self) -> Iterator[None]:
+        """
+        Hold an in-flight slot for a job that is already running upstream.
+
+        For videos submitted before a restart: they already used their rate
+        token and are generating, so they count against the cap right away
+        (possibly exceeding it briefly) instead of queueing or taking a token.
+        New admissions wait until the count drops back under the cap.
+        """
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def promote(self, key: str, priority: str) -> bool:
+        """
+        Move a queued wait up to a more urgent priority class.
+
+        Used when a higher-priority request attaches to a job that is still
+        waiting for admission. Entries already admitted (or less urgent
+        targets) are left alone.
+
+        Returns:
+            True if a queued entry was promoted
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        promoted = False
+        for entry in self._queue:
+            if entry.key == key and PRIORITY_CLASSES.index(priority) < PRIORITY_CLASSES.index(entry.priority):
+                entry.priority = priority
+                promoted = True
+        if promoted:
+            self._dispatch()
+        return promoted
+
+    def _release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued entries while slots and tokens allow."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue and self.in_flight < self.max_in_flight:
+            now = time.monotonic()
+            ready = None
+            for entry in sorted(self._queue, key=lambda e: (self._score(e, now), e.seq)):
+                # A model out of tokens shouldn't block the others
+                if self._bucket(entry.model).try_take():
+                    ready = entry
+                    break
+            if ready is None:
+                break
+
+            self._queue.remove(ready)
+            waited = now - ready.enqueued
+            stats = self.stats[ready.priority]
+            stats["admitted"] += 1
+            stats["total_wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+            self.in_flight += 1
+            ready.future.set_result(waited)
+
+        if self._queue and self.in_flight < self.max_in_flight:
+            # Everyone waiting is rate limited; retry when the first bucket refills
+            delay = min(self._bucket(e.model).wait_time() for e in self._queue)
+            self._timer = asyncio.get_running_loop().call_later(max(delay, 0.01), self._dispatch)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Queue depth, in-flight count and wait times per priority class."""
+        now = time.monotonic()
+        classes = {}
+        for name in PRIORITY_CLASSES:
+            waiting = [now - e.enqueued for e in self._queue if e.priority == name]
+            stats = self.stats[name]
+            classes[name] = {
+                "queue_depth": len(waiting),
+                "oldest_wait_seconds": round(max(waiting, default=0.0), 2),
+                "admitted": stats["admitted"],
+                "avg_wait_seconds": round(stats["total_wait_seconds"] / stats["admitted"], 2) if stats["admitted"] else 0.0,
+                "max_wait_seconds": round(stats["max_wait_seconds"], 2)
+            }
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "model_rates_per_minute": self.model_rates,
+            "classes": classes
+        }
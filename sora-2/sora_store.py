@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, List, Optional, Tuple
+from sora_jobs import Job, JOB_COMPLETED, TERMINAL_JOB_STATES
+
+DEFAULT_STORE_PATH = os.environ.get("SORA_JOB_DB", "outputs/jobs.sqlite3")
+
+# Job fields stored as columns (params and assets are stored as JSON)
+COLUMNS = (
+    "id", "kind", "status", "video_id", "video_status", "progress",
+    "model", "seconds", "size", "prompt", "source_video_id", "request_key",
+    "output_path", "assets", "error", "params", "created_at", "updated_at"
+)
+
+# Set only by delete_video, so saving a job never clears it
+READ_COLUMNS = COLUMNS + ("deleted_at",)
+
+# Rows whose video still exists upstream
+NOT_DELETED = "deleted_at IS NULL"
+
+
+class JobStore:
+    """
+    SQLite-backed record of every create/remix job.
+
+    Stores parameters, remix lineage (source_video_id) and the local file
+    path, indexed by status, created_at and model so listings are local
+    queries and non-terminal jobs can be resumed after a restart. Deleting a
+    video marks its rows deleted_at, keeping job history and remix lineage.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Args:
+            path: SQLite database file (default: $SORA_JOB_DB or outputs/jobs.sqlite3)
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                video_id TEXT,
+                video_status TEXT,
+                progress INTEGER NOT NULL DEFAULT 0,
+                model TEXT,
+                seconds TEXT,
+                size TEXT,
+                prompt TEXT,
+                source_video_id TEXT,
+                request_key TEXT,
+                output_path TEXT,
+                assets TEXT,
+                error TEXT,
+                params TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                deleted_at REAL
+            )
+        """)
+        # Columns added after the first release
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column in ("request_key", "assets"):
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        if "deleted_at" not in existing:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN deleted_at REAL")
+        for column in ("status", "created_at", "model", "video_id", "source_video_id", "request_key"):
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{column} ON jobs ({column})")
+        self._db.commit()
+
+    def save(self, job: Job):
+        """Insert or update a job."""
+        values = job.to_dict()
+        values["params"] = json.dumps(values["params"])
+        values["assets"] = json.dumps(values["assets"]) if values["assets"] is not None else None
+        with self._lock:
+            self._db.execute(
+                f"INSERT INTO jobs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+                f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])}",
+                tuple(values[c] for c in COLUMNS)
+            )
+            self._db.commit()
+
+    def _row_to_job(self, row: Tuple) -> Job:
+        values = dict(zip(READ_COLUMNS, row))
+        values["params"] = json.loads(values["params"])
+        values["assets"] = json.loads(values["assets"]) if values["assets"] else None
+        return Job(**values)
+
+    def _select(self, where: str = "", args: tuple = (), suffix: str = "") -> List[Job]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(READ_COLUMNS)} FROM jobs {where} {suffix}", args
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        jobs = self._select("WHERE id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def get_by_video(self, video_id: str) -> Optional[Job]:
+        """The job that produced video_id, if it was created through this service."""
+        jobs = self._select(f"WHERE video_id = ? AND {NOT_DELETED}", (video_id,), "LIMIT 1")
+        return jobs[0] if jobs else None
+
+    def find_completed(self, request_key: str, limit: int = 5) -> List[Job]:
+        """Most recent completed jobs with a downloaded file for a normalized request."""
+        return self._select(
+            f"WHERE request_key = ? AND status = ? AND output_path IS NOT NULL AND {NOT_DELETED}",
+            (request_key, JOB_COMPLETED, limit),
+            "ORDER BY created_at DESC LIMIT ?"
+        )
+
+    def list_remixes(self, video_id: str) -> List[Job]:
+        """Remix jobs whose source is video_id (its direct children), oldest first, deleted ones included."""
+        return self._select("WHERE source_video_id = ?", (video_id,), "ORDER BY created_at, id")
+
+    def list_jobs(self, limit: int = 100) -> List[Job]:
+        """Most recent jobs first."""
+        return self._select(suffix="ORDER BY created_at DESC, id DESC LIMIT ?", args=(limit,))
+
+    def list_unfinished(self) -> List[Job]:
+        """Jobs that were pending/running (e.g. when the process stopped)."""
+        placeholders = ", ".join("?" for _ in TERMINAL_JOB_STATES)
+        return self._select(f"WHERE status NOT IN ({placeholders})", tuple(TERMINAL_JOB_STATES), "ORDER BY created_at")
+
+    def list_videos(
+        self,
+        limit: int = 20,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Tuple[List[Job], bool]:
+        """
+        Page through jobs that have an upstream video, newest first.
+
+        Args:
+            limit: Page size
+            after: Video ID cursor; returns videos older than this one
+            status: Optional upstream video status filter (e.g. "completed")
+            model: Optional model filter
+
+        Returns:
+            (jobs, has_more)
+        """
+        clauses = ["video_id IS NOT NULL", NOT_DELETED]
+        args: List[Any] = []
+        if status:
+            clauses.append("video_status = ?")
+            args.append(status)
+        if model:
+            clauses.append("model = ?")
+            args.append(model)
+        if after:
+            clauses.append("(created_at, id) < (SELECT created_at, id FROM jobs WHERE video_id = ?)")
+            args.append(after)
+
+        jobs = self._select(
+            "WHERE " + " AND ".join(clauses),
+            tuple(args) + (limit + 1,),
+            "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        return jobs[:limit], len(jobs) > limit
+
+    def delete_video(self, video_id: str) -> int:
+        """Mark jobs for a deleted video; returns rows marked."""
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE jobs SET deleted_at = ? WHERE video_id = ? AND {NOT_DELETED}", (time.time(), video_id)
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
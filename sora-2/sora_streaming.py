@@ -0,0 +1,178 @@
+import os
+import uuid
+import hashlib
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+# Upstream headers worth relaying to the client
+PASSTHROUGH_HEADERS = ("content-length", "content-range", "accept-ranges", "etag", "last-modified")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be satisfied for the resource size."""
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" header.
+
+    Args:
+        range_header: Value of the Range request header (may be None)
+        size: Total size of the resource in bytes
+
+    Returns:
+        Inclusive (start, end) byte offsets, or None to serve the whole resource
+        (no header, unsupported unit, multiple ranges or a malformed value)
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the resource
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+
+    start_text, _, end_text = spec.partition("-")
+    try:
+        if start_text == "":
+            # Suffix range: last N bytes
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(range_header)
+            start, end = max(0, size - suffix), size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(range_header)
+
+    return start, min(end, size - 1)
+
+
+def iter_file(path: str, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file in chunks."""
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(path: str, range_header: Optional[str], media_type: str = "video/mp4", filename: Optional[str] = None) -> Response:
+    """Serve a local file, honouring a single Range request (206 Partial Content)."""
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(iter_file(path, start, end), status_code=status_code, media_type=media_type, headers=headers)
+
+
+async def open_upstream(http: httpx.AsyncClient, url: str, headers: Dict[str, str], range_header: Optional[str] = None) -> httpx.Response:
+    """Send a streaming GET upstream, raising HTTPException on error responses."""
+    request_headers = dict(headers)
+    if range_header:
+        request_headers["Range"] = range_header
+
+    upstream = await http.send(http.build_request("GET", url, headers=request_headers), stream=True)
+    if upstream.status_code >= 400:
+        body = (await upstream.aread()).decode(errors="replace")
+        await upstream.aclose()
+        status_code = upstream.status_code if upstream.status_code in (404, 416) else 502
+        raise HTTPException(status_code=status_code, detail=f"Upstream returned {upstream.status_code}: {body[:200]}")
+
+    return upstream
+
+
+def _temp_path(path: str) -> str:
+    return f"{path}.{uuid.uuid4().hex}.part"
+
+
+async def proxy_response(
+    http: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    range_header: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    on_cached: Optional[Callable[[str, str], None]] = None,
+    media_type: str = "video/mp4",
+    filename: Optional[str] = None,
+    on_complete: Optional[Callable[[int, bool], None]] = None
+) -> StreamingResponse:
+    """
+    Stream an upstream download to the client chunk by chunk.
+
+    The Range header is forwarded upstream and 206 responses are relayed as-is.
+    When the upstream returns the full body (200) and cache_path is given, the
+    bytes are also written to a temporary file that is moved into place only if
+    the transfer completes, so a disconnect never leaves a truncated cache file.
+    on_cached(path, sha256) is then called so the file can be indexed.
+    on_complete(bytes_relayed, complete) is called when the stream ends (e.g. for metrics).
+    """
+    upstream = await open_upstream(http, url, headers, range_header)
+
+    response_headers = {k: v for k, v in upstream.headers.items() if k.lower() in PASSTHROUGH_HEADERS}
+    response_headers.setdefault("accept-ranges", "bytes")
+    if filename:
+        response_headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    tee_path = cache_path if upstream.status_code == 200 else None
+    expected = upstream.headers.get("content-length")
+
+    async def body():
+        part_path = _temp_path(tee_path) if tee_path else None
+        part = None
+        digest = hashlib.sha256()
+        written = 0
+        complete = False
+        try:
+            if part_path:
+                os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+                part = open(part_path, "wb")
+            async for chunk in upstream.aiter_bytes(CHUNK_SIZE):
+                if part:
+                    part.write(chunk)
+                    digest.update(chunk)
+                written += len(chunk)
+                yield chunk
+            complete = expected is None or written == int(expected)
+        finally:
+            await upstream.aclose()
+            if on_complete:
+                on_complete(written, complete)
+            if part:
+                part.close()
+                if complete:
+                    os.replace(part_path, tee_path)
+                    if on_cached:
+                        on_cached(tee_path, digest.hexdigest())
+                else:
+                    os.remove(part_path)
+
+    return StreamingResponse(body(), status_code=upstream.status_code, media_type=media_type, headers=response_headers)
+
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Set
+from sora_client import STATUS_COMPLETED
+from sora_download import DOWNLOAD_VARIANTS, download_variants, variant_paths
+
+
+async def iter_library(client, page_size: int = 100, stats: Optional[Dict[str, int]] = None) -> AsyncIterator[Any]:
+    """
+    Yield every video in the library, newest first, following the after cursor.
+
+    Args:
+        client: AsyncSoraClient
+        page_size: Videos per list call (default: 100)
+        stats: Optional dict whose "pages" counter is incremented per call
+    """
+    after = None
+    while True:
+        page = await client.list(limit=page_size, after=after, order="desc")
+        if stats is not None:
+            stats["pages"] = stats.get("pages", 0) + 1
+        for video in page.data:
+            yield video
+        if not page.has_more or not page.data:
+            return
+        after = page.last_id or page.data[-1].id
+
+
+class SyncManifest:
+    """
+    Local record of a mirrored library: one entry per remote video with its
+    status and the files downloaded for it. Written via a temp file + rename.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.videos = json.load(f).get("videos", {})
+
+    def is_synced(self, video_id: str) -> bool:
+        """True if every recorded file for a completed video is still on disk."""
+        entry = self.videos.get(video_id)
+        if not entry or not entry.get("files"):
+            return False
+        return all(os.path.exists(f["path"]) for f in entry["files"].values())
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"updated_at": time.time(), "videos": self.videos}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class LibrarySync:
+    """
+    Incrementally mirrors the account's video library to a local directory.
+
+    Walks the whole library with cursor pagination, downloads completed videos
+    the manifest doesn't have yet (while later pages are still being listed)
+    and removes local copies of videos that no longer exist upstream.
+    """
+
+    def __init__(
+        self,
+        client,
+        manifest: SyncManifest,
+        output_dir: str,
+        concurrency: int = 8,
+        variants: Sequence[str] = DOWNLOAD_VARIANTS,
+        prune: bool = True,
+        save_every: int = 25
+    ):
+        """
+        Args:
+            client: AsyncSoraClient
+            manifest: SyncManifest recording what is already mirrored
+            output_dir: Directory for downloaded files
+            concurrency: Maximum videos downloading at once (default: 8)
+            variants: Content variants to fetch per video (default: video, thumbnail, spritesheet)
+            prune: Delete local copies of videos removed upstream (default: True)
+            save_every: Manifest changes between saves (default: 25)
+        """
+        self.client = client
+        self.manifest = manifest
+        self.output_dir = output_dir
+        self.concurrency = concurrency
+        self.variants = variants
+        self.prune = prune
+        self.save_every = save_every
+        self._changes = 0
+
+    def _changed(self):
+        self._changes += 1
+        if self._changes >= self.save_every:
+            self.manifest.save()
+            self._changes = 0
+
+    async def _download(self, video, semaphore: asyncio.Semaphore, stats: Dict[str, Any]):
+        paths = variant_paths(os.path.join(self.output_dir, f"{video.id}.mp4"), self.variants)
+
+        async def fetch(video_id: str, variant: str):
+            return await self.client.download_to_file(video_id, paths[variant], variant=variant)
+
+        async with semaphore:
+            try:
+                report = await download_variants(fetch, video.id, self.variants)
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"[failed] {video.id}: {e}")
+                return
+
+        files = {variant: entry for variant, entry in report.items() if "error" not in entry}
+        self.manifest.videos[video.id]["files"] = files
+        self.manifest.videos[video.id]["synced_at"] = time.time()
+        stats["downloaded"] += 1
+        stats["bytes"] += sum(entry["bytes"] for entry in files.values())
+        print(f"[downloaded] {video.id} ({len(files)} files)")
+        self._changed()
+
+    def _prune(self, remote_ids: Set[str]) -> int:
+        removed = 0
+        for video_id in [v for v in self.manifest.videos if v not in remote_ids]:
+            entry = self.manifest.videos.pop(video_id)
+            for f in (entry.get("files") or {}).values():
+                if os.path.exists(f["path"]):
+                    os.remove(f["path"])
+            removed += 1
+            print(f"[pruned] {video_id}")
+        return removed
+
+    async def run(self, page_size: int = 100) -> Dict[str, Any]:
+        """Mirror the library once and return a report."""
+        stats = {"pages": 0, "scanned": 0, "new": 0, "downloaded": 0, "up_to_date": 0,
+                 "not_ready": 0, "failed": 0, "pruned": 0, "bytes": 0}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        downloads = []
+        remote_ids = set()
+        start = time.time()
+
+        try:
+            async for video in iter_library(self.client, page_size, stats):
+                stats["scanned"] += 1
+                remote_ids.add(video.id)
+
+                entry = self.manifest.videos.setdefault(video.id, {"files": {}})
+                if not entry.get("status"):
+                    stats["new"] += 1
+                entry.update(status=video.status, model=video.model, seconds=video.seconds,
+                             size=video.size, created_at=video.created_at)
+
+                if video.status != STATUS_COMPLETED:
+                    stats["not_ready"] += 1
+                elif self.manifest.is_synced(video.id):
+                    stats["up_to_date"] += 1
+                else:
+                    downloads.append(asyncio.create_task(self._download(video, semaphore, stats)))
+
+            await asyncio.gather(*downloads)
+            # Only prune after a complete walk, so a failed listing never deletes files
+            if self.prune:
+                stats["pruned"] = self._prune(remote_ids)
+        finally:
+            for task in downloads:
+                task.cancel()
+            await asyncio.gather(*downloads, return_exceptions=True)
+            self.manifest.save()
+
+        stats["elapsed_seconds"] = round(time.time() - start, 1)
+        stats["megabytes_downloaded"] = round(stats.pop("bytes") / 1024 ** 2, 1)
+        return stats
@@ -0,0 +1,115 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+from sora_poll_policy import AdaptivePollPolicy
+
+# Signing secret from the webhook endpoint settings ("whsec_...")
+WEBHOOK_SECRET_ENV = "OPENAI_WEBHOOK_SECRET"
+
+# Poll interval (seconds) kept as a safety net while webhooks are enabled
+DEFAULT_SAFETY_POLL_INTERVAL = float(os.environ.get("SORA_WEBHOOK_POLL_INTERVAL", "60"))
+
+# Event types handled by the receiver
+EVENT_VIDEO_COMPLETED = "video.completed"
+EVENT_VIDEO_FAILED = "video.failed"
+VIDEO_EVENTS = (EVENT_VIDEO_COMPLETED, EVENT_VIDEO_FAILED)
+
+# Reject events whose timestamp is further than this from now (replay protection)
+DEFAULT_TOLERANCE_SECONDS = 300
+
+
+class WebhookVerificationError(Exception):
+    """Raised when a webhook's signature or timestamp is invalid."""
+
+
+def decode_secret(secret: str) -> bytes:
+    """HMAC key for a signing secret (the base64 part of "whsec_...")."""
+    if secret.startswith("whsec_"):
+        return base64.b64decode(secret[len("whsec_"):])
+    return secret.encode()
+
+
+def sign(secret: str, webhook_id: str, timestamp: int, body: bytes) -> str:
+    """Signature header value for a payload ("v1,<base64 HMAC-SHA256>")."""
+    message = f"{webhook_id}.{timestamp}.".encode() + body
+    digest = hmac.new(decode_secret(secret), message, hashlib.sha256).digest()
+    return f"v1,{base64.b64encode(digest).decode()}"
+
+
+def verify(
+    secret: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    tolerance: float = DEFAULT_TOLERANCE_SECONDS
+) -> Dict[str, Any]:
+    """
+    Verify a Standard Webhooks request and return the parsed event.
+
+    Args:
+        secret: Signing secret
+        headers: Request headers (webhook-id, webhook-timestamp, webhook-signature)
+        body: Raw request body, exactly as received
+        tolerance: Maximum clock difference in seconds (default: 300)
+
+    Returns:
+        The event payload as a dict
+
+    Raises:
+        WebhookVerificationError: If headers are missing, stale or the signature doesn't match
+    """
+    webhook_id = headers.get("webhook-id")
+    timestamp = headers.get("webhook-timestamp")
+    signatures = headers.get("webhook-signature")
+    if not (webhook_id and timestamp and signatures):
+        raise WebhookVerificationError("Missing webhook signature headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid webhook timestamp")
+    if abs(time.time() - sent_at) > tolerance:
+        raise WebhookVerificationError("Webhook timestamp outside tolerance")
+
+    expected = sign(secret, webhook_id, sent_at, body)
+    # The header may carry several space-separated signatures (secret rotation)
+    if not any(hmac.compare_digest(expected, candidate) for candidate in signatures.split()):
+        raise WebhookVerificationError("Webhook signature mismatch")
+
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise WebhookVerificationError("Webhook body is not valid JSON")
+
+
+def safety_net_policy(interval: float = DEFAULT_SAFETY_POLL_INTERVAL) -> AdaptivePollPolicy:
+    """Slow poll schedule used when webhooks deliver completions."""
+    return AdaptivePollPolicy(
+        base_interval=interval,
+        min_interval=interval,
+        max_interval=interval * 2,
+        queued_max_interval=interval * 2
+    )
+
+
+class SeenEvents:
+    """Bounded memory of delivered webhook ids, so retried deliveries are handled once."""
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, webhook_id: Optional[str]) -> bool:
+        """Record an id; returns False if it was already seen."""
+        if not webhook_id:
+            return True
+        if webhook_id in self._ids:
+            return False
+        self._ids[webhook_id] = None
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return True